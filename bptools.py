@@ -4,6 +4,7 @@ import re
 import random
 import zlib
 import sys
+import time
 import inspect
 import copy
 import argparse
@@ -13,16 +14,25 @@ from collections import defaultdict
 import tabulate
 
 from qti_package_maker.common import anti_cheat
-from qti_package_maker.common import yaml_tools
 from qti_package_maker.common import color_wheel
 from qti_package_maker.common import string_functions
-from qti_package_maker.assessment_items import validator
+from qti_package_maker.assessment_items import item_bank
 from qti_package_maker.assessment_items import item_types
 from qti_package_maker.engines.bbq_text_upload import write_item as bbq_write_item
 from qti_package_maker.engines.human_readable import write_item as human_write_item
+from qti_package_maker.engines.bbq_text_upload import read_package as bbq_read_package
+
+import yaml_cache_lib
+import html_validator_lib
+import question_package_lib
+import generator_profile_lib
 
 answer_histogram = defaultdict(int)
 question_count = 0
+# set by --profile, see _start_profile()
+_active_profile = None
+# set by --output-format, see _set_output_format()
+_output_format = 'bbq'
 letters = 'ABCDEFGHJKMNPQRSTUWXYZ'
 crc16_dict = {}
 
@@ -169,12 +179,17 @@ def getCrc16_FromString(mystr):
 #===========================================================
 #===========================================================
 def readYamlFile(yaml_file):
-	return yaml_tools.read_yaml_file(yaml_file)
+	if not os.path.exists(yaml_file):
+		raise FileNotFoundError(f"YAML file not found: {yaml_file}")
+	print("Processing YAML file: ", yaml_file)
+	# C-accelerated loader with duplicate-key and string-key checks and a content-hash cache
+	return yaml_cache_lib.read_yaml_file(yaml_file, string_keys=True)
 
 #===========================================================
 #===========================================================
 def is_valid_html(html_str: str) -> bool:
-	return validator.validate_html(html_str)
+	# memoized, same cleanup and errors as qti_package_maker's validator
+	return html_validator_lib.validate_html(html_str)
 
 
 #===========================================================
@@ -254,6 +269,27 @@ def _add_base_args(parser):
 		'-x', '--max-questions', type=int, dest='max_questions',
 		default=None, help='Maximum number of questions to keep.'
 	)
+	parser.add_argument(
+		'--profile', dest='profile', action='store_true',
+		help='Write a JSON timing and yield report next to the bbq file.'
+	)
+	parser.add_argument(
+		'--cprofile', dest='cprofile', action='store_true',
+		help='Also write a cProfile dump next to the bbq file (implies --profile).'
+	)
+	parser.add_argument(
+		'--adaptive', dest='adaptive', action='store_true',
+		help='Stop early once attempts rarely produce new questions.'
+	)
+	parser.add_argument(
+		'--adaptive-threshold', type=float, dest='adaptive_threshold', default=0.02,
+		help='Estimated new-question rate below which --adaptive stops (default 0.02).'
+	)
+	parser.add_argument(
+		'--output-format', dest='output_format', default='bbq',
+		choices=('bbq',) + question_package_lib.OUTPUT_FORMATS,
+		help='Write a bbq text file (default), a qti12/qti21 package, or an html/human page.'
+	)
 	parser = add_anticheat_args(parser)
 	return parser
 
@@ -542,9 +578,9 @@ def _get_item_kind(item_cls) -> str:
 	return class_name
 
 #==========================
-def _serialize_item_cls_to_bbq_text(item_cls):
+def _make_output_item_cls(item_cls):
 	"""
-	Convert an item class into a single-line BBQ text question.
+	Copy an item class with the anti-cheat changes applied, ready to write.
 	"""
 	item_kind = _get_item_kind(item_cls)
 	item_copy = copy.deepcopy(item_cls)
@@ -566,6 +602,15 @@ def _serialize_item_cls_to_bbq_text(item_cls):
 		nocheat_item_cls.answers_list = item_copy.answers_list
 
 	nocheat_item_cls._validate()
+	return nocheat_item_cls
+
+#==========================
+def _serialize_item_cls_to_bbq_text(item_cls):
+	"""
+	Convert an item class into a single-line BBQ text question.
+	"""
+	item_kind = _get_item_kind(item_cls)
+	nocheat_item_cls = _make_output_item_cls(item_cls)
 
 	writer_map = {
 		"MC": bbq_write_item.MC,
@@ -663,6 +708,68 @@ def _sync_histogram_from_item_cls_questions(questions: list):
 				answer_histogram[letters[answer_index]] += 1
 		question_count += 1
 
+#==========================
+def _start_profile(args):
+	"""
+	Start a GeneratorProfile when --profile or --cprofile was given.
+
+	The profile stays active until _write_questions_to_file() writes its
+	report next to the bbq file.
+
+	Returns:
+		generator_profile_lib.GeneratorProfile | None: the active profile.
+	"""
+	global _active_profile
+	use_cprofile = bool(getattr(args, 'cprofile', False))
+	if not (use_cprofile or getattr(args, 'profile', False)):
+		return None
+	_active_profile = generator_profile_lib.GeneratorProfile(use_cprofile)
+	return _active_profile
+
+#==========================
+def _set_output_format(args):
+	"""
+	Remember --output-format for the _write_questions_to_file() call that follows.
+	"""
+	global _output_format
+	_output_format = getattr(args, 'output_format', 'bbq')
+
+#==========================
+def _start_yield_tracker(args, profile):
+	"""
+	Track question repeats for --adaptive stopping and for the profile report.
+
+	Returns:
+		generator_profile_lib.YieldTracker | None: tracker, or None when unused.
+	"""
+	if profile is None and not getattr(args, 'adaptive', False):
+		return None
+	threshold = getattr(args, 'adaptive_threshold', 0.02)
+	return generator_profile_lib.YieldTracker(threshold)
+
+#==========================
+def _is_saturated(tracker, args) -> bool:
+	"""
+	Check whether an --adaptive run should stop, and say why on stderr.
+	"""
+	if tracker is None or not getattr(args, 'adaptive', False):
+		return False
+	if not tracker.is_saturated():
+		return False
+	sys.stderr.write(
+		"INFO: adaptive stop after {0} questions drawn, new-question rate {1:.3f}, "
+		"about {2:.0f} distinct questions possible\n".format(
+			tracker.draws, tracker.new_question_rate(), tracker.estimate_space_size()
+		)
+	)
+	return True
+
+#==========================
+def _finish_yield_tracker(tracker, profile, stopped_early: bool):
+	if profile is None or tracker is None:
+		return
+	profile.details['saturation'] = dict(tracker.summary(), stopped_early=stopped_early)
+
 #==========================
 def _collect_questions(write_question, args, print_histogram_flag=True) -> list:
 	"""
@@ -677,13 +784,24 @@ def _collect_questions(write_question, args, print_histogram_flag=True) -> list:
 		list: List of question strings.
 	"""
 	_apply_anticheat_args(args)
+	_set_output_format(args)
+	profile = _start_profile(args)
+	tracker = _start_yield_tracker(args, profile)
+	stopped_early = False
 	questions = []
 	seen_question_ids = set()
 	skipped_duplicates = 0
 	n = 0
 	max_questions = args.max_questions
 	for _ in range(args.duplicates):
-		question_text = write_question(n + 1, args)
+		if _is_saturated(tracker, args):
+			stopped_early = True
+			break
+		if profile is None:
+			question_text = write_question(n + 1, args)
+		else:
+			profile.count('attempts')
+			question_text = profile.timed_call('write_question', write_question, n + 1, args)
 		if isinstance(question_text, list):
 			sys.stderr.write(
 				"WARNING: write_question returned a list; use collect_question_batches\n"
@@ -694,14 +812,22 @@ def _collect_questions(write_question, args, print_histogram_flag=True) -> list:
 		else:
 			prepared_question = _prepare_question_text(question_text, str(n + 1))
 		if prepared_question is None:
+			if profile is not None:
+				profile.count('empty')
 			continue
 		question_identity = _get_question_identity(prepared_question)
+		if tracker is not None and question_identity is not None:
+			tracker.add(question_identity)
 		if question_identity is not None and question_identity in seen_question_ids:
 			skipped_duplicates += 1
+			if profile is not None:
+				profile.count('duplicates')
 			continue
 		if question_identity is not None:
 			seen_question_ids.add(question_identity)
 		questions.append(prepared_question)
+		if profile is not None:
+			profile.count('accepted')
 		n += 1
 		if max_questions is not None and n >= max_questions:
 			break
@@ -709,6 +835,7 @@ def _collect_questions(write_question, args, print_histogram_flag=True) -> list:
 		sys.stderr.write(
 			"INFO: skipped {0} duplicate questions during collection\n".format(skipped_duplicates)
 		)
+	_finish_yield_tracker(tracker, profile, stopped_early)
 	_sync_histogram_from_item_cls_questions(questions)
 	if print_histogram_flag and _should_print_histogram(questions):
 		print_histogram()
@@ -742,13 +869,23 @@ def collect_question_batches(write_question_batch, args, print_histogram_flag=Tr
 			"and use a prebuilt SCENARIOS list with shuffle-once + modulo-N selection. "
 			"Only use batch writers when one attempt must emit multiple questions.\n"
 		)
+	_set_output_format(args)
+	profile = _start_profile(args)
+	tracker = _start_yield_tracker(args, profile)
+	stopped_early = False
 	questions = []
 	seen_question_ids = set()
 	skipped_duplicates = 0
 	n = 0
 	max_questions = args.max_questions
 	for _ in range(args.duplicates):
-		batch = write_question_batch(n + 1, args)
+		if _is_saturated(tracker, args):
+			stopped_early = True
+			break
+		if profile is None:
+			batch = write_question_batch(n + 1, args)
+		else:
+			batch = profile.timed_call('write_question_batch', write_question_batch, n + 1, args)
 		if batch is None:
 			sys.stderr.write(
 				"WARNING: write_question_batch returned None; expected list\n"
@@ -762,19 +899,29 @@ def collect_question_batches(write_question_batch, args, print_histogram_flag=Tr
 		if len(batch) == 0:
 			continue
 		for question_text in batch:
+			if profile is not None:
+				profile.count('attempts')
 			if _is_item_cls_like(question_text):
 				prepared_question = question_text
 			else:
 				prepared_question = _prepare_question_text(question_text, str(n + 1))
 			if prepared_question is None:
+				if profile is not None:
+					profile.count('empty')
 				continue
 			question_identity = _get_question_identity(prepared_question)
+			if tracker is not None and question_identity is not None:
+				tracker.add(question_identity)
 			if question_identity is not None and question_identity in seen_question_ids:
 				skipped_duplicates += 1
+				if profile is not None:
+					profile.count('duplicates')
 				continue
 			if question_identity is not None:
 				seen_question_ids.add(question_identity)
 			questions.append(prepared_question)
+			if profile is not None:
+				profile.count('accepted')
 			n += 1
 			if max_questions is not None and n >= max_questions:
 				break
@@ -784,6 +931,7 @@ def collect_question_batches(write_question_batch, args, print_histogram_flag=Tr
 		sys.stderr.write(
 			"INFO: skipped {0} duplicate questions during collection\n".format(skipped_duplicates)
 		)
+	_finish_yield_tracker(tracker, profile, stopped_early)
 	_sync_histogram_from_item_cls_questions(questions)
 	if print_histogram_flag and _should_print_histogram(questions):
 		print_histogram()
@@ -850,25 +998,74 @@ def make_outfile(*parts) -> str:
 	outfile = f"bbq-{script_name}{suffix}-questions.txt"
 	return outfile
 
+#==========================
+def _make_package_item_bank(questions: list):
+	"""
+	Put accepted questions into an ItemBank for a qti_package_maker engine.
+
+	Item class questions are added directly, with the same anti-cheat
+	changes as their BBQ text, so they are never written out and read back.
+	Legacy BBQ strings are parsed into items.
+
+	Args:
+		questions (list): item class objects or BBQ question strings.
+
+	Returns:
+		ItemBank: the questions in collection order.
+	"""
+	package_item_bank = item_bank.ItemBank(allow_mixed=True)
+	for i, question_value in enumerate(questions, start=1):
+		if _is_item_cls_like(question_value):
+			package_item_cls = _make_output_item_cls(question_value)
+		else:
+			prepared_question = _prepare_question_text(question_value, str(i))
+			if prepared_question is None:
+				continue
+			package_item_cls = bbq_read_package.make_item_cls_from_line(prepared_question)
+			if package_item_cls is None:
+				continue
+		package_item_bank.add_item_cls(package_item_cls)
+	package_item_bank.renumber_items()
+	return package_item_bank
+
 #==========================
 def _write_questions_to_file(questions: list, outfile: str):
 	"""
 	Write questions to a file and print status messages.
 
+	With --output-format other than bbq, the questions are written as a
+	QTI package or HTML page named after outfile instead.
+
 	Args:
 		questions (list): List of question strings.
 		outfile (str): Output filename.
 	"""
+	global _active_profile
 	question_count = len(questions)
 	word = "question" if question_count == 1 else "questions"
-	print(f"\nWriting {question_count} {word} to file: {outfile}")
-	with open(outfile, "w") as f:
-		for i, question_text in enumerate(questions, start=1):
-			prepared_question = normalize_question_output(question_text, str(i))
-			if prepared_question is None:
-				continue
-			f.write(prepared_question)
+	t0 = time.perf_counter()
+	if _output_format in question_package_lib.OUTPUT_FORMATS:
+		print(f"\nWriting {question_count} {word} as {_output_format}")
+		# named after the bbq file: bbq-name-questions.txt -> qti12-name-questions.zip
+		package_name = os.path.splitext(os.path.basename(outfile))[0]
+		if package_name.startswith('bbq-'):
+			package_name = package_name[len('bbq-'):]
+		package_item_bank = _make_package_item_bank(questions)
+		outfile = question_package_lib.write_package(package_item_bank, package_name, _output_format)
+	else:
+		print(f"\nWriting {question_count} {word} to file: {outfile}")
+		with open(outfile, "w") as f:
+			for i, question_text in enumerate(questions, start=1):
+				prepared_question = normalize_question_output(question_text, str(i))
+				if prepared_question is None:
+					continue
+				f.write(prepared_question)
 	print(f"... saved {question_count} {word} to {outfile}\n")
+	if _active_profile is not None:
+		_active_profile.phase_seconds['write_file'] += time.perf_counter() - t0
+		report_path = _active_profile.write(outfile)
+		_active_profile = None
+		print(f"... profile report saved to {report_path}\n")
 
 #==========================
 def write_questions_to_file(questions: list, outfile: str):
@@ -0,0 +1,188 @@
+"""
+Opt-in timing and yield statistics for one generator run.
+
+bptools creates a GeneratorProfile when a generator runs with --profile or
+--cprofile. It times each write_question() call and the file write, counts
+accepted, empty and duplicate attempts, and writes a JSON report next to
+the bbq file. With --cprofile a cProfile dump is written there as well.
+
+A YieldTracker follows how often attempts still produce new questions, so
+--adaptive runs can stop once a generator's scenario space is used up.
+"""
+
+# Standard Library
+import os
+import sys
+import json
+import time
+import cProfile
+import resource
+import collections
+
+# bump when report keys change
+PROFILE_REPORT_VERSION = 3
+
+# attempts before adaptive stopping may trigger, so early luck is not mistaken for saturation
+ADAPTIVE_MIN_DRAWS = 20
+
+#============================================
+def get_peak_rss_mb() -> float:
+	"""
+	Peak resident memory of this process in MB.
+	"""
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# Linux reports kilobytes, macOS reports bytes
+	if sys.platform == 'darwin':
+		peak /= 1024
+	return round(peak / 1024, 1)
+
+#============================================
+def get_report_path(outfile: str, extension: str) -> str:
+	"""
+	Path next to the bbq file, e.g. bbq-x-questions.profile.json.
+	"""
+	return os.path.splitext(outfile)[0] + extension
+
+#============================================
+class GeneratorProfile:
+	"""
+	Collect phase timings and attempt counts for one generator run.
+	"""
+	def __init__(self, use_cprofile: bool = False):
+		self.start_time = time.perf_counter()
+		self.phase_seconds = collections.defaultdict(float)
+		self.call_max_seconds = collections.defaultdict(float)
+		# first call carries lazy imports and data loads, kept apart for latency
+		self.first_call_seconds = {}
+		self.counts = collections.Counter()
+		# extra report fields added by the collection loop
+		self.details = {}
+		self.profiler = None
+		if use_cprofile:
+			self.profiler = cProfile.Profile()
+			self.profiler.enable()
+
+	#============================================
+	def timed_call(self, phase: str, func, *args):
+		"""
+		Call func(*args), adding its run time to the phase total and maximum.
+		"""
+		t0 = time.perf_counter()
+		result = func(*args)
+		seconds = time.perf_counter() - t0
+		self.phase_seconds[phase] += seconds
+		self.first_call_seconds.setdefault(phase, seconds)
+		if seconds > self.call_max_seconds[phase]:
+			self.call_max_seconds[phase] = seconds
+		return result
+
+	#============================================
+	def count(self, name: str, amount: int = 1) -> None:
+		self.counts[name] += amount
+
+	#============================================
+	def build_report(self) -> dict:
+		"""
+		Summarize timings, acceptance and duplicate rates, and peak memory.
+		"""
+		attempts = self.counts['attempts']
+		accepted = self.counts['accepted']
+		duplicates = self.counts['duplicates']
+		report = {
+			'version': PROFILE_REPORT_VERSION,
+			'script': os.path.basename(sys.argv[0]),
+			'argv': sys.argv[1:],
+			'total_seconds': round(time.perf_counter() - self.start_time, 4),
+			'phase_seconds': {name: round(value, 6) for name, value in self.phase_seconds.items()},
+			'max_call_seconds': {name: round(value, 6) for name, value in self.call_max_seconds.items()},
+			'first_call_seconds': {name: round(value, 6) for name, value in self.first_call_seconds.items()},
+			'counts': dict(self.counts),
+			'acceptance_rate': round(accepted / attempts, 4) if attempts else None,
+			'duplicate_rate': round(duplicates / attempts, 4) if attempts else None,
+			'peak_rss_mb': get_peak_rss_mb(),
+		}
+		report.update(self.details)
+		return report
+
+	#============================================
+	def write(self, outfile: str) -> str:
+		"""
+		Write the JSON report, and the cProfile dump if enabled, next to outfile.
+
+		Returns:
+			str: path of the JSON report.
+		"""
+		if self.profiler is not None:
+			self.profiler.disable()
+			self.profiler.dump_stats(get_report_path(outfile, '.prof'))
+		report_path = get_report_path(outfile, '.profile.json')
+		with open(report_path, 'w', encoding='ascii') as f:
+			json.dump(self.build_report(), f, indent=1, sort_keys=True)
+			f.write('\n')
+		return report_path
+
+#============================================
+class YieldTracker:
+	"""
+	Track how often generated questions repeat, to detect saturation.
+
+	Each non-empty attempt is a draw from the generator's scenario space.
+	The Good-Turing estimate f1/n is the chance that the next draw is new,
+	where f1 counts questions seen exactly once in n draws. The
+	bias-corrected Chao1 capture-recapture estimate gives the total number
+	of distinct questions the generator can produce.
+	"""
+	def __init__(self, threshold: float, min_draws: int = ADAPTIVE_MIN_DRAWS):
+		self.threshold = threshold
+		self.min_draws = min_draws
+		self.draws = 0
+		self.identity_counts = collections.Counter()
+		# questions seen exactly once and exactly twice, kept current in add()
+		self.singletons = 0
+		self.doubletons = 0
+
+	#============================================
+	def add(self, identity) -> None:
+		self.draws += 1
+		self.identity_counts[identity] += 1
+		seen = self.identity_counts[identity]
+		if seen == 1:
+			self.singletons += 1
+		elif seen == 2:
+			self.singletons -= 1
+			self.doubletons += 1
+		elif seen == 3:
+			self.doubletons -= 1
+
+	#============================================
+	def new_question_rate(self) -> float:
+		"""
+		Estimated chance that the next attempt yields an unseen question.
+		"""
+		if self.draws == 0:
+			return 1.0
+		return self.singletons / self.draws
+
+	#============================================
+	def estimate_space_size(self) -> float:
+		"""
+		Chao1 estimate of the number of distinct questions, seen or not.
+		"""
+		unseen = self.singletons * (self.singletons - 1) / (2 * (self.doubletons + 1))
+		return len(self.identity_counts) + unseen
+
+	#============================================
+	def is_saturated(self) -> bool:
+		if self.draws < self.min_draws:
+			return False
+		return self.new_question_rate() < self.threshold
+
+	#============================================
+	def summary(self) -> dict:
+		summary = {
+			'draws': self.draws,
+			'distinct': len(self.identity_counts),
+			'new_question_rate': round(self.new_question_rate(), 4),
+			'estimated_space_size': round(self.estimate_space_size(), 1),
+		}
+		return summary
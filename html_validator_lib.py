@@ -0,0 +1,224 @@
+"""
+Shared HTML well-formedness checks for generated question text.
+
+Fragments are cleaned the same way as qti_package_maker's validator and
+parsed as XML with lxml. Fragments that parse are remembered by content
+hash in a bounded cache, so repeated table headers and choice text are only
+parsed once per process. validate_html_batch() checks a whole bank of
+fragments in a single parse and reports where each bad fragment breaks.
+"""
+
+# Standard Library
+import re
+import hashlib
+import collections
+
+# PIP3 modules
+import lxml.etree
+
+# fragments remembered as well-formed, least recently used dropped first
+HTML_CACHE_SIZE = 4096
+_VALID_CACHE = collections.OrderedDict()
+
+# same cleanup steps as qti_package_maker.assessment_items.validator
+_SCRIPT_OPEN_RE = re.compile(r'<script[^>]*>')
+_SCRIPT_BLOCK_RE = re.compile(r'<script\b[^>]*>.*?</script>')
+_BARE_NUMBER_ATTR_RE = re.compile(r'(\b(?:colspan|rowspan|width|height|size)\s*=\s*)(\d+)(?!["\w])')
+_ENTITY_RE = re.compile(r'&[#a-zA-Z0-9]+;')
+_URL_QUERY_RE = re.compile(r'(href=[\'"])(https?://[^\'"]+?)\?.*?([\'"])')
+_SMILES_RE = re.compile(r'smiles="[^"]*?"')
+
+# error columns on the first line are shifted by this wrapper prefix
+_WRAP_PREFIX = '<root><cleaned>'
+_WRAP_SUFFIX = '</cleaned></root>'
+# lxml appends the wrapped-document position to each message
+_POSITION_SUFFIX_RE = re.compile(r', line \d+, column \d+$')
+
+#============================================
+def clean_html_for_xml(html_str: str) -> str:
+	"""
+	Prepare an HTML fragment for XML parsing.
+
+	Script bodies are emptied, bare numeric size attributes are quoted,
+	entities are removed, URL query strings and SMILES values are dropped.
+
+	Args:
+		html_str (str): HTML fragment.
+
+	Returns:
+		str: cleaned fragment, stripped of outer whitespace.
+	"""
+	if '<script' in html_str:
+		html_str = _SCRIPT_OPEN_RE.sub('<script>', html_str)
+		html_str = _SCRIPT_BLOCK_RE.sub('<script></script>', html_str)
+	if '=' in html_str:
+		html_str = _BARE_NUMBER_ATTR_RE.sub(r'\1"\2"', html_str)
+	if '&' in html_str:
+		html_str = _ENTITY_RE.sub('', html_str)
+	if 'href=' in html_str:
+		html_str = _URL_QUERY_RE.sub(r'\1\2\3', html_str)
+	if 'smiles=' in html_str:
+		html_str = _SMILES_RE.sub('smiles=""', html_str)
+	return html_str.strip()
+
+#============================================
+def _fragment_key(html_str: str) -> bytes:
+	return hashlib.blake2b(html_str.encode('utf-8'), digest_size=16).digest()
+
+#============================================
+def _is_cached_valid(key: bytes) -> bool:
+	if key not in _VALID_CACHE:
+		return False
+	_VALID_CACHE.move_to_end(key)
+	return True
+
+#============================================
+def _remember_valid(key: bytes) -> None:
+	_VALID_CACHE[key] = True
+	_VALID_CACHE.move_to_end(key)
+	if len(_VALID_CACHE) > HTML_CACHE_SIZE:
+		_VALID_CACHE.popitem(last=False)
+
+#============================================
+def clear_cache() -> None:
+	"""
+	Forget every fragment remembered as well-formed.
+	"""
+	_VALID_CACHE.clear()
+
+#============================================
+def _format_error(error: lxml.etree.XMLSyntaxError) -> str:
+	"""
+	Describe a parse error with its line and column inside the fragment.
+	"""
+	line, column = error.position
+	if line == 1:
+		column -= len(_WRAP_PREFIX)
+	message = _POSITION_SUFFIX_RE.sub('', error.msg)
+	return f'line {line}, column {max(column, 1)}: {message}'
+
+#============================================
+def get_html_error(html_str: str):
+	"""
+	Parse one fragment and describe the first well-formedness error.
+
+	Args:
+		html_str (str): HTML fragment.
+
+	Returns:
+		str | None: 'line L, column C: message', or None when well-formed.
+	"""
+	key = _fragment_key(html_str)
+	if _is_cached_valid(key):
+		return None
+	wrapped_html = _WRAP_PREFIX + clean_html_for_xml(html_str) + _WRAP_SUFFIX
+	try:
+		lxml.etree.fromstring(wrapped_html)
+	except lxml.etree.XMLSyntaxError as error:
+		return _format_error(error)
+	_remember_valid(key)
+	return None
+
+#============================================
+def validate_html(html_str: str) -> bool:
+	"""
+	Check that an HTML fragment is well-formed, raising if it is not.
+
+	Matches qti_package_maker's validate_html(): on failure the original
+	and wrapped HTML are printed and the XMLSyntaxError is re-raised.
+
+	Args:
+		html_str (str): HTML fragment.
+
+	Returns:
+		bool: True when the fragment is well-formed.
+	"""
+	key = _fragment_key(html_str)
+	if _is_cached_valid(key):
+		return True
+	wrapped_html = _WRAP_PREFIX + clean_html_for_xml(html_str) + _WRAP_SUFFIX
+	try:
+		lxml.etree.fromstring(wrapped_html)
+	except lxml.etree.XMLSyntaxError as error:
+		print("\n\n==== XML PARSING ERROR ====\n")
+		print("Error Message:", error)
+		print("\n==== Wrapped HTML Dump ====\n")
+		print(f"<original>{html_str}</original>")
+		print(wrapped_html)
+		print("\n=================================\n")
+		raise
+	_remember_valid(key)
+	return True
+
+#============================================
+def is_well_formed(html_str: str, debug: bool = True) -> bool:
+	"""
+	Check that an HTML fragment is well-formed without raising.
+
+	Args:
+		html_str (str): HTML fragment.
+		debug (bool): print the error and the cleaned HTML on failure.
+
+	Returns:
+		bool: True when the fragment is well-formed.
+	"""
+	error_text = get_html_error(html_str)
+	if error_text is None:
+		return True
+	if debug:
+		print(f"Parse error: {error_text}")
+		print("Full cleaned HTML:")
+		print(clean_html_for_xml(html_str))
+	return False
+
+#============================================
+def validate_html_batch(fragments: list) -> list:
+	"""
+	Check many HTML fragments, such as every statement in a bank, at once.
+
+	Fragments not already cached are deduplicated and parsed together as
+	one document, one element per fragment. Only when that parse fails is
+	each fragment parsed alone to locate its error. Comments and CDATA
+	could span element boundaries, so fragments with '<!' are always
+	parsed alone.
+
+	Args:
+		fragments (list): HTML fragment strings.
+
+	Returns:
+		list: per fragment, None when well-formed or the error text from
+			get_html_error().
+	"""
+	errors = [None] * len(fragments)
+	pending = {}
+	for index, html_str in enumerate(fragments):
+		key = _fragment_key(html_str)
+		if _is_cached_valid(key):
+			continue
+		pending.setdefault(key, []).append(index)
+	if len(pending) == 0:
+		return errors
+
+	parts = ['<root>']
+	joint_keys = []
+	for key, indices in pending.items():
+		clean_html = clean_html_for_xml(fragments[indices[0]])
+		if '<!' in clean_html:
+			continue
+		parts.append(f'\n<cleaned>{clean_html}</cleaned>')
+		joint_keys.append(key)
+	parts.append('\n</root>')
+	try:
+		lxml.etree.fromstring(''.join(parts))
+	except lxml.etree.XMLSyntaxError:
+		# at least one fragment is bad, find which below
+		joint_keys = []
+	for key in joint_keys:
+		_remember_valid(key)
+		del pending[key]
+
+	for key, indices in pending.items():
+		error_text = get_html_error(fragments[indices[0]])
+		for index in indices:
+			errors[index] = error_text
+	return errors
@@ -2,7 +2,6 @@
 
 import os
 import sys
-import yaml
 
 import bptools
 
@@ -19,56 +18,28 @@ if _PUBCHEM_DIR not in sys.path:
 
 import pubchemlib
 
-def save_data(new_molecules_data_dict):
-	filename = "new_molecules_dict.yml"
-	#new_molecules_data_list = sorted(new_molecules_data_list, key=lambda d: d['Abbreviation'])
-	print(f'... saving data ... to {filename}')
-	# Write updated molecules to molecules.yml
-	with open(filename, "w") as f:
-		yaml.dump(new_molecules_data_dict, f)
-	sys.exit(1)
-	return
+def read_molecules_from_file(filename):
+	molecule_names = []
+	with open(filename, 'r') as f:
+		for line in f:
+			molecule_name = line.strip()
+			if len(molecule_name) < 2 or molecule_name.startswith("#"):
+				continue
+			molecule_names.append(molecule_name)
+	return molecule_names
 
 
 def main():
 	filename = os.path.join(os.path.dirname(__file__), 'molecules.txt')
-	new_molecules = pubchemlib.read_molecules_from_file(filename)
-
-	new_molecules_data_dict = {}
-
-	count = 0
-	# Process each molecule
-	for molecule in new_molecules:
-		if len(molecule) < 2 or molecule.startswith("#"):
-			continue
-		count += 1
-		if count % 10 == 0:
-			save_data(new_molecules_data_dict)
-		print(molecule)
-		cid = pubchemlib.get_cid(molecule)
-		if cid:
-			low_molecular_name = molecule.lower()
-			smiles = pubchemlib.get_smiles(cid)
-			full_name = pubchemlib.get_chemical_name(cid)
-			molecular_weight = pubchemlib.get_molecular_weight(cid)
-			molecular_formula = pubchemlib.get_molecular_formula(cid)
-			logp = pubchemlib.get_logp(cid)
-
-			# Creating the molecule dictionary
-			molecule_data = {
-				'Abbreviation': low_molecular_name,
-				'CID': cid,
-				'Full name': full_name,
-				'LogP': logp,
-				'Molecular_Formula': molecular_formula,
-				'Molecular_Weight': molecular_weight,
-				'SMILES': smiles,
-			}
-			new_molecules_data_dict[low_molecular_name] = molecule_data
-		else:
-			print(f" .. Could not find data for {low_molecular_name}")
-
-	save_data(new_molecules_data_dict)
+	new_molecules = read_molecules_from_file(filename)
+
+	# warm the shared PubChem cache, uncached CIDs are fetched in batches
+	pcl = pubchemlib.PubChemLib()
+	molecule_data_list = pcl.get_molecule_data_dicts(new_molecules)
+	for molecule, molecule_data in zip(new_molecules, molecule_data_list):
+		if molecule_data is None:
+			print(f" .. Could not find data for {molecule}")
+	pcl.close()
 
 
 if __name__ == "__main__":
@@ -35,20 +35,43 @@ def parse_formula(formula):
 	elements = re.findall(pattern, formula)
 	return {element: int(count) if count else 1 for element, count in elements}
 
+# peptide backbone removed before comparing side chains
+BACKBONE_FORMULA = 'C2H3NO'
+
+# module memo of sorted similarity rows, keyed by the tuple of molecule names
+_similarity_rows_cache = {}
+
 #======================================
 #======================================
-def formula_disimilarity(formula1, formula2):
-	"""Calculate similarity between two chemical formulas."""
-	parsed1 = parse_formula(formula1)
-	parsed2 = parse_formula(formula2)
-	backbone_formula = 'C2H3NO'
-	backbone_parsed = parse_formula(backbone_formula)
-
-	# Subtract the backbone elements from each formula
+def get_side_chain_counts(formula: str) -> dict:
+	"""
+	Parse a formula and subtract the peptide backbone element counts.
+
+	Args:
+		formula (str): molecular formula, e.g. 'C3H7NO2'.
+
+	Returns:
+		dict: element counts with the backbone removed, floored at zero.
+	"""
+	parsed = parse_formula(formula)
+	backbone_parsed = parse_formula(BACKBONE_FORMULA)
 	for element, count in backbone_parsed.items():
-		parsed1[element] = max(parsed1.get(element, 0) - count, 0)
-		parsed2[element] = max(parsed2.get(element, 0) - count, 0)
+		parsed[element] = max(parsed.get(element, 0) - count, 0)
+	return parsed
+
+#======================================
+#======================================
+def side_chain_disimilarity(parsed1: dict, parsed2: dict) -> float:
+	"""
+	Compare two backbone-subtracted element count dicts.
+
+	Args:
+		parsed1 (dict): counts from get_side_chain_counts().
+		parsed2 (dict): counts from get_side_chain_counts().
 
+	Returns:
+		float: 0 for identical side chains, larger for more different ones.
+	"""
 	common_elements = set(parsed1.keys()) & set(parsed2.keys())
 	total_elements = set(parsed1.keys()) | set(parsed2.keys())
 
@@ -59,34 +82,109 @@ def formula_disimilarity(formula1, formula2):
 
 #======================================
 #======================================
-def get_similar_amino_acids(aa_name, num=5, pcl=None):
-	target_data = pcl.get_molecule_data_dict(aa_name)
-	disimilarities = []
+def formula_disimilarity(formula1, formula2):
+	"""Calculate similarity between two chemical formulas."""
+	parsed1 = get_side_chain_counts(formula1)
+	parsed2 = get_side_chain_counts(formula2)
+	return side_chain_disimilarity(parsed1, parsed2)
 
+#======================================
+#======================================
+def build_dissimilarity_matrix(molecule_data_list: list) -> list:
+	"""
+	Build the N x N dissimilarity score matrix for a set of molecules.
+
+	Row i holds the scores of every molecule against molecule i as the target,
+	using the same score as the original per-query search: formula
+	dissimilarity * 100 plus relative weight difference * 20. Formulas are
+	parsed once per molecule instead of once per pair.
+
+	Args:
+		molecule_data_list (list): PubChem molecule data dicts.
+
+	Returns:
+		list: N lists of N float scores, the diagonal is 0.
+	"""
+	weights = [data["Molecular weight"] for data in molecule_data_list]
+	side_chains = [get_side_chain_counts(data["Molecular formula"]) for data in molecule_data_list]
+	matrix = []
+	for i, target_weight in enumerate(weights):
+		row = []
+		for j, weight in enumerate(weights):
+			if i == j:
+				row.append(0.0)
+				continue
+			weight_diff = abs(target_weight - weight)/target_weight
+			formula_disim = side_chain_disimilarity(side_chains[i], side_chains[j])
+			# Adjust the formula to prioritize either property
+			row.append(formula_disim*100 + weight_diff*20)
+		matrix.append(row)
+	return matrix
+
+#======================================
+#======================================
+def build_similarity_rows(molecule_names: list, matrix: list) -> dict:
+	"""
+	Sort each matrix row so top-k lookups are a slice.
+
+	Args:
+		molecule_names (list): names in matrix order.
+		matrix (list): output of build_dissimilarity_matrix().
+
+	Returns:
+		dict: name -> other names, most similar first; ties keep input order.
+	"""
+	rows = {}
+	for i, molecule_name in enumerate(molecule_names):
+		others = [j for j in range(len(molecule_names)) if j != i]
+		others.sort(key=lambda j: matrix[i][j])
+		rows[molecule_name] = [molecule_names[j] for j in others]
+	return rows
+
+#======================================
+#======================================
+def get_similarity_rows(molecule_names: list, pcl=None) -> dict:
+	"""
+	Get sorted similarity rows for a molecule set, building them at most once.
+
+	Rows are memoized per process and stored with the PubChem data cache, so
+	a warm run never touches the PubChem layer after the first lookup.
+
+	Args:
+		molecule_names (list): molecule names, any length.
+		pcl (PubChemLib): open PubChem cache, created if needed.
+
+	Returns:
+		dict: name -> other names, most similar first.
+	"""
+	names_key = tuple(molecule_names)
+	rows = _similarity_rows_cache.get(names_key)
+	if rows is not None:
+		return rows
 	if pcl is None:
 		import pubchemlib
 		pcl = pubchemlib.PubChemLib()
-	#print(f"search amino acid '{aa_name}'")
-	for other_aa_name in amino_acids_fullnames:
-		if other_aa_name == aa_name:
-			continue
-
-		data = pcl.get_molecule_data_dict(other_aa_name)
+	table_name = 'similarity_rows:' + '|'.join(names_key)
+	rows = pcl.get_derived_table(table_name)
+	if rows is None:
+		molecule_data_list = pcl.get_molecule_data_dicts(list(names_key))
+		for molecule_name, data in zip(names_key, molecule_data_list):
+			if data is None:
+				raise ValueError(f"no PubChem data for molecule '{molecule_name}'")
+		matrix = build_dissimilarity_matrix(molecule_data_list)
+		rows = build_similarity_rows(list(names_key), matrix)
+		pcl.set_derived_table(table_name, rows)
+	_similarity_rows_cache[names_key] = rows
+	return rows
 
-		#glycine_mw = 75.07
-		weight_diff = abs(target_data["Molecular weight"] - data["Molecular weight"])/target_data["Molecular weight"]
-		formula_disim = formula_disimilarity(target_data["Molecular formula"], data["Molecular formula"])
-
-		# Combine the weight difference and formula similarity into a single score
-		# Adjust the formula to prioritize either property
-		score = (formula_disim*100 + weight_diff*20)
-		#print(f'score={score:.2f} form->{formula_disim*100:.2f}, mass->{weight_diff*60:.2f} :: {other_aa_name}')
-
-		disimilarities.append((other_aa_name, score))
-
-	# Sort by the score in descending order and return the top `num` amino acids
-	disimilarities.sort(key=lambda x: x[1], reverse=False)
-	return [aa for aa, _ in disimilarities[:num]]
+#======================================
+#======================================
+def get_similar_amino_acids(aa_name, num=5, pcl=None):
+	"""
+	Return the `num` amino acids most similar to `aa_name`, most similar first.
+	"""
+	rows = get_similarity_rows(amino_acids_fullnames, pcl)
+	return rows[aa_name][:num]
 
 
 purines = {
@@ -3,23 +3,111 @@
 import os
 import re
 import copy
+import json
 import time
 import yaml
-import random
+import hashlib
 import requests
 
 # local repo modules
 import bptools
 
+# PubChem PUG REST allows at most 5 requests per second
+PUBCHEM_REQUESTS_PER_SECOND = 5
+# CIDs per batched property request, keeps the URL well under server limits
+PUBCHEM_CID_BATCH_SIZE = 100
+# properties fetched together for each molecule
+PUBCHEM_PROPERTY_LIST = ('SMILES', 'MolecularWeight', 'MolecularFormula', 'XLogP')
+# bump when the snapshot layout changes so old snapshots are rebuilt
+CACHE_SNAPSHOT_VERSION = 1
+
+#============================
+#============================
+class TokenBucket():
+	"""
+	Simple token bucket rate limiter.
+
+	Allows short bursts up to `capacity` requests, then spaces requests at
+	`rate` per second. Waits only as long as needed instead of sleeping
+	a fixed amount after every request.
+	"""
+	#============================
+	def __init__(self, rate: float, capacity: int = None):
+		self.rate = float(rate)
+		if capacity is None:
+			capacity = max(1, int(rate))
+		self.capacity = capacity
+		self.tokens = float(capacity)
+		self.last_time = time.monotonic()
+
+	#============================
+	def acquire(self) -> None:
+		"""
+		Take one token, sleeping until one is available.
+		"""
+		now = time.monotonic()
+		self.tokens = min(self.capacity, self.tokens + (now - self.last_time) * self.rate)
+		self.last_time = now
+		if self.tokens < 1:
+			wait_time = (1 - self.tokens) / self.rate
+			time.sleep(wait_time)
+			self.last_time = time.monotonic()
+			self.tokens = 1.0
+		self.tokens -= 1
+
+#============================
+#============================
+def make_pubchem_session(max_retries: int = 4) -> requests.Session:
+	"""
+	Build a pooled session that retries throttled and failed requests.
+
+	Args:
+		max_retries (int): retries for 429 and 5xx responses, with
+			exponential backoff between attempts.
+
+	Returns:
+		requests.Session: session shared by all calls of one PubChemLib.
+	"""
+	# requests re-exports the urllib3 Retry class it was built against
+	retry = requests.adapters.Retry(
+		total=max_retries,
+		backoff_factor=0.5,
+		status_forcelist=(429, 500, 502, 503, 504),
+		allowed_methods=('GET',),
+		# PubChem answers missing names with a JSON 404, callers read it
+		raise_on_status=False,
+	)
+	adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+	session = requests.Session()
+	session.mount('https://', adapter)
+	session.mount('http://', adapter)
+	return session
+
 #============================
 #============================
 class PubChemLib():
 	#============================
 	#============================
-	def __init__(self):
+	def __init__(self, base_url: str = None, cache_file: str = None,
+			requests_per_second: float = PUBCHEM_REQUESTS_PER_SECOND):
 		self.start_time = time.time()
-		self.BASE_URL = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
-		self.cache_file = bptools.get_repo_data_path('pubchem_molecules_data.yml')
+		if base_url is None:
+			base_url = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
+		self.BASE_URL = base_url
+		if cache_file is None:
+			cache_file = bptools.get_repo_data_path('pubchem_molecules_data.yml')
+		self.cache_file = cache_file
+		# JSON snapshot of the parsed YAML, stamped with the YAML hash
+		cache_base = os.path.splitext(cache_file)[0]
+		self.snapshot_file = cache_base + '.snapshot.json'
+		# new entries are appended here and merged into the YAML on close
+		self.journal_file = cache_base + '.journal.jsonl'
+		self.journal_replayed = False
+		# tables built from the cache, stored in the snapshot next to it
+		self.derived_tables = {}
+		self.yaml_hash = None
+		self.session = make_pubchem_session()
+		self.rate_limiter = TokenBucket(requests_per_second)
 		self.api_count = 0
 		self.cache_dirty = False
 		self.molecule_data_lookup_count = 0
@@ -37,10 +125,19 @@ class PubChemLib():
 		print('==== LOAD CACHE ====')
 		if os.path.isfile(self.cache_file):
 			t0 = time.time()
-			with open(self.cache_file, 'r') as file:
-				self.molecular_data_cache = yaml.safe_load(file)
+			with open(self.cache_file, 'rb') as file:
+				yaml_bytes = file.read()
+			yaml_hash = hashlib.sha256(yaml_bytes).hexdigest()
+			self.yaml_hash = yaml_hash
+			self.molecular_data_cache = self.read_snapshot(yaml_hash)
+			source_file = self.snapshot_file
+			if self.molecular_data_cache is None:
+				# YAML changed or no snapshot yet, parse once and rebuild it
+				self.molecular_data_cache = yaml.safe_load(yaml_bytes)
+				self.write_snapshot(yaml_hash)
+				source_file = self.cache_file
 			print('.. loaded {0} entires from {1} in {2:,d} usec'.format(
-				len(self.molecular_data_cache['cid_to_data']), self.cache_file, int((time.time()-t0)*1e6)))
+				len(self.molecular_data_cache['cid_to_data']), source_file, int((time.time()-t0)*1e6)))
 		else:
 			print(f".. creating NEW data file {self.cache_file}")
 			self.molecular_data_cache = {
@@ -49,9 +146,140 @@ class PubChemLib():
 				'time_stamp': int(time.time()),
 			}
 			self.cache_dirty = True
+		self.replay_journal()
 		#print(len(self.molecular_data_cache['cid_to_data']))
 		print('==== END CACHE ====')
 
+	#============================
+	def read_snapshot(self, yaml_hash: str) -> dict | None:
+		"""
+		Load the JSON snapshot if it was built from the current YAML.
+
+		Args:
+			yaml_hash (str): sha256 hex digest of the YAML cache file.
+
+		Returns:
+			dict | None: cache dict, or None if the snapshot is missing or stale.
+		"""
+		if not os.path.isfile(self.snapshot_file):
+			return None
+		# an unreadable or corrupt snapshot is rebuilt like a stale one
+		try:
+			with open(self.snapshot_file, 'r') as file:
+				snapshot = json.load(file)
+		except (OSError, ValueError):
+			return None
+		if not isinstance(snapshot, dict):
+			return None
+		if snapshot.get('version') != CACHE_SNAPSHOT_VERSION:
+			return None
+		if snapshot.get('yaml_sha256') != yaml_hash:
+			return None
+		cache = snapshot.get('cache')
+		if not isinstance(cache, dict) or not isinstance(cache.get('cid_to_data'), dict):
+			return None
+		self.derived_tables = snapshot.get('derived', {})
+		# JSON object keys are strings, the cache is keyed by int CID
+		cache['cid_to_data'] = {int(cid): data for cid, data in cache['cid_to_data'].items()}
+		return cache
+
+	#============================
+	def write_snapshot(self, yaml_hash: str) -> None:
+		"""
+		Write the in-memory cache as a JSON snapshot stamped with the YAML hash.
+
+		Args:
+			yaml_hash (str): sha256 hex digest of the YAML the cache matches.
+		"""
+		snapshot = {
+			'version': CACHE_SNAPSHOT_VERSION,
+			'yaml_sha256': yaml_hash,
+			'cache': self.molecular_data_cache,
+			'derived': self.derived_tables,
+		}
+		# write then rename, so a reader never sees half a file; the temp
+		# name is per process, since parallel generators may rebuild at once
+		temp_file = f'{self.snapshot_file}.{os.getpid()}.tmp'
+		with open(temp_file, 'w') as file:
+			json.dump(snapshot, file)
+		os.replace(temp_file, self.snapshot_file)
+		self.yaml_hash = yaml_hash
+
+	#============================
+	def append_journal(self, table_name: str, key, value) -> None:
+		"""
+		Record one new cache entry in memory and in the append-only journal.
+
+		Args:
+			table_name (str): 'cid_to_data' or 'name_to_cid'.
+			key: CID number or lowercase molecule name.
+			value: molecule data dict or CID number.
+		"""
+		self.molecular_data_cache[table_name][key] = value
+		self.cache_dirty = True
+		# derived tables may depend on the changed entry
+		self.derived_tables = {}
+		entry = {'table': table_name, 'key': key, 'value': value}
+		with open(self.journal_file, 'a') as file:
+			file.write(json.dumps(entry) + '\n')
+
+	#============================
+	def replay_journal(self) -> None:
+		"""
+		Apply journal entries left by a run that did not reach close().
+		"""
+		if not os.path.isfile(self.journal_file):
+			return
+		entry_count = 0
+		with open(self.journal_file, 'r') as file:
+			for line in file:
+				if len(line.strip()) == 0:
+					continue
+				entry = json.loads(line)
+				key = entry['key']
+				if entry['table'] == 'cid_to_data':
+					key = int(key)
+				self.molecular_data_cache[entry['table']][key] = entry['value']
+				entry_count += 1
+		if entry_count > 0:
+			print(f'.. replayed {entry_count} journal entries from {self.journal_file}')
+			self.cache_dirty = True
+			self.journal_replayed = True
+			self.derived_tables = {}
+
+	#============================
+	def get_derived_table(self, table_name: str):
+		"""
+		Return a table previously built from the cache, if it is still current.
+
+		Args:
+			table_name (str): name the table was stored under.
+
+		Returns:
+			JSON-compatible value, or None if the table was never built or the
+			cache changed since.
+		"""
+		return self.derived_tables.get(table_name)
+
+	#============================
+	def set_derived_table(self, table_name: str, table) -> None:
+		"""
+		Store a table built from the cache so later runs can skip rebuilding it.
+
+		The table is written into the snapshot, so it is dropped together with
+		the snapshot whenever the YAML cache changes. Parallel generators may
+		all call this; each rewrites the snapshot through its own temp file
+		and the last one to finish wins.
+
+		Args:
+			table_name (str): name to store the table under.
+			table: JSON-compatible value built from the current cache.
+		"""
+		self.derived_tables[table_name] = table
+		# a dirty cache rewrites the snapshot on close instead
+		if self.cache_dirty is False and self.yaml_hash is not None:
+			self.write_snapshot(self.yaml_hash)
+
 	#============================
 	#============================
 	def close(self):
@@ -63,27 +291,39 @@ class PubChemLib():
 	#============================
 	#============================
 	def save_cache(self):
-		if self.api_count == 0 or self.cache_dirty is False:
+		"""
+		Merge journaled entries into the YAML file, refresh the snapshot,
+		and clear the journal.
+		"""
+		if self.cache_dirty is False:
+			return
+		if self.api_count == 0 and self.journal_replayed is False:
 			return
 		print('==== SAVE CACHE ====')
 		t0 = time.time()
 		self.molecular_data_cache['time_stamp'] = int(t0)
 		if len(self.molecular_data_cache) > 0:
+			yaml_text = yaml.dump(self.molecular_data_cache)
 			with open(self.cache_file, 'w') as file:
-				yaml.dump(self.molecular_data_cache, file)
+				file.write(yaml_text)
+			yaml_hash = hashlib.sha256(yaml_text.encode('utf-8')).hexdigest()
+			self.write_snapshot(yaml_hash)
+			if os.path.isfile(self.journal_file):
+				os.remove(self.journal_file)
 			print('.. wrote {0} entires to {1} in {2:,d} usec'.format(
 				len(self.molecular_data_cache['cid_to_data']), self.cache_file, int((time.time()-t0)*1e6)))
 			self.cache_dirty = False
+			self.journal_replayed = False
 		print('==== END CACHE ====')
 
 	#============================
 	#============================
 	#=======================
 	def api_call(self, endpoint):
+		"""Make a common API call through the pooled, rate-limited session."""
 		self.api_count += 1
-		"""Make a common API call, and sleep for a random short duration afterwards."""
-		response = requests.get(endpoint)
-		time.sleep(random.random())  # Sleep for 0 to 1 second
+		self.rate_limiter.acquire()
+		response = self.session.get(endpoint, timeout=30)
 		return response.json()
 
 	#============================
@@ -103,8 +343,7 @@ class PubChemLib():
 		if 'IdentifierList' in response_json:
 			cid_number = response_json['IdentifierList']['CID'][0]
 			cid_number = int(cid_number)
-			self.molecular_data_cache['name_to_cid'][low_molecule_name] = cid_number
-			self.cache_dirty = True
+			self.append_journal('name_to_cid', low_molecule_name, cid_number)
 			return cid_number
 		else:
 			return None
@@ -112,7 +351,7 @@ class PubChemLib():
 	#=======================
 	def get_cids_for_formula(self, formula):
 		"""Retrieve compound CIDs from PubChem for a given formula using api_call."""
-		endpoint = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/fastformula/{formula}/cids/JSON"
+		endpoint = f"{self.BASE_URL}/compound/fastformula/{formula}/cids/JSON"
 		response = self.api_call(endpoint)
 		if response and 'IdentifierList' in response:
 			return response['IdentifierList']['CID']
@@ -167,7 +406,7 @@ class PubChemLib():
 	#=======================
 	def get_chemical_name(self, cid):
 		"""Retrieve the chemical name for a given CID."""
-		endpoint = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/synonyms/JSON"
+		endpoint = f"{self.BASE_URL}/compound/cid/{cid}/synonyms/JSON"
 		response = self.api_call(endpoint)
 		if response and 'InformationList' in response:
 			# Return the first name (usually the most common name)
@@ -177,64 +416,118 @@ class PubChemLib():
 	#=======================
 	def get_molecular_weight(self, cid):
 		# Assuming there's a function in your library that retrieves the molecular weight given a CID
-		endpoint = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/property/MolecularWeight/JSON"
+		endpoint = f"{self.BASE_URL}/compound/cid/{cid}/property/MolecularWeight/JSON"
 		response = self.api_call(endpoint)
 		return float(response["PropertyTable"]["Properties"][0]["MolecularWeight"])
 
 	#=======================
 	def get_molecular_formula(self, cid):
 		# Assuming there's a function in your library that retrieves the molecular formula given a CID
-		endpoint = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/property/MolecularFormula/JSON"
+		endpoint = f"{self.BASE_URL}/compound/cid/{cid}/property/MolecularFormula/JSON"
 		response = self.api_call(endpoint)
 		return response["PropertyTable"]["Properties"][0]["MolecularFormula"]
 
-	#============================
-	#============================
+	#=======================
+	def get_properties_for_cids(self, cid_list: list) -> dict:
+		"""
+		Fetch SMILES, weight, formula, XLogP and first synonym for many CIDs.
+
+		Uses two requests per batch of PUBCHEM_CID_BATCH_SIZE CIDs, one for
+		all properties and one for synonyms, instead of five requests per CID.
+
+		Args:
+			cid_list (list): PubChem CID numbers.
+
+		Returns:
+			dict: CID mapped to a dict of the raw property values plus 'Synonym'.
+		"""
+		properties_by_cid = {}
+		property_text = ','.join(PUBCHEM_PROPERTY_LIST)
+		for start in range(0, len(cid_list), PUBCHEM_CID_BATCH_SIZE):
+			batch = cid_list[start:start + PUBCHEM_CID_BATCH_SIZE]
+			cid_text = ','.join(str(cid) for cid in batch)
+			response = self.api_call(f"{self.BASE_URL}/compound/cid/{cid_text}/property/{property_text}/JSON")
+			for props in response.get('PropertyTable', {}).get('Properties', []):
+				cid_number = int(props['CID'])
+				properties_by_cid[cid_number] = props
+				props['SMILES'] = self._extract_smiles_from_property_response(
+					{'PropertyTable': {'Properties': [props]}})
+			response = self.api_call(f"{self.BASE_URL}/compound/cid/{cid_text}/synonyms/JSON")
+			for info in response.get('InformationList', {}).get('Information', []):
+				cid_number = int(info['CID'])
+				synonyms = info.get('Synonym')
+				if cid_number in properties_by_cid and synonyms:
+					properties_by_cid[cid_number]['Synonym'] = synonyms[0]
+		return properties_by_cid
+
 	#============================
 	#============================
 	#=======================
 	def get_molecule_data_dict(self, molecule_name):
-		if molecule_name is None:
-			return None
-		if len(molecule_name) < 2 or molecule_name.startswith("#"):
-			return None
-		low_molecule_name = molecule_name.lower().strip()
-		cid_number = self.get_cid(low_molecule_name)
-		if cid_number is None:
-			return None
-		#check if cached value exists:
-		molecule_data = self.molecular_data_cache['cid_to_data'].get(cid_number)
-		if molecule_data is not None and len(molecule_data) == self.expected_molecule_data_keys:
-			return molecule_data
-
-		self.molecule_data_lookup_count += 1
-
-		smiles = self.get_smiles(cid_number)
-		full_name = self.get_chemical_name(cid_number)
-		if full_name == full_name.upper():
-			full_name = full_name.title()
-		molecular_weight = self.get_molecular_weight(cid_number)
-		molecular_formula = self.get_molecular_formula(cid_number)
-		logp = self.get_logp(cid_number)
-
-		# Creating the molecule dictionary
-		molecule_data = {
-			'Abbreviation': low_molecule_name,
-			'CID': cid_number,
-			'Full name': full_name,
-			'Partition coefficient': logp,
-			'Molecular formula': molecular_formula,
-			'Molecular weight': molecular_weight,
-			'SMILES': smiles,
-		}
+		return self.get_molecule_data_dicts([molecule_name])[0]
 
-		self.molecular_data_cache['cid_to_data'][cid_number] = molecule_data
-		self.cache_dirty = True
+	#=======================
+	def get_molecule_data_dicts(self, molecule_names: list) -> list:
+		"""
+		Look up molecule data for many names, fetching uncached CIDs in batches.
 
-		if self.molecule_data_lookup_count % 10 == 0:
-			self.save_cache()
+		Args:
+			molecule_names (list): molecule names, comment lines start with '#'.
 
-		return molecule_data
+		Returns:
+			list: molecule data dict or None for each name, in input order.
+		"""
+		cid_to_data = self.molecular_data_cache['cid_to_data']
+		cid_list = []
+		missing_cids = {}
+		for molecule_name in molecule_names:
+			if molecule_name is None or len(molecule_name) < 2 or molecule_name.startswith("#"):
+				cid_list.append(None)
+				continue
+			low_molecule_name = molecule_name.lower().strip()
+			cid_number = self.get_cid(low_molecule_name)
+			cid_list.append(cid_number)
+			if cid_number is None:
+				continue
+			#check if cached value exists:
+			molecule_data = cid_to_data.get(cid_number)
+			if molecule_data is not None and len(molecule_data) == self.expected_molecule_data_keys:
+				continue
+			# the first name that maps to a CID becomes its abbreviation
+			missing_cids.setdefault(cid_number, low_molecule_name)
+
+		if len(missing_cids) > 0:
+			self.molecule_data_lookup_count += len(missing_cids)
+			properties_by_cid = self.get_properties_for_cids(list(missing_cids.keys()))
+			for cid_number, low_molecule_name in missing_cids.items():
+				props = properties_by_cid.get(cid_number)
+				if props is None or props.get('SMILES') is None:
+					raise KeyError(f"PubChem properties not found for CID {cid_number}")
+				full_name = props.get('Synonym')
+				if full_name is not None and full_name == full_name.upper():
+					full_name = full_name.title()
+				logp = props.get('XLogP')
+				if logp is not None:
+					logp = float(logp)
+				# Creating the molecule dictionary
+				molecule_data = {
+					'Abbreviation': low_molecule_name,
+					'CID': cid_number,
+					'Full name': full_name,
+					'Partition coefficient': logp,
+					'Molecular formula': props['MolecularFormula'],
+					'Molecular weight': float(props['MolecularWeight']),
+					'SMILES': props['SMILES'],
+				}
+				self.append_journal('cid_to_data', cid_number, molecule_data)
+
+		molecule_data_list = []
+		for cid_number in cid_list:
+			if cid_number is None:
+				molecule_data_list.append(None)
+			else:
+				molecule_data_list.append(cid_to_data.get(cid_number))
+		return molecule_data_list
 
 	#============================
 	#============================
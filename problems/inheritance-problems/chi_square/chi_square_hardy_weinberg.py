@@ -5,9 +5,9 @@ import sys
 import copy
 import math
 import random
-from scipy.stats.distributions import chi2
 
 import bptools
+import chisquarelib
 
 ### types of errors
 # show only real answer table of chi square calculations
@@ -80,20 +80,6 @@ def choice2answer(desired_result):
 		sys.exit(1)
 	return answer
 
-#===================
-#===================
-def get_p_value(chisq, df):
-	#print("chisq={0}, df={1}".format(chisq, df))
-	pvalue = chi2.sf(float(chisq), int(df))
-	return float(pvalue)
-
-#===================
-#===================
-def get_critical_value(alpha_criterion, df):
-	critical_value = chi2.ppf(1.0 - float(alpha_criterion), int(df))
-	#print(chisq)
-	return float(critical_value)
-
 #===================
 #===================
 def createObservedCounts(p, F, N, decimal_places=0):
@@ -215,7 +201,7 @@ def make_chi_square_table():
 		table += "<tr>"
 		table += " <th align='center' style='background-color: silver'>{0:d}</th>".format(df)
 		for p in p_values:
-			chisq = get_critical_value(p, df)
+			chisq = chisquarelib.get_critical_value(p, df)
 			table += " <td align='center'>{0:.2f}</td>".format(chisq)
 		table += "</tr>"
 	table += "</table>"
@@ -236,7 +222,7 @@ def questionContent(p):
 #===================
 #===================
 def getChiSquareResult(final_chisq, df, alpha):
-	critical_value = get_critical_value(alpha, df)
+	critical_value = chisquarelib.get_critical_value(alpha, df)
 	if final_chisq > critical_value:
 		return 'reject_null'
 	elif final_chisq <= critical_value:
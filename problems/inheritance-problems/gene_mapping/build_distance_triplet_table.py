@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+"""
+Build the precomputed distance-triplet table used by genemaplib.
+
+Each row of the table is (numerator, denominator, y, x, z): a reduced
+interference fraction a/b and the distance triplet that it produces under
+the same rules as genemaplib.distance_triplet_generator(). The x/y grid is
+scanned once per fraction with NumPy, so the full table for every fraction
+with denominator up to 100 builds in well under a second.
+"""
+
+# Standard Library
+import math
+import json
+import argparse
+
+# PIP3 modules
+import numpy
+
+# local repo modules
+import bptools
+import genemaplib as gml
+
+#============================================
+def triplets_for_fraction(numerator: int, denominator: int, max_distance: int) -> list:
+	"""
+	Find every valid (y, x, z) distance triplet for one interference fraction.
+
+	Mirrors genemaplib.distance_triplet_generator() with integer arithmetic:
+	minN(x, y, a, b) < 10000, z is a whole number, y < z < max_distance,
+	and consecutive distances differ by more than 1 cM.
+
+	Args:
+		numerator (int): interference numerator a.
+		denominator (int): interference denominator b, with a < b.
+		max_distance (int): exclusive upper bound on x, y, and z.
+
+	Returns:
+		list: sorted (y, x, z) tuples of python ints.
+	"""
+	a = numerator
+	b = denominator
+	# grid of x <= y pairs, already filtered by the y - x > 1 spacing rule
+	x_grid, y_grid = numpy.meshgrid(
+		numpy.arange(1, max_distance, dtype=numpy.int64),
+		numpy.arange(1, max_distance, dtype=numpy.int64),
+		indexing='ij',
+	)
+	spaced = (y_grid - x_grid) > 1
+	x = x_grid[spaced]
+	y = y_grid[spaced]
+
+	# minN() < 10000 is the same as the gcd of the minN terms exceeding b
+	gcd_terms = numpy.gcd.reduce([
+		100 * b * x,
+		100 * b * y,
+		x * y * (b - a),
+		numpy.full_like(x, 10000 * b),
+	])
+	# z = x + y - 2*x*y*(b-a)/(100*b) is whole only when the division is exact
+	dco_twice_scaled = 2 * x * y * (b - a)
+	is_whole = (dco_twice_scaled % (100 * b)) == 0
+	z = x + y - dco_twice_scaled // (100 * b)
+
+	keep = (gcd_terms > b) & is_whole & ((z - y) > 1) & (z < max_distance)
+	triplets = [(int(yi), int(xi), int(zi)) for xi, yi, zi in zip(x[keep], y[keep], z[keep])]
+	triplets.sort()
+	return triplets
+
+#============================================
+def build_distance_triplet_rows(max_denominator: int, max_distance: int) -> list:
+	"""
+	Build table rows for every reduced fraction a/b with b <= max_denominator.
+
+	Args:
+		max_denominator (int): largest interference denominator to include.
+		max_distance (int): exclusive upper bound on x, y, and z.
+
+	Returns:
+		list: rows (a, b, y, x, z) sorted by fraction then by triplet.
+	"""
+	rows = []
+	for denominator in range(2, max_denominator + 1):
+		for numerator in range(1, denominator):
+			# only reduced fractions, duplicates give identical triplets
+			if math.gcd(numerator, denominator) != 1:
+				continue
+			for triplet in triplets_for_fraction(numerator, denominator, max_distance):
+				rows.append((numerator, denominator) + triplet)
+	rows.sort()
+	return rows
+
+#============================================
+def write_table(rows: list, max_denominator: int, max_distance: int, outfile: str) -> None:
+	"""
+	Write the table as JSON with one row per line so diffs stay readable.
+
+	Args:
+		rows (list): rows from build_distance_triplet_rows().
+		max_denominator (int): recorded so loaders can check coverage.
+		max_distance (int): recorded so loaders can check coverage.
+		outfile (str): output JSON path.
+	"""
+	header = {
+		'version': gml.DISTANCE_TRIPLET_TABLE_VERSION,
+		'max_denominator': max_denominator,
+		'max_distance': max_distance,
+		'columns': ['numerator', 'denominator', 'y', 'x', 'z'],
+	}
+	text = '{\n'
+	for key, value in header.items():
+		text += f'"{key}": {json.dumps(value)},\n'
+	text += '"rows": [\n'
+	row_lines = [json.dumps(list(row)) for row in rows]
+	text += ',\n'.join(row_lines)
+	text += '\n]\n}\n'
+	with open(outfile, 'w') as f:
+		f.write(text)
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(description="Rebuild the gene map distance-triplet table.")
+	parser.add_argument(
+		'-o', '--output', dest='output_file', type=str,
+		default=bptools.get_repo_data_path(gml.DISTANCE_TRIPLET_TABLE_FILE),
+		help='Output JSON file.',
+	)
+	args = parser.parse_args()
+	return args
+
+#============================================
+def main():
+	args = parse_args()
+	# 100 covers the percent-style interference fractions, 50 is the
+	# largest distance calculate_third_distance() accepts
+	max_denominator = 100
+	max_distance = 50
+	rows = build_distance_triplet_rows(max_denominator, max_distance)
+	write_table(rows, max_denominator, max_distance, args.output_file)
+	print(f'wrote {len(rows)} distance triplet rows to {args.output_file}')
+
+#============================================
+if __name__ == '__main__':
+	main()
@@ -145,8 +145,8 @@ class GeneMappingClass:
 	- Calculating progeny counts and groupings based on crossover events.
 	- Producing visual representations of the generated genetic map.
 	"""
-	# Class-level variable to cache distance triplets across instances
-	_distance_triplet_list_cache = None
+	# Class-level pools of validated three-gene scenarios, drawn without replacement
+	_scenario_pool_dict = {}
 
 	#===========================================================
 	def __init__(self, num_genes_int: int, question_count: int = 1, debug: bool = False) -> None:
@@ -190,6 +190,7 @@ class GeneMappingClass:
 		self.interference_dict = None
 		self.distances_dict = None
 		self.progeny_count_int = -1
+		self.scenario_progeny_count_int = None
 		self.multiplier = 100  # Scaling factor for calculating distances
 
 		# Initialize data structures for genotype pairs and progeny counts
@@ -469,10 +470,12 @@ class GeneMappingClass:
 		elif self.num_genes_int == 3:
 			# For three genes, generate three distances, using a distance triplet
 			self.distances_dict = {}
-			distance_triplet = self.get_one_distance_triplet(
+			scenario = self.get_one_scenario(
 				max_gene_distance=self.max_gene_distance,
 				interference_mode=self.interference_mode
 			)
+			distance_triplet = scenario[:3]
+			self.scenario_progeny_count_int = scenario[3]
 			# Randomly assign the first two distances
 			if random.random() < 0.5:
 				self.distances_dict[(1, 2)] = distance_triplet[0]
@@ -509,44 +512,29 @@ class GeneMappingClass:
 	#====================================
 	#====================================
 	@classmethod
-	def get_one_distance_triplet(cls, max_fraction_int: int = 12, max_gene_distance: int = 40, interference_mode: bool = False) -> list:
+	def get_one_scenario(cls, max_gene_distance: int = 40, interference_mode: bool = False) -> tuple:
 		"""
-		Fetches a single distance triplet for three-gene scenarios, optionally considering interference.
+		Draws one pre-validated three-gene scenario without replacement.
+
+		The full pool from `gml.get_three_point_scenarios()` is shuffled once per
+		(interference mode, max distance) and handed out one scenario at a time,
+		so a large run only repeats a scenario after the whole pool is used.
+		The pool is reshuffled when it runs out.
 
 		Args:
-			max_fraction_int (int): The maximum allowable fraction for interference calculations.
 			max_gene_distance (int): The maximum distance between genes.
-			interference_mode (bool): Whether to use interference-based triplet generation.
+			interference_mode (bool): Whether to use interference-based triplets.
 
 		Returns:
-			list: A list of three distances between genes.
-
-		If the distance triplet list has already been cached, it randomly selects a triplet from the cache.
-		If interference mode is enabled, it uses a different function to generate triplets.
-
-		interference_mode = True:
-			Generates a list of unique distance triplets based on interference fractions,
-			with a fixed denominator of 100 for each fraction.
-			interference is always a whole number when multiplied by 100
-
-		interference_mode = False:
-			uses a tuple representing the interference fraction (a, b).
-			interference is a rational value or fraction value
+			tuple: (x, y, z, progeny_count) with whole-number progeny groups.
 		"""
-		# Return cached triplet list if it exists
-		if cls._distance_triplet_list_cache is not None:
-			return random.choice(cls._distance_triplet_list_cache)
-
-		# Generate triplet list based on interference mode
-		if interference_mode:
-			max_fraction_int = 99
-			distance_triplet_list = gml.get_all_distance_triplets_INTERFERENCE(max_fraction_int, max_gene_distance)
-		else:
-			distance_triplet_list = gml.get_all_distance_triplets(max_fraction_int, max_gene_distance)
-
-		# Cache the triplet list and return a random choice
-		cls._distance_triplet_list_cache = distance_triplet_list
-		return random.choice(distance_triplet_list)
+		pool_key = (interference_mode, max_gene_distance)
+		scenario_pool = cls._scenario_pool_dict.get(pool_key)
+		if not scenario_pool:
+			scenario_pool = list(gml.get_three_point_scenarios(interference_mode, max_gene_distance))
+			random.shuffle(scenario_pool)
+			cls._scenario_pool_dict[pool_key] = scenario_pool
+		return scenario_pool.pop()
 
 	#====================================
 	#====================================
@@ -576,6 +564,10 @@ class GeneMappingClass:
 				raise ValueError(f"progeny count error: {progeny_count:.8f}")
 			self.progeny_count_int = int(round(progeny_count))
 
+		elif self.scenario_progeny_count_int is not None:
+			# Three-gene scenarios come with an already validated progeny size
+			self.progeny_count_int = self.scenario_progeny_count_int
+
 		else:
 			# For numerical questions, calculate progeny size directly
 			self.progeny_count_int = gml.get_general_progeny_size(tuple(self.distances_dict.values()))
@@ -1045,7 +1037,8 @@ class GeneMappingClass:
 		"""
 		Helper for make_choices().
 		Add combinations of genotypes of length k as distractors, preferring
-		a diverse spread of fractions when max_choices is set.
+		a diverse spread of fractions when max_choices is set. Combinations
+		that sum to the same recombinant total are kept only once.
 
 		Args:
 			k (int): Size of genotype combination (2, 3, 4, etc.).
@@ -1057,50 +1050,37 @@ class GeneMappingClass:
 
 		Modifies: choices_set
 		"""
-		candidates = []
 		all_genotypes = list(self.genotype_counts.keys())
 
+		# one candidate per recombinant total, the first combination seen wins
+		candidates_by_total = {}
 		for combo in itertools.combinations(all_genotypes, k):
 			combo_tuple = tuple(sorted(combo))
 			if combo_tuple in choices_set:
 				continue
 			values_list = [self.genotype_counts[gt] for gt in combo_tuple]
-			frac = sum(values_list) / float(self.progeny_count_int)
+			val_sum = sum(values_list)
+			if val_sum in candidates_by_total:
+				continue
+			frac = val_sum / float(self.progeny_count_int)
 			if frac > 0.51:
 				continue
-			candidates.append((frac, combo_tuple, values_list))
+			candidates_by_total[val_sum] = (frac, combo_tuple, values_list)
 
 		# Nothing to add
-		if not candidates:
+		if not candidates_by_total:
 			return set()
 
+		candidates = [candidates_by_total[val_sum] for val_sum in sorted(candidates_by_total)]
+
 		# If no cap, return all
 		if max_choices is None or max_choices >= len(candidates):
-			new_texts = set()
-			for frac, combo_tuple, values_list in candidates:
-				choices_set.add(combo_tuple)
-				new_texts.add(self.values_to_text(values_list))
-			return new_texts
-
-		# Greedy diverse selection on fraction space
-		candidates.sort(key=lambda x: x[0])  # sort by frac
-		selected = []
-
-		# seed with extremes
-		selected.append(candidates[0])
-		if len(selected) < max_choices and len(candidates) > 1:
-			selected.append(candidates[-1])
-
-		# pick next items maximizing min distance to selected set
-		def min_dist_to_selected(f):
-			return min(abs(f - s[0]) for s in selected)
-
-		while len(selected) < max_choices and len(selected) < len(candidates):
-			best = max(
-				(c for c in candidates if c not in selected),
-				key=lambda c: min_dist_to_selected(c[0])
-			)
-			selected.append(best)
+			selected = candidates
+		else:
+			# Diverse selection on fraction space, farthest-point sampling
+			fractions = [candidate[0] for candidate in candidates]
+			selected_indices = gml.select_diverse_indices(fractions, max_choices)
+			selected = [candidates[index] for index in selected_indices]
 
 		# Emit results
 		new_texts = set()
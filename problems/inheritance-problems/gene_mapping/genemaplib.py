@@ -1,14 +1,22 @@
 
-import re
 import sys
 import copy
+import json
 import math
+import heapq
+import bisect
 import random
+import functools
 
 import bptools
+import html_validator_lib
 
 debug = False
 
+# precomputed distance triplets, rebuild with build_distance_triplet_table.py
+DISTANCE_TRIPLET_TABLE_FILE = 'gene_map_distance_triplets.json'
+DISTANCE_TRIPLET_TABLE_VERSION = 1
+
 #===========================================================
 # Function to generate a unique set of gene letters
 #===========================================================
@@ -222,8 +230,6 @@ assert get_phenotype_name_for_genotype('++', None) == '<i>wildtype</i>'
 #===========================================================
 #===========================================================
 
-from lxml import etree
-
 def is_valid_html(html_str: str, debug: bool=True) -> bool:
 	"""
 	Validates if the input HTML string is well-formed by removing entities
@@ -237,29 +243,8 @@ def is_valid_html(html_str: str, debug: bool=True) -> bool:
 	"""
 	if '\n' in html_str:
 		raise ValueError("Blackboard upload does not support newlines in the HTML code.")
-	html_str = html_str.replace('<', '\n<')  # Optional: format the input HTML string for better readability on error
-	try:
-		# Remove HTML entities by finding '&' followed by alphanumerics or '#' and a semicolon
-		cleaned_html = re.sub(r'&[#a-zA-Z0-9]+;', '', html_str)
-		# Wrap in a root tag for XML parsing as XML requires a single root element
-		wrapped_html = f"<root>{cleaned_html}</root>"
-		# Parse the cleaned and wrapped HTML with XML parser
-		etree.fromstring(wrapped_html)
-		return True
-	except etree.XMLSyntaxError as e:
-		# Print detailed error information for debugging
-		if debug: print(f"Parse error: {e}")
-
-		# Optional: Print a snippet of the HTML around the error
-		error_index = e.position[1] if hasattr(e, 'position') else 0
-		snippet = cleaned_html[max(0, error_index - 40): error_index + 40]
-		if debug: print(f"Snippet around error (40 chars before and after):\n{snippet}")
-
-		# Optional: Print the entire cleaned HTML if debugging further
-		if debug: print("Full cleaned HTML (wrapped in root):")
-		if debug: print(wrapped_html)
-
-		return False
+	# shared memoized check, repeated tables and choices are parsed once
+	return html_validator_lib.is_well_formed(html_str, debug)
 
 # Simple assertion test for the function: 'is_valid_html'
 assert is_valid_html("<p>This is a paragraph.</p>") == True
@@ -596,12 +581,80 @@ def distance_triplet_generator(interference_tuple: tuple=(0,1), max_dist: int=40
 # Example assertion for simple function validation (assuming other functions are defined)
 assert distance_triplet_generator((9,11), 36) == [(25, 11, 35)]
 
+#====================================
+#====================================
+@functools.lru_cache(maxsize=None)
+def load_distance_triplet_table() -> tuple:
+	"""
+	Loads the precomputed distance-triplet table from the repo data directory.
+
+	The table is built once by build_distance_triplet_table.py and holds one
+	(numerator, denominator, y, x, z) row for every triplet that
+	distance_triplet_generator() would produce for a reduced interference
+	fraction. It is read once per process and shared by every caller.
+
+	Returns:
+		tuple: (header_dict, rows) where rows is a tuple of 5-int tuples.
+
+	Raises:
+		ValueError: If the table version does not match this library.
+	"""
+	table_path = bptools.get_repo_data_path(DISTANCE_TRIPLET_TABLE_FILE)
+	with open(table_path, 'r') as f:
+		table_data = json.load(f)
+	if table_data['version'] != DISTANCE_TRIPLET_TABLE_VERSION:
+		raise ValueError(
+			f"{DISTANCE_TRIPLET_TABLE_FILE} is version {table_data['version']}, "
+			f"expected {DISTANCE_TRIPLET_TABLE_VERSION}; rerun build_distance_triplet_table.py"
+		)
+	rows = tuple(tuple(row) for row in table_data.pop('rows'))
+	return table_data, rows
+
+#====================================
+#====================================
+@functools.lru_cache(maxsize=32)
+def get_distance_triplet_rows(max_distance: int=40, max_denominator: int=12, denominator_divides: int=None) -> tuple:
+	"""
+	Filters the precomputed table by maximum distance and interference denominator.
+
+	Args:
+		max_distance (int): Exclusive upper bound on every distance in the triplet.
+		max_denominator (int): Largest reduced interference denominator to keep.
+		denominator_divides (int): If set, keep only denominators that divide this value,
+			e.g. 100 for percent-style interference.
+
+	Returns:
+		tuple: (numerator, denominator, y, x, z) rows sorted by fraction then triplet.
+	"""
+	header, rows = load_distance_triplet_table()
+	# the table only covers what it was built for, fail loudly beyond that
+	if max_distance > header['max_distance'] or max_denominator > header['max_denominator']:
+		raise ValueError(
+			f"distance triplet table covers max_distance <= {header['max_distance']} and "
+			f"denominators <= {header['max_denominator']}; got {max_distance}, {max_denominator}"
+		)
+	filtered_rows = []
+	for row in rows:
+		denominator = row[1]
+		if denominator > max_denominator:
+			continue
+		if denominator_divides is not None and denominator_divides % denominator != 0:
+			continue
+		# z is the largest distance in each triplet
+		if row[4] >= max_distance:
+			continue
+		filtered_rows.append(row)
+	filtered_rows = tuple(filtered_rows)
+	return filtered_rows
+
 #====================================
 #====================================
 def get_all_distance_triplets(max_fraction_int: int=12, max_distance: int=40, msg: bool=True) -> list:
 	"""
 	Generates a list of unique distance triplets based on interference fractions and maximum distance.
 
+	Served from the precomputed table, so the cost no longer grows with `max_fraction_int`.
+
 	Args:
 		max_fraction_int (int): The maximum integer for the fraction's numerator and denominator.
 		max_distance (int): The maximum allowable distance in each distance triplet.
@@ -610,31 +663,9 @@ def get_all_distance_triplets(max_fraction_int: int=12, max_distance: int=40, ms
 	Returns:
 		list: A list of valid distance triplets generated by `distance_triplet_generator`.
 	"""
-	# Dictionary to keep track of used numerator/denominator pairs to avoid duplicates.
-	used_values = {}
-
-	# List to store all generated distance triplets.
-	distance_triplet_list = []
-
-	# Iterate over possible values for the numerator and denominator within max_fraction_int.
-	for numerator_prime in range(1, max_fraction_int):
-		for denominator_prime in range(numerator_prime + 1, max_fraction_int + 1):
-			# Calculate the GCD to reduce the fraction (numerator_prime/denominator_prime) to its simplest form.
-			gcd_prime = math.gcd(numerator_prime, denominator_prime)
-			numerator = numerator_prime // gcd_prime
-			denominator = denominator_prime // gcd_prime
-
-			# Check if the fraction (numerator, denominator) has been used already.
-			if used_values.get((numerator, denominator)) is None:
-				# Mark this fraction as used.
-				used_values[(numerator, denominator)] = True
-
-				# Generate distance triplets for the current fraction.
-				new_distance_triplet_list = distance_triplet_generator((numerator, denominator), max_distance)
-
-				# If valid triplets were generated, add them to the main list.
-				if new_distance_triplet_list is not None:
-					distance_triplet_list += new_distance_triplet_list
+	# rows are already ordered by fraction (a, b) then by triplet
+	rows = get_distance_triplet_rows(max_distance, max_fraction_int)
+	distance_triplet_list = [row[2:] for row in rows]
 
 	# If msg is True, print the number of distance triplets found and other parameters.
 	if msg is True:
@@ -698,6 +729,8 @@ def get_all_distance_triplets_INTERFERENCE(max_fraction_int: int=99, max_distanc
 	Generates a list of unique distance triplets based on interference fractions,
 	with a fixed denominator of 100 for each fraction.
 
+	Served from the precomputed table, keeping only fractions that reduce from n/100.
+
 	Args:
 		max_fraction_int (int): The maximum integer for the numerator of the fraction.
 		max_distance (int): The maximum allowable distance in each distance triplet.
@@ -706,33 +739,15 @@ def get_all_distance_triplets_INTERFERENCE(max_fraction_int: int=99, max_distanc
 	Returns:
 		list: A list of valid distance triplets generated by `distance_triplet_generator`.
 	"""
-	# Dictionary to keep track of used numerator/denominator pairs to avoid duplicates.
-	used_values = {}
+	rows = get_distance_triplet_rows(max_distance, 100, denominator_divides=100)
 
-	# List to store all generated distance triplets.
 	distance_triplet_list = []
-
-	# Iterate over possible values for the numerator within the range specified by `max_fraction_int`.
-	for numerator_prime in range(1, max_fraction_int):
-		# Fixed denominator of 100 for all fractions in this function.
-		denominator_prime = 100
-
-		# Calculate the GCD to reduce the fraction (numerator_prime/denominator_prime) to its simplest form.
-		gcd_prime = math.gcd(numerator_prime, denominator_prime)
-		numerator = numerator_prime // gcd_prime
-		denominator = denominator_prime // gcd_prime
-
-		# Check if the fraction (numerator, denominator) has been used already.
-		if used_values.get((numerator, denominator)) is None:
-			# Mark this fraction as used.
-			used_values[(numerator, denominator)] = True
-
-			# Generate distance triplets for the current fraction.
-			new_distance_triplet_list = distance_triplet_generator((numerator, denominator), max_distance)
-
-			# If valid triplets were generated, add them to the main list.
-			if new_distance_triplet_list is not None:
-				distance_triplet_list += new_distance_triplet_list
+	# order by the unreduced numerator n of n/100, matching the original scan order
+	for row in sorted(rows, key=lambda r: (r[0] * 100 // r[1], r[2:])):
+		percent_numerator = row[0] * 100 // row[1]
+		if percent_numerator >= max_fraction_int:
+			continue
+		distance_triplet_list.append(row[2:])
 
 	# If `msg` is True, print the number of distance triplets found and other parameters.
 	if msg is True:
@@ -745,6 +760,84 @@ def get_all_distance_triplets_INTERFERENCE(max_fraction_int: int=99, max_distanc
 	# Return the complete list of distance triplets.
 	return distance_triplet_list
 
+#====================================
+#====================================
+def _best_index_in_gap(sorted_values: list, lo_index: int, hi_index: int) -> tuple:
+	"""
+	Finds the value strictly between two selected indices farthest from both ends.
+
+	The distance to the nearest end rises then falls across the gap, so the
+	best value is one of the two neighbors of the gap midpoint.
+
+	Args:
+		sorted_values (list): Ascending numbers.
+		lo_index (int): Index of the selected value below the gap.
+		hi_index (int): Index of the selected value above the gap.
+
+	Returns:
+		tuple: (distance, index) of the best value, or None if the gap is empty.
+	"""
+	if hi_index - lo_index < 2:
+		return None
+	lo_value = sorted_values[lo_index]
+	hi_value = sorted_values[hi_index]
+	midpoint = (lo_value + hi_value) / 2.0
+	mid_index = bisect.bisect_left(sorted_values, midpoint, lo_index + 1, hi_index)
+	best = None
+	# check the neighbor below the midpoint first so ties keep the smaller value
+	for index in (mid_index - 1, mid_index):
+		if index <= lo_index or index >= hi_index:
+			continue
+		value = sorted_values[index]
+		distance = min(value - lo_value, hi_value - value)
+		if best is None or distance > best[0]:
+			best = (distance, index)
+	return best
+
+#====================================
+#====================================
+def select_diverse_indices(sorted_values: list, max_choices: int) -> list:
+	"""
+	Picks a spread-out subset of ascending values by farthest-point sampling.
+
+	Seeds with the smallest and largest values, then repeatedly adds the value
+	whose distance to its nearest selected neighbor is largest. On a sorted
+	1-D list the nearest selected neighbors are the ends of the gap holding
+	the value, so each gap is scored once with bisect and kept in a heap,
+	for O(n log n) total instead of rescoring every candidate per pick.
+	Ties go to the smaller value.
+
+	Args:
+		sorted_values (list): Ascending, distinct numbers.
+		max_choices (int): Number of values to select.
+
+	Returns:
+		list: Selected indices into `sorted_values`, in pick order.
+	"""
+	# seed with extremes
+	selected = [0]
+	last_index = len(sorted_values) - 1
+	if len(selected) < max_choices and last_index > 0:
+		selected.append(last_index)
+	else:
+		return selected
+
+	# heap of gaps keyed by (-distance, index) so ties pop the smaller value
+	gap_heap = []
+	first_gap = _best_index_in_gap(sorted_values, 0, last_index)
+	if first_gap is not None:
+		heapq.heappush(gap_heap, (-first_gap[0], first_gap[1], 0, last_index))
+
+	while len(selected) < max_choices and gap_heap:
+		neg_distance, index, lo_index, hi_index = heapq.heappop(gap_heap)
+		selected.append(index)
+		# the chosen value splits its gap in two
+		for new_lo, new_hi in ((lo_index, index), (index, hi_index)):
+			gap = _best_index_in_gap(sorted_values, new_lo, new_hi)
+			if gap is not None:
+				heapq.heappush(gap_heap, (-gap[0], gap[1], new_lo, new_hi))
+	return selected
+
 #====================================
 #====================================
 def get_general_progeny_size(distances: tuple) -> int:
@@ -798,6 +891,76 @@ def get_general_progeny_size(distances: tuple) -> int:
 #assert get_general_progeny_size([2, 3, 7]) % 200 == 0
 #assert get_general_progeny_size([10, 20, 30]) % 20 == 0
 
+#====================================
+def is_valid_three_point_scenario(x: int, y: int, z: int, progeny_count: int) -> bool:
+	"""
+	Checks that a three-point test cross gives whole, well-ordered progeny groups.
+
+	Uses integer arithmetic only, so no float tolerance is involved. Mirrors the
+	group counts built by GeneMappingClass.set_progeny_groups_counts().
+
+	Args:
+		x (int): distance between the first pair of adjacent genes.
+		y (int): distance between the second pair of adjacent genes.
+		z (int): distance between the two outer genes.
+		progeny_count (int): total number of progeny.
+
+	Returns:
+		bool: True if every group count is a positive integer and the
+			parental group is the largest and the DCO group the smallest.
+	"""
+	a, b = calculate_interference_from_three_distances(x, y, z)
+	# dco = N * x/100 * y/100 * (b-a)/b
+	dco_scaled = progeny_count * x * y * (b - a)
+	if dco_scaled % (10000 * b) != 0:
+		return False
+	if (progeny_count * x) % 100 != 0 or (progeny_count * y) % 100 != 0:
+		return False
+	dco = dco_scaled // (10000 * b)
+	sco_x = progeny_count * x // 100 - dco
+	sco_y = progeny_count * y // 100 - dco
+	parental = progeny_count - sco_x - sco_y - dco
+	if dco < 1 or dco >= min(sco_x, sco_y):
+		return False
+	if parental <= max(sco_x, sco_y):
+		return False
+	return True
+
+#====================================
+@functools.lru_cache(maxsize=8)
+def get_three_point_scenarios(interference_mode: bool = False, max_distance: int = 40) -> tuple:
+	"""
+	Enumerates every valid three-point test cross scenario in one pass.
+
+	Each distance triplet is paired with every progeny size that
+	get_general_progeny_size() could draw for it, and only the pairs that pass
+	is_valid_three_point_scenario() are kept. The triplets come from the
+	precomputed table, so the whole pool builds in a few milliseconds and is
+	cached for the rest of the run.
+
+	Args:
+		interference_mode (bool): use the percent-style interference triplets.
+		max_distance (int): maximum allowable distance in each triplet.
+
+	Returns:
+		tuple: sorted (x, y, z, progeny_count) tuples.
+	"""
+	if interference_mode:
+		distance_triplets = get_all_distance_triplets_INTERFERENCE(99, max_distance, msg=False)
+	else:
+		distance_triplets = get_all_distance_triplets(12, max_distance, msg=False)
+	scenarios = []
+	for x, y, z in distance_triplets:
+		a, b = calculate_interference_from_three_distances(x, y, z)
+		progeny_base = minN(x, y, a, b)
+		# same multiplier range as get_general_progeny_size()
+		for multiplier in range(900 // progeny_base + 1, 9900 // progeny_base):
+			progeny_count = multiplier * progeny_base
+			if is_valid_three_point_scenario(x, y, z, progeny_count):
+				scenarios.append((x, y, z, progeny_count))
+	scenarios.sort()
+	return tuple(scenarios)
+
 #====================================
 def get_progeny_size(distance: int) -> int:
 	"""
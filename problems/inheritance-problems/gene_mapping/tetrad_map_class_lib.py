@@ -17,8 +17,6 @@ class TetradMappingClass(gmc.GeneMappingClass):
 	to tetrad analysis, which might involve additional calculations or data structures
 	for handling tetrad-based gene mapping problems.
 	"""
-	# Class-level variable to cache distance triplets across instances
-	_distance_triplet_list_cache = None
 
 	def __init__(self, num_genes_int: int, question_count: int = 1, debug: bool = True) -> None:
 		"""
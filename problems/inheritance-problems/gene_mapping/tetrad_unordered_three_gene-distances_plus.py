@@ -13,7 +13,8 @@ import tetrad_solver_lib as tusl
 bptools.allow_no_click_div = False
 debug = False
 
-DISTANCE_TRIPLETS: list[tuple[int, int, int]] = []
+VALID_SCENARIOS: dict[tuple[int, int, int], list[int]] = {}
+VALID_DISTANCE_TRIPLETS: list[tuple[int, int, int]] = []
 QUESTION_HEADER = ""
 FOOTER_STEPS = ""
 IMPORTANT_TIPS = ""
@@ -178,14 +179,13 @@ def write_question(N: int, args) -> str | None:
 
 	gene_order_str = gml.get_random_gene_order(gene_letters_str)
 
-	distances = sorted(random.choice(DISTANCE_TRIPLETS))
-	while distances[1] > 26 and len(set(distances)) == 3:
-		distances = sorted(random.choice(DISTANCE_TRIPLETS))
+	# scenarios are pre-filtered, so one draw always gives valid counts
+	distance_tuple = random.choice(VALID_DISTANCE_TRIPLETS)
+	progeny_size = random.choice(VALID_SCENARIOS[distance_tuple])
+	distances = list(distance_tuple)
 	if debug:
 		print(f"Distances: {distances}")
 
-	progeny_size = gml.get_general_progeny_size(distances) * 3
-
 	progeny_tetrads_count_dict = tetradlib.construct_progeny_counts(
 		gene_letters_str,
 		gene_order_str,
@@ -225,13 +225,22 @@ def write_question(N: int, args) -> str | None:
 def main():
 	args = parse_arguments()
 
-	global DISTANCE_TRIPLETS
+	global VALID_SCENARIOS
+	global VALID_DISTANCE_TRIPLETS
 	global QUESTION_HEADER
 	global FOOTER_STEPS
 	global IMPORTANT_TIPS
 	global PHENOTYPE_DICT
 
-	DISTANCE_TRIPLETS = gml.get_all_distance_triplets(msg=debug)
+	distance_triplets = []
+	for distance_triplet in gml.get_all_distance_triplets(msg=debug):
+		distances = tuple(sorted(distance_triplet))
+		# keep the middle distance small unless two distances are equal
+		if distances[1] > 26 and len(set(distances)) == 3:
+			continue
+		distance_triplets.append(distances)
+	VALID_SCENARIOS = tetradlib.get_valid_three_gene_scenarios(distance_triplets)
+	VALID_DISTANCE_TRIPLETS = list(VALID_SCENARIOS.keys())
 	QUESTION_HEADER = get_question_header()
 	FOOTER_STEPS = get_question_footer_steps()
 	IMPORTANT_TIPS = get_important_tips()
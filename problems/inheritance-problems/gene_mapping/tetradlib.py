@@ -5,6 +5,9 @@ import copy
 import math
 import random
 
+# PIP3 modules
+import numpy
+
 # Local Repository Modules
 import bptools
 import genemaplib as gml
@@ -528,6 +531,109 @@ def get_double_counts(distance_tuple, progeny_size_int):
 
 	return dcount1, dcount2, dcount3
 
+#===========================================================
+#===========================================================
+def get_progeny_count_arrays(distance_array, progeny_size_array) -> dict:
+	"""
+	Computes three-gene tetrad counts and validity for many scenarios at once.
+
+	Batch version of get_double_counts(), generate_progeny_counts() and
+	check_if_progeny_counts_are_valid(). Uses the same float operations in
+	the same order, so each row gives the same counts as the scalar path,
+	and folds every rejection rule into a single `valid` mask instead of
+	building the tetrad dictionary first.
+
+	Args:
+		distance_array (array-like): shape (n, 3) distances, first two adjacent.
+		progeny_size_array (array-like): shape (n,) total progeny sizes.
+
+	Returns:
+		dict: integer arrays 'dcount1', 'dcount2', 'dcount3', 'firstcount',
+		'secondcount', 'parentcount' and the boolean array 'valid'.
+	"""
+	distances = numpy.asarray(distance_array, dtype=numpy.int64)
+	progeny = numpy.asarray(progeny_size_array, dtype=numpy.int64)
+	d0 = distances[:, 0]
+	d1 = distances[:, 1]
+	d2 = distances[:, 2]
+
+	# double crossover totals, see get_double_counts()
+	doublecount_float = (d0 / 100.0) * (d1 / 100.0) * progeny
+	doublecount = numpy.round(doublecount_float + 1e-7).astype(numpy.int64)
+	dcount3 = numpy.trunc(((d0 + d1 - d2) * progeny) / 600).astype(numpy.int64)
+	d00 = d0 ** 2
+	d11 = d1 ** 2
+	prob_dcount1 = d00 / (d00 + d11).astype(numpy.float64)
+	dcount1 = numpy.round(prob_dcount1 * (doublecount - dcount3)).astype(numpy.int64)
+	dcount2 = doublecount - dcount3 - dcount1
+
+	# single crossover and parental counts, see generate_progeny_counts()
+	firstcount = 2 * (numpy.round(d0 * progeny / 100.).astype(numpy.int64) - 3 * (dcount1 + dcount3))
+	secondcount = 2 * (numpy.round(d1 * progeny / 100.).astype(numpy.int64) - 3 * (dcount2 + dcount3))
+	parentcount = progeny - doublecount - firstcount - secondcount
+	calc_distance3 = 0.5 * (firstcount + secondcount + 6 * (doublecount - dcount3))
+	calc_distance3 = numpy.round(calc_distance3 / progeny * 100, 4)
+
+	valid = doublecount > 4
+	valid &= numpy.abs(calc_distance3 - d2) <= 1e-6
+	valid &= (firstcount > 0) & (secondcount > 0)
+	valid &= (firstcount < parentcount) & (secondcount < parentcount)
+
+	# check_if_progeny_counts_are_valid(): six distinct counts, each at least 2
+	count_matrix = numpy.stack(
+		[parentcount, firstcount, dcount1, secondcount, dcount2, dcount3], axis=1)
+	sorted_counts = numpy.sort(count_matrix, axis=1)
+	valid &= numpy.all(numpy.diff(sorted_counts, axis=1) > 0, axis=1)
+	valid &= sorted_counts[:, 0] >= 2
+
+	count_arrays = {
+		'dcount1': dcount1,
+		'dcount2': dcount2,
+		'dcount3': dcount3,
+		'firstcount': firstcount,
+		'secondcount': secondcount,
+		'parentcount': parentcount,
+		'valid': valid,
+	}
+	return count_arrays
+
+#===========================================================
+#===========================================================
+def get_valid_three_gene_scenarios(distance_triplets, progeny_factor: int = 3) -> dict:
+	"""
+	Pre-filters every (distances, progeny size) pair a three-gene question could use.
+
+	Each distance triplet is paired with every progeny size that
+	gml.get_general_progeny_size() can return for it, scaled by
+	`progeny_factor`, and the whole grid is checked in one
+	get_progeny_count_arrays() call.
+
+	Args:
+		distance_triplets (list): sorted distance triplets.
+		progeny_factor (int): multiplier applied to each progeny size.
+
+	Returns:
+		dict: distance tuple mapped to the list of progeny sizes that give
+		valid counts; triplets with no valid size are left out.
+	"""
+	distance_rows = []
+	progeny_sizes = []
+	for distances in distance_triplets:
+		a, b = gml.calculate_interference_from_three_distances(*distances)
+		progeny_base = gml.minN(distances[0], distances[1], a, b)
+		# same multiplier range as gml.get_general_progeny_size()
+		for multiplier in range(900 // progeny_base + 1, 9900 // progeny_base):
+			distance_rows.append(distances)
+			progeny_sizes.append(multiplier * progeny_base * progeny_factor)
+	scenarios = {}
+	if len(distance_rows) == 0:
+		return scenarios
+	count_arrays = get_progeny_count_arrays(distance_rows, progeny_sizes)
+	for i in numpy.flatnonzero(count_arrays['valid']):
+		distance_tuple = tuple(distance_rows[i])
+		scenarios.setdefault(distance_tuple, []).append(progeny_sizes[i])
+	return scenarios
+
 #===========================================================
 #===========================================================
 def tetrad_calculation_string(tt_values, npd_values, total) -> str:
@@ -4,7 +4,9 @@ import re
 import copy
 import itertools
 from functools import lru_cache
-from lxml import etree
+
+# local repo modules
+import html_validator_lib
 
 ### NOT ALLOWED TO IMPORT OTHER TREELIB FILES
 
@@ -547,29 +549,8 @@ def is_valid_html(html_str: str, debug: bool=True) -> bool:
 	"""
 	if '\n' in html_str:
 		raise ValueError("Blackboard upload does not support newlines in the HTML code.")
-	html_str = html_str.replace('<', '\n<')  # Optional: format the input HTML string for better readability on error
-	try:
-		# Remove HTML entities by finding '&' followed by alphanumerics or '#' and a semicolon
-		cleaned_html = re.sub(r'&[#a-zA-Z0-9]+;', '', html_str)
-		# Wrap in a root tag for XML parsing as XML requires a single root element
-		wrapped_html = f"<root>{cleaned_html}</root>"
-		# Parse the cleaned and wrapped HTML with XML parser
-		etree.fromstring(wrapped_html)
-		return True
-	except etree.XMLSyntaxError as e:
-		# Print detailed error information for debugging
-		if debug: print(f"Parse error: {e}")
-
-		# Optional: Print a snippet of the HTML around the error
-		error_index = e.position[1] if hasattr(e, 'position') else 0
-		snippet = cleaned_html[max(0, error_index - 40): error_index + 40]
-		if debug: print(f"Snippet around error (40 chars before and after):\n{snippet}")
-
-		# Optional: Print the entire cleaned HTML if debugging further
-		if debug: print("Full cleaned HTML (wrapped in root):")
-		if debug: print(wrapped_html)
-
-		return False
+	# shared memoized check, repeated tables and choices are parsed once
+	return html_validator_lib.is_well_formed(html_str, debug)
 
 # Simple assertion test for the function: 'is_valid_html'
 assert is_valid_html("<p>This is a paragraph.</p>") == True
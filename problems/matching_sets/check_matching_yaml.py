@@ -8,6 +8,9 @@ import sys
 # PIP3 modules
 import yaml
 
+# local repo modules
+import yaml_cache_lib
+
 
 @dataclass(frozen=True)
 class YamlIssue:
@@ -22,32 +25,6 @@ class YamlIssue:
 		return f"{self.severity}: {self.yaml_path}:{self.line}: {self.message}"
 
 
-class UniqueKeyLoader(yaml.SafeLoader):
-	pass
-
-
-def _construct_mapping_no_duplicates(loader, node, deep=False):
-	mapping = {}
-	for key_node, value_node in node.value:
-		key = loader.construct_object(key_node, deep=deep)
-		if key in mapping:
-			raise yaml.constructor.ConstructorError(
-				"while constructing a mapping",
-				node.start_mark,
-				f"found duplicate key: {key!r}",
-				key_node.start_mark,
-			)
-		value = loader.construct_object(value_node, deep=deep)
-		mapping[key] = value
-	return mapping
-
-
-UniqueKeyLoader.add_constructor(
-	yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-	_construct_mapping_no_duplicates,
-)
-
-
 ALLOWED_KEYS = {
 	"dbsubject",
 	"exclude pairs",
@@ -124,7 +101,7 @@ def _check_for_leading_tabs(yaml_path, raw_text):
 
 def _parse_yaml_all_docs(yaml_path, raw_text):
 	try:
-		return list(yaml.load_all(raw_text, Loader=UniqueKeyLoader))
+		return yaml_cache_lib.load_yaml_documents(raw_text)
 	except yaml.YAMLError as exc:
 		raise ValueError(f"YAML parse error: {exc}") from exc
 
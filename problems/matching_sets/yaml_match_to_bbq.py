@@ -7,17 +7,12 @@ MAT TAB question text TAB answer text TAB matching text TAB answer two text TAB
 """
 
 import os
-import re
 import sys
 import pprint
 import random
 import argparse
 
 import bptools
-from qti_package_maker.assessment_items import item_bank
-from qti_package_maker.engines.bbq_text_upload import read_package as bbq_read_package
-
-CONTENT_ID_RE = re.compile(r"<p>([0-9a-f]{4}_[0-9a-f]{4})</p>")
 
 N = 0
 QUESTIONS_PER_RUN = 2
@@ -93,6 +88,27 @@ def permuteMatchingPairs(yaml_data, num_choices=None, max_questions=None):
 	#list_of_complete_questions = bptools.applyReplacementRulesToList(list_of_complete_questions, yaml_data.get('replacement_rules'))
 	return list_of_complete_questions
 
+#=======================
+#=======================
+def get_content_key(question_output):
+	"""
+	Canonical dedup key for a generated matching question.
+
+	Two questions with the same text and the same prompt/choice pairs are
+	the same question whatever order the pairs are shown in, so the pairs
+	are sorted. Legacy BBQ strings are keyed by their full text.
+
+	Args:
+		question_output: item_cls object from formatBB_MAT_Question() or a BBQ string.
+
+	Returns:
+		tuple | str: hashable key, computed without serializing the item.
+	"""
+	if isinstance(question_output, str):
+		return question_output
+	pairs = tuple(sorted(zip(question_output.prompts_list, question_output.choices_list)))
+	return (question_output.question_text, pairs)
+
 #=======================
 #=======================
 def parse_arguments():
@@ -126,33 +142,24 @@ def main():
 	for i in range(args.duplicate_runs):
 		list_of_complete_questions += permuteMatchingPairs(yaml_data, args.num_choices, args.max_questions)
 
-	# dedup pass: remove duplicates BEFORE trimming to max_questions
-	deduped_questions = []
+	# dedup pass on content keys, BEFORE trimming to max_questions,
+	# so only unique items are serialized to BBQ lines
+	unique_questions = []
 	skipped_dupes = 0
-	seen_content_ids = set()
-	output_item_bank = item_bank.ItemBank(allow_mixed=False)
-	for i, question_output in enumerate(list_of_complete_questions, start=1):
+	seen_content_keys = set()
+	for question_output in list_of_complete_questions:
+		content_key = get_content_key(question_output)
+		if content_key in seen_content_keys:
+			skipped_dupes += 1
+			continue
+		seen_content_keys.add(content_key)
+		unique_questions.append(question_output)
+
+	deduped_questions = []
+	for i, question_output in enumerate(unique_questions, start=1):
 		bbformat_question = bptools.normalize_question_output(question_output, str(i))
 		if bbformat_question is None:
 			continue
-		# check for duplicate content_id from the embedded CRC16
-		match = CONTENT_ID_RE.search(bbformat_question)
-		if match is not None:
-			content_id = match.group(1)
-			if content_id in seen_content_ids:
-				skipped_dupes += 1
-				continue
-			seen_content_ids.add(content_id)
-		# check for duplicate via ItemBank re-parse
-		item_cls = bbq_read_package.make_item_cls_from_line(bbformat_question)
-		if item_cls is None:
-			continue
-		before_count = len(output_item_bank.items_dict_key_list)
-		output_item_bank.add_item_cls(item_cls)
-		after_count = len(output_item_bank.items_dict_key_list)
-		if after_count == before_count:
-			skipped_dupes += 1
-			continue
 		deduped_questions.append(bbformat_question)
 
 	if skipped_dupes > 0:
@@ -9,8 +9,10 @@ See docs/webwork/MATCHING_PROBLEMS.md for approach documentation.
 """
 
 import argparse
+import functools
 import os
 import random
+import time
 
 import bptools
 import webwork_lib
@@ -26,12 +28,20 @@ def parse_args():
 		description="Generate a PGML matching problem from a YAML matching set."
 	)
 	parser.add_argument(
-		'-y', '--file', dest='input_yaml_file', required=True,
-		help='YAML input file to process'
+		'-y', '--file', dest='input_yaml_files', required=True, nargs='+',
+		help='YAML input files, directories, or glob patterns to process'
 	)
 	parser.add_argument(
 		'-o', '--output', dest='output_pgml_file',
-		help='Output PGML file path'
+		help='Output PGML file path (single YAML input only)'
+	)
+	parser.add_argument(
+		'-d', '--output-dir', dest='output_dir',
+		help='Directory for output PGML files, defaults to the current directory'
+	)
+	parser.add_argument(
+		'-j', '--jobs', dest='jobs', type=int, default=None,
+		help='Worker processes for several YAML inputs, defaults to the CPU count'
 	)
 	parser.add_argument(
 		'-c', '--num-choices', dest='num_choices', type=int, default=None,
@@ -580,37 +590,85 @@ def build_pgml_text(yaml_data, num_choices, color_mode=_DEFAULT_COLOR_MODE, flip
 	return pgml_text
 
 #============================================
-def main():
+def get_output_path(yaml_path, flip=False, output_dir=None):
 	"""
-	Script entrypoint.
+	Return the default PGML output path for a YAML file.
 	"""
-	args = parse_args()
-	if not os.path.isfile(args.input_yaml_file):
-		raise FileNotFoundError(
-			f"input yaml file not found: {args.input_yaml_file}"
-		)
-	yaml_data = bptools.readYamlFile(args.input_yaml_file)
-	color_mode = "none" if args.no_color else "inline"
+	base_name = os.path.splitext(os.path.basename(yaml_path))[0]
+	if flip:
+		output_name = f"{base_name}-matching-flip.pgml"
+	else:
+		output_name = f"{base_name}-matching.pgml"
+	if output_dir is None:
+		return output_name
+	return os.path.join(output_dir, output_name)
+
+#============================================
+def convert_yaml_file(yaml_path, num_choices=None, color_mode="inline", flip=False,
+	output_pgml_file=None, output_dir=None):
+	"""
+	Convert one matching-set YAML file and write the PGML file.
+
+	Returns:
+		tuple: (output_pgml_file, warnings)
+	"""
+	if not os.path.isfile(yaml_path):
+		raise FileNotFoundError(f"input yaml file not found: {yaml_path}")
+	yaml_data = bptools.readYamlFile(yaml_path)
 	pgml_text, warnings = build_pgml_text(
 		yaml_data,
-		args.num_choices,
+		num_choices,
 		color_mode,
-		flip=args.flip,
+		flip=flip,
 	)
-
-	output_pgml_file = args.output_pgml_file
 	if output_pgml_file is None:
-		base_name = os.path.splitext(os.path.basename(args.input_yaml_file))[0]
-		if args.flip:
-			output_pgml_file = f"{base_name}-matching-flip.pgml"
-		else:
-			output_pgml_file = f"{base_name}-matching.pgml"
-
+		output_pgml_file = get_output_path(yaml_path, flip, output_dir)
 	with open(output_pgml_file, 'w') as outfile:
 		outfile.write(pgml_text)
-	print(f"Wrote PGML to {output_pgml_file}")
-	for warning in warnings:
-		print(f"WARNING: {warning}")
+	return output_pgml_file, warnings
+
+#============================================
+def main():
+	"""
+	Script entrypoint.
+	"""
+	args = parse_args()
+	yaml_paths = webwork_lib.expand_yaml_paths(args.input_yaml_files)
+	if len(yaml_paths) == 0:
+		raise FileNotFoundError(f"no YAML files found for: {args.input_yaml_files}")
+	if args.output_pgml_file is not None and len(yaml_paths) > 1:
+		raise ValueError("-o/--output takes a single YAML input, use -d/--output-dir")
+	if args.output_dir is not None:
+		os.makedirs(args.output_dir, exist_ok=True)
+	color_mode = "none" if args.no_color else "inline"
+
+	if len(yaml_paths) == 1:
+		output_pgml_file, warnings = convert_yaml_file(
+			yaml_paths[0],
+			args.num_choices,
+			color_mode,
+			flip=args.flip,
+			output_pgml_file=args.output_pgml_file,
+			output_dir=args.output_dir,
+		)
+		print(f"Wrote PGML to {output_pgml_file}")
+		for warning in warnings:
+			print(f"WARNING: {warning}")
+		return
+
+	# bulk mode: one process, modules imported once, banks spread over workers
+	t0 = time.perf_counter()
+	convert_file = functools.partial(
+		convert_yaml_file,
+		num_choices=args.num_choices,
+		color_mode=color_mode,
+		flip=args.flip,
+		output_dir=args.output_dir,
+	)
+	results = webwork_lib.convert_yaml_files(yaml_paths, convert_file, args.jobs)
+	failures = webwork_lib.print_conversion_report(results, time.perf_counter() - t0)
+	if failures > 0:
+		raise RuntimeError(f"{failures} of {len(results)} YAML files failed to convert")
 
 #============================================
 if __name__ == '__main__':
@@ -94,7 +94,7 @@ def getSequence(sequence_len, primer_len):
 	side_len -= side_len%3
 	while primer_set is False:
 		left_top_sequence = "N" * side_len
-		known_top_sequence = seqlib.makeSequence(sequence_len)
+		known_top_sequence = seqlib.makeSequence(sequence_len, primer_len)
 		right_top_sequence = "N" * side_len
 		primer_set, answer_set = getInversePrimerChoices(known_top_sequence, primer_len)
 		sequence_tuple = (left_top_sequence, known_top_sequence, right_top_sequence)
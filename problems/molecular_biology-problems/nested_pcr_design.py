@@ -79,7 +79,7 @@ def getSequence(sequence_len, round1_primer_len, round2_primer_len):
 	side_len = round1_primer_len
 	while primer_set is False:
 		left_top_sequence = seqlib.makeSequence(side_len)
-		known_top_sequence = seqlib.makeSequence(sequence_len)
+		known_top_sequence = seqlib.makeSequence(sequence_len, round2_primer_len)
 		right_top_sequence = seqlib.makeSequence(side_len)
 		primer_set, answer_set = getPrimerChoices(known_top_sequence, round2_primer_len)
 		sequence_tuple = (left_top_sequence, known_top_sequence, right_top_sequence)
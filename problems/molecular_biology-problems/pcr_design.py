@@ -60,7 +60,7 @@ def getPrimerChoices(top_sequence, primer_len):
 def getSequence(sequence_len, primer_len):
 	primer_set = False
 	while primer_set is False:
-		top_sequence = seqlib.makeSequence(sequence_len)
+		top_sequence = seqlib.makeSequence(sequence_len, primer_len)
 		primer_set, answer_set = getPrimerChoices(top_sequence, primer_len)
 	return top_sequence, primer_set, answer_set
 
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+"""
+Build the restriction-enzyme catalog used by restrictlib.
+
+Scans Bio.Restriction once with restrictlib.scan_biopython_enzymes() and
+writes every eligible enzyme with its site, overhang type, overhang sequence
+and cut positions, plus name indexes by overhang type and site length.
+Generators read the catalog, so Biopython is only needed to rebuild it.
+With --check it rebuilds the rows in memory and fails if the committed
+catalog no longer matches the installed Biopython.
+"""
+
+# Standard Library
+import json
+import argparse
+
+# PIP3 modules
+import Bio
+
+# local repo modules
+import bptools
+import restrictlib
+
+#============================================
+def build_catalog_rows() -> list:
+	"""
+	Collect catalog rows for every eligible enzyme, sorted by name.
+
+	Returns:
+		list: row dicts from restrictlib.enzyme_class_to_row().
+	"""
+	from Bio import Restriction
+	rows = []
+	for enzyme_name in sorted(restrictlib.scan_biopython_enzymes()):
+		enzyme_class = getattr(Restriction, enzyme_name)
+		rows.append(restrictlib.enzyme_class_to_row(enzyme_class))
+	return rows
+
+#============================================
+def build_indexes(rows: list) -> tuple:
+	"""
+	Index enzyme names by overhang type and by recognition site length.
+
+	Args:
+		rows (list): catalog rows sorted by name.
+
+	Returns:
+		tuple: (by_overhang, by_site_length) dicts of name lists.
+	"""
+	by_overhang = {}
+	by_site_length = {}
+	for row in rows:
+		by_overhang.setdefault(row['overhang'], []).append(row['name'])
+		# JSON object keys are strings
+		by_site_length.setdefault(str(len(row['site'])), []).append(row['name'])
+	by_site_length = {key: by_site_length[key] for key in sorted(by_site_length, key=int)}
+	return dict(sorted(by_overhang.items())), by_site_length
+
+#============================================
+def write_catalog(rows: list, outfile: str) -> None:
+	"""
+	Write the catalog as JSON with one enzyme per line so diffs stay readable.
+
+	Args:
+		rows (list): rows from build_catalog_rows().
+		outfile (str): output JSON path.
+	"""
+	by_overhang, by_site_length = build_indexes(rows)
+	header = {
+		'version': restrictlib.ENZYME_CATALOG_VERSION,
+		'biopython_version': Bio.__version__,
+		'enzyme_count': len(rows),
+	}
+	text = '{\n'
+	for key, value in header.items():
+		text += f'"{key}": {json.dumps(value)},\n'
+	text += '"enzymes": [\n'
+	text += ',\n'.join(json.dumps(row) for row in rows)
+	text += '\n],\n'
+	text += f'"by_overhang": {json.dumps(by_overhang)},\n'
+	text += f'"by_site_length": {json.dumps(by_site_length)}\n'
+	text += '}\n'
+	with open(outfile, 'w', encoding='utf-8') as f:
+		f.write(text)
+
+#============================================
+def catalog_is_current(rows: list, catalog_file: str) -> bool:
+	"""
+	Compare freshly built rows with the enzymes in an existing catalog.
+
+	Args:
+		rows (list): rows from build_catalog_rows().
+		catalog_file (str): catalog JSON path.
+
+	Returns:
+		bool: True when the catalog holds exactly these rows.
+	"""
+	with open(catalog_file, 'r', encoding='utf-8') as f:
+		catalog_data = json.load(f)
+	return catalog_data['enzymes'] == rows
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(description="Rebuild the restriction-enzyme catalog.")
+	parser.add_argument(
+		'-o', '--output', dest='output_file', type=str,
+		default=bptools.get_repo_data_path(restrictlib.ENZYME_CATALOG_FILE),
+		help='Output JSON file.',
+	)
+	parser.add_argument(
+		'-c', '--check', dest='check', action='store_true',
+		help='Only check that the output file matches the installed Biopython.',
+	)
+	args = parser.parse_args()
+	return args
+
+#============================================
+def main():
+	args = parse_args()
+	rows = build_catalog_rows()
+	if args.check:
+		if not catalog_is_current(rows, args.output_file):
+			raise RuntimeError(f'{args.output_file} does not match Biopython {Bio.__version__}; '
+				'rerun build_enzyme_catalog.py')
+		print(f'{args.output_file} matches Biopython {Bio.__version__}')
+		return
+	write_catalog(rows, args.output_file)
+	print(f'wrote {len(rows)} enzymes to {args.output_file}')
+
+#============================================
+if __name__ == '__main__':
+	main()
@@ -149,10 +149,9 @@ def write_question(N, args):
 	num_sites = args.num_sites
 	dna_type = args.dna_type
 	max_fragment_size = args.max_fragment_size
-	enzymes = restrictlib.get_enzyme_list()
-	enzyme_class1 = restrictlib.random_enzyme_one_end(enzymes)
+	enzyme_class1 = restrictlib.random_enzyme_one_end()
 	enzyme_name1 = enzyme_class1.__name__
-	enzyme_class2 = restrictlib.random_enzyme_one_end(enzymes, badletter=enzyme_name1[0])
+	enzyme_class2 = restrictlib.random_enzyme_one_end(badletter=enzyme_name1[0])
 	enzyme_name2 = enzyme_class2.__name__
 
 
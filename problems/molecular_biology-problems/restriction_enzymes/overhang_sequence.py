@@ -218,7 +218,6 @@ def main():
 	outfile = bptools.make_outfile(args.question_type)
 
 	enzyme_names = restrictlib.get_enzyme_list(include_blunt=False)
-	enzyme_names = [name for name in enzyme_names if restrictlib.enzyme_name_to_class(name).overhang().endswith('overhang')]
 	if args.scenario_order == 'sorted':
 		enzyme_names.sort()
 	else:
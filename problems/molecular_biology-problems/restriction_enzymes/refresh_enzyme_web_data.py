@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+"""
+Refresh the shipped REBASE web-data cache for every catalog enzyme.
+
+Missing or stale entries are fetched concurrently and the cache YAML is
+written once at the end.
+"""
+
+# Standard Library
+import time
+import argparse
+
+# local repo modules
+import restrictlib
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(description="Refresh the restriction-enzyme web-data cache.")
+	parser.add_argument(
+		'-w', '--workers', dest='max_workers', type=int,
+		default=restrictlib.WEB_DATA_REFRESH_WORKERS,
+		help='Concurrent REBASE requests.',
+	)
+	parser.add_argument(
+		'-f', '--force', dest='force_refresh', action='store_true',
+		help='Refetch entries that are still fresh.',
+	)
+	args = parser.parse_args()
+	return args
+
+#============================================
+def main():
+	args = parse_args()
+	t0 = time.time()
+	fetch_count = restrictlib.refresh_web_data(
+		force_refresh=args.force_refresh,
+		max_workers=args.max_workers,
+	)
+	print(f'refreshed {fetch_count} enzymes in {time.time() - t0:.1f} seconds')
+	print(f'cache: {restrictlib.WEB_DATA_CACHE_PATH}')
+
+#============================================
+if __name__ == '__main__':
+	main()
@@ -2,12 +2,14 @@
 
 import os
 import re
+import json
 import time
-import datetime
 import yaml
 import random
+import datetime
+import functools
 import requests
-from Bio import Restriction
+import concurrent.futures
 from bs4 import BeautifulSoup
 
 import bptools
@@ -17,6 +19,13 @@ WEB_DATA_CACHE_PATH = bptools.get_repo_data_path('restriction_enzyme_web_data.ym
 WEB_DATA_CACHE_MAX_AGE = datetime.timedelta(days=183)
 WEB_DATA_REQUEST_TIMEOUT = 20
 WEB_DATA_CACHE = None
+# parallel REBASE page fetches during a bulk refresh
+WEB_DATA_REFRESH_WORKERS = 8
+# seconds each refresh worker waits after a request, to stay polite to REBASE
+WEB_DATA_REFRESH_DELAY = 0.25
+# eligible enzymes precomputed from Bio.Restriction by build_enzyme_catalog.py
+ENZYME_CATALOG_FILE = 'restriction_enzyme_catalog.json'
+ENZYME_CATALOG_VERSION = 1
 
 """
 'all_suppliers', 'buffers', 'catalyse', 'catalyze', 'charac', 'characteristic', 'compatible_end', 'compsite', 'cut_once', 'cut_twice', 'dna', 'elucidate', 'equischizomers', 'freq', 'frequency', 'fst3', 'fst5', 'inact_temp', 'is_3overhang', 'is_5overhang', 'is_ambiguous', 'is_blunt', 'is_comm', 'is_defined', 'is_equischizomer', 'is_isoschizomer', 'is_methylable', 'is_neoschizomer', 'is_palindromic', 'is_unknown', 'isoschizomers', 'mro', 'neoschizomers', 'opt_temp', 'overhang', 'ovhg', 'ovhgseq', 'results', 'scd3', 'scd5', 'search', 'site', 'size', 'substrat', 'suppl', 'supplier_list', 'suppliers'
@@ -102,7 +111,8 @@ def _field_value(field) -> str:
 
 #============================
 def _parse_web_data(response_content: bytes, uri: str) -> dict:
-	soup = BeautifulSoup(response_content, 'html.parser')
+	# lxml is several times faster than the pure-Python html.parser
+	soup = BeautifulSoup(response_content, 'lxml')
 	enzyme_data = {'uri': uri}
 	for field in soup.find_all('b'):
 		field_name = field.get_text(' ', strip=True).rstrip(':').strip()
@@ -115,8 +125,32 @@ def _parse_web_data(response_content: bytes, uri: str) -> dict:
 
 
 #============================
-def fetch_web_data(enzyme_class) -> dict:
+def make_web_data_session(max_workers: int = WEB_DATA_REFRESH_WORKERS) -> requests.Session:
+	"""
+	Create one keep-alive session sized for a bulk refresh.
+
+	Args:
+		max_workers (int): threads that share the session.
+
+	Returns:
+		requests.Session: session with a connection pool per worker.
+	"""
+	session = requests.Session()
+	session.headers.update({'User-Agent': 'Mozilla/5.0'})
+	adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+	session.mount('https://', adapter)
+	session.mount('http://', adapter)
+	return session
+
+
+#============================
+def fetch_web_data(enzyme_class, session: requests.Session = None) -> dict:
 	uri = enzyme_class.uri
+	if session is not None:
+		# bulk refresh, the bounded pool already limits the request rate
+		response = session.get(uri, timeout=WEB_DATA_REQUEST_TIMEOUT)
+		response.raise_for_status()
+		return _parse_web_data(response.content, uri)
 	headers = {'User-Agent': 'Mozilla/5.0'}
 	response = requests.get(uri, headers=headers, timeout=WEB_DATA_REQUEST_TIMEOUT)
 	response.raise_for_status()
@@ -125,6 +159,14 @@ def fetch_web_data(enzyme_class) -> dict:
 	return enzyme_data
 
 
+#============================
+def _store_web_data(cache_data: dict, enzyme_name: str, enzyme_data: dict) -> None:
+	cache_data['enzymes'][enzyme_name] = {
+		'fetched_at': _utc_now().isoformat(timespec='seconds'),
+		'data': enzyme_data,
+	}
+
+
 #============================
 def get_web_data(enzyme_class, force_refresh: bool=False, save: bool=True) -> dict:
 	cache_data = load_web_data_cache()
@@ -134,15 +176,76 @@ def get_web_data(enzyme_class, force_refresh: bool=False, save: bool=True) -> di
 		return cache_entry['data']
 
 	enzyme_data = fetch_web_data(enzyme_class)
-	cache_data['enzymes'][enzyme_name] = {
-		'fetched_at': _utc_now().isoformat(timespec='seconds'),
-		'data': enzyme_data,
-	}
+	_store_web_data(cache_data, enzyme_name, enzyme_data)
 	if save:
 		save_web_data_cache()
 	return enzyme_data
 
 
+#============================
+def _fetch_web_data_paced(enzyme_class, session: requests.Session, request_delay: float) -> dict:
+	enzyme_data = fetch_web_data(enzyme_class, session)
+	time.sleep(request_delay)
+	return enzyme_data
+
+
+#============================
+def refresh_web_data(enzyme_classes: list = None, force_refresh: bool = False,
+		max_workers: int = WEB_DATA_REFRESH_WORKERS, save: bool = True,
+		request_delay: float = WEB_DATA_REFRESH_DELAY) -> int:
+	"""
+	Fetch every missing or stale REBASE entry concurrently.
+
+	Pages are fetched by a bounded thread pool over one shared session, and
+	the cache file is written once at the end instead of after each enzyme.
+	A failed page is reported and skipped, and the other pages are saved.
+
+	Args:
+		enzyme_classes (list): enzymes to check, defaults to the full catalog.
+		force_refresh (bool): refetch fresh entries too.
+		max_workers (int): concurrent requests.
+		save (bool): write the cache file when anything was fetched.
+		request_delay (float): seconds each worker waits after a request.
+
+	Returns:
+		int: number of enzymes fetched.
+	"""
+	cache_data = load_web_data_cache()
+	if enzyme_classes is None:
+		enzyme_classes = [enzyme_name_to_class(name) for name in get_enzyme_list()]
+	stale_classes = []
+	for enzyme_class in enzyme_classes:
+		cache_entry = cache_data['enzymes'].get(enzyme_class.__name__)
+		if force_refresh or cache_entry is None or not _cache_entry_is_fresh(cache_entry):
+			stale_classes.append(enzyme_class)
+	if len(stale_classes) == 0:
+		return 0
+
+	fetch_count = 0
+	failed_names = []
+	with make_web_data_session(max_workers) as session:
+		with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+			future_to_class = {}
+			for enzyme_class in stale_classes:
+				future = pool.submit(_fetch_web_data_paced, enzyme_class, session, request_delay)
+				future_to_class[future] = enzyme_class
+			for future in concurrent.futures.as_completed(future_to_class):
+				enzyme_name = future_to_class[future].__name__
+				try:
+					enzyme_data = future.result()
+				except requests.RequestException as error:
+					print(f'WARNING: could not fetch {enzyme_name}: {error}')
+					failed_names.append(enzyme_name)
+					continue
+				_store_web_data(cache_data, enzyme_name, enzyme_data)
+				fetch_count += 1
+	if save and fetch_count > 0:
+		save_web_data_cache()
+	if len(failed_names) > 0:
+		print(f'{len(failed_names)} enzymes failed, rerun to retry: {", ".join(sorted(failed_names))}')
+	return fetch_count
+
+
 #========================================
 def check_for_good_ending(item: str) -> bool:
 	"""
@@ -183,10 +286,139 @@ def has_strict_sequence(enzyme_class) -> bool:
 
 	return True
 
+#========================================
+class EnzymeRecord():
+	"""
+	Catalog entry that answers the Bio.Restriction enzyme calls used here.
+
+	Generators only read the name, site, overhang and cut positions, so a
+	record loaded from the catalog can stand in for the Biopython class.
+	"""
+	def __init__(self, row: dict):
+		self.__name__ = row['name']
+		self.site = row['site']
+		self.size = row['size']
+		self.ovhg = row['ovhg']
+		self.ovhgseq = row['ovhgseq']
+		self.fst5 = row['fst5']
+		self.fst3 = row['fst3']
+		self.uri = row['uri']
+		self._overhang = row['overhang']
+		self._elucidate = row['elucidate']
+
+	def __repr__(self) -> str:
+		return self.__name__
+
+	def overhang(self) -> str:
+		return self._overhang
+
+	def elucidate(self) -> str:
+		return self._elucidate
+
+	def is_blunt(self) -> bool:
+		return self._overhang == 'blunt'
+
+	def is_5overhang(self) -> bool:
+		return self._overhang == "5' overhang"
+
+	def is_3overhang(self) -> bool:
+		return self._overhang == "3' overhang"
+
+#========================================
+def enzyme_class_to_row(enzyme_class) -> dict:
+	"""
+	Flatten a Bio.Restriction enzyme class into a catalog row.
+	"""
+	row = {
+		'name': enzyme_class.__name__,
+		'site': enzyme_class.site,
+		'size': enzyme_class.size,
+		'overhang': enzyme_class.overhang(),
+		'ovhg': enzyme_class.ovhg,
+		'ovhgseq': enzyme_class.ovhgseq,
+		'fst5': enzyme_class.fst5,
+		'fst3': enzyme_class.fst3,
+		'elucidate': enzyme_class.elucidate(),
+		'uri': enzyme_class.uri,
+	}
+	return row
+
+#========================================
+@functools.lru_cache(maxsize=1)
+def load_enzyme_catalog() -> dict:
+	"""
+	Load the precomputed enzyme catalog once per process.
+
+	Returns:
+		dict: 'records' maps name to EnzymeRecord, 'names' is the sorted name
+			tuple, 'by_overhang' and 'by_site_length' map to name tuples.
+	"""
+	catalog_path = bptools.get_repo_data_path(ENZYME_CATALOG_FILE)
+	with open(catalog_path, 'r', encoding='utf-8') as catalog_file:
+		catalog_data = json.load(catalog_file)
+	if catalog_data['version'] != ENZYME_CATALOG_VERSION:
+		raise ValueError(f"{catalog_path} is version {catalog_data['version']}, "
+			f"expected {ENZYME_CATALOG_VERSION}; rerun build_enzyme_catalog.py")
+	records = {}
+	for row in catalog_data['enzymes']:
+		records[row['name']] = EnzymeRecord(row)
+	catalog = {
+		'records': records,
+		'names': tuple(records.keys()),
+		'by_overhang': {key: tuple(names) for key, names in catalog_data['by_overhang'].items()},
+		'by_site_length': {int(key): tuple(names) for key, names in catalog_data['by_site_length'].items()},
+	}
+	return catalog
+
+#========================================
+def get_enzyme_names_by_overhang(overhang: str) -> tuple:
+	"""
+	Names of catalog enzymes with the given overhang type.
+
+	Args:
+		overhang (str): "5' overhang", "3' overhang" or "blunt".
+	"""
+	return load_enzyme_catalog()['by_overhang'].get(overhang, ())
+
+#========================================
+def get_enzyme_names_by_site_length(site_length: int) -> tuple:
+	"""
+	Names of catalog enzymes whose recognition site has the given length.
+	"""
+	return load_enzyme_catalog()['by_site_length'].get(site_length, ())
+
+#========================================
+@functools.lru_cache(maxsize=1)
+def _overhang_enzyme_names() -> tuple:
+	catalog = load_enzyme_catalog()
+	names = catalog['by_overhang'].get("5' overhang", ()) + catalog['by_overhang'].get("3' overhang", ())
+	return tuple(sorted(names))
+
+#========================================
+@functools.lru_cache(maxsize=1)
+def _one_end_enzyme_names() -> tuple:
+	# four letter names ending in I, e.g. EcoRI, read well in digest diagrams
+	names = [name for name in load_enzyme_catalog()['names'] if len(name) == 4 and name.endswith("I")]
+	return tuple(names)
+
 #========================================
 def get_enzyme_list(include_blunt=True) -> list:
 	"""
-	Build a filtered list of enzymes that are:
+	List the eligible enzyme names from the precomputed catalog.
+
+	See scan_biopython_enzymes() for the rules an enzyme must pass.
+
+	Returns:
+		list: List of valid enzyme names
+	"""
+	if include_blunt is False:
+		return list(_overhang_enzyme_names())
+	return list(load_enzyme_catalog()['names'])
+
+#========================================
+def scan_biopython_enzymes(include_blunt=True) -> list:
+	"""
+	Build a filtered list of enzymes from Bio.Restriction that are:
 	- Properly named (starts with [A-Z][a-z][a-z])
 	- Palindromic
 	- Cut once
@@ -194,9 +426,12 @@ def get_enzyme_list(include_blunt=True) -> list:
 	- Known
 	- Have a strict recognition sequence
 
+	Only build_enzyme_catalog.py needs this, generators read the catalog.
+
 	Returns:
 		list: List of valid enzyme names
 	"""
+	from Bio import Restriction
 	dir_result = dir(Restriction)
 	enzymes = []
 
@@ -205,7 +440,7 @@ def get_enzyme_list(include_blunt=True) -> list:
 		if not re.match(r"^[A-Z][a-z][a-z]", item):
 			continue
 
-		enzyme_class = enzyme_name_to_class(item)
+		enzyme_class = getattr(Restriction, item)
 
 		if not hasattr(enzyme_class, 'site'):
 			continue
@@ -233,21 +468,25 @@ def get_enzyme_list(include_blunt=True) -> list:
 
 		enzymes.append(item)
 
-	#print("Found {0:d} enzymes".format(len(enzymes)))
-	for enzyme in enzymes:
-		#print(enzyme)
-		pass
 	return enzymes
 
 #========================================
 def enzyme_name_to_class(enzyme_name):
+	"""
+	Return the catalog record for an enzyme, or the Bio.Restriction class
+	for enzymes outside the catalog.
+	"""
+	enzyme_class = load_enzyme_catalog()['records'].get(enzyme_name)
+	if enzyme_class is not None:
+		return enzyme_class
+	from Bio import Restriction
 	enzyme_class = getattr(Restriction, enzyme_name)
 	return enzyme_class
 
 #========================================
 def random_enzyme(enzymes=None):
 	if enzymes is None:
-		enzymes = get_enzyme_list()
+		enzymes = load_enzyme_catalog()['names']
 	enzyme_name = random.choice(enzymes)
 	enzyme_class = enzyme_name_to_class(enzyme_name)
 	return enzyme_class
@@ -255,7 +494,8 @@ def random_enzyme(enzymes=None):
 #========================================
 def random_enzyme_one_end(enzymes=None, badletter="."):
 	if enzymes is None:
-		enzymes = get_enzyme_list()
+		# already filtered, so the loop only rejects on badletter
+		enzymes = _one_end_enzyme_names()
 	enzyme_name = "x"
 	while (len(enzyme_name) != 4
 			or not enzyme_name.endswith("I")
@@ -267,7 +507,8 @@ def random_enzyme_one_end(enzymes=None, badletter="."):
 #========================================
 def random_enzyme_with_overhang(enzymes=None):
 	if enzymes is None:
-		enzymes = get_enzyme_list()
+		enzyme_name = random.choice(_overhang_enzyme_names())
+		return enzyme_name_to_class(enzyme_name)
 	has_overhang = False
 	while has_overhang is False:
 		enzyme_name = random.choice(enzymes)
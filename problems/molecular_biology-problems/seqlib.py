@@ -214,78 +214,222 @@ def flip(seq: str) -> str:
 	return seq[::-1]
 
 #=========================
-def makeSequence(seqlen=10):
+def is_good_sequence(seq: str) -> bool:
+	"""
+	Check the makeSequence() rules for a sequence longer than 3 bases.
+
+	Rejects sequences that read the same flipped or complemented, ends that
+	repeat or mirror each other, ends that are palindromes, sequences without
+	both A and T, and runs of four A/T or four G/C bases.
+	"""
+	half = int(len(seq)//2)
+	compl = complement(seq)
+
+	# several criteria for bad sequences
+	if seq == flip(seq):
+		return False
+	elif seq == compl:
+		return False
+	elif seq == flip(compl):
+		return False
+
+	elif seq[:half] == seq[-half:]:
+		return False
+	elif compl[:half] == compl[-half:]:
+		return False
+	elif seq[:half] == compl[-half:]:
+		return False
+	elif compl[:half] == seq[-half:]:
+		return False
+
+	elif not 'T' in seq:
+		return False
+	elif not 'A' in seq:
+		return False
+
+	elif seq[:half] == flip(seq[-half:]):
+		return False
+	elif compl[:half] == flip(compl[-half:]):
+		return False
+	elif seq[:half] == flip(compl[-half:]):
+		return False
+	elif compl[:half] == flip(seq[-half:]):
+		return False
+
+	elif seq[:half] == flip(seq[:half]):
+		return False
+	elif compl[:half] == flip(compl[:half]):
+		return False
+	elif seq[:half] == flip(compl[:half]):
+		return False
+	elif compl[:half] == flip(seq[:half]):
+		return False
+
+	elif seq[-half:] == flip(seq[-half:]):
+		return False
+	elif compl[-half:] == flip(compl[-half:]):
+		return False
+	elif seq[-half:] == flip(compl[-half:]):
+		return False
+	elif compl[-half:] == flip(seq[-half:]):
+		return False
+
+	newseq = seq.replace('T', 'A')
+	if 'AAAA' in newseq:
+		return False
+	newseq = newseq.replace('C', 'G')
+	if 'GGGG' in newseq:
+		return False
+	return True
+
+#=========================
+def _primer_base_count(primer_len: int) -> int:
+	"""
+	Distinct bases a primer window needs: all four, or every base if shorter.
+	"""
+	return min(4, primer_len)
+
+#=========================
+def _prefix_can_finish(seq: str, seqlen: int, primer_len: int) -> bool:
+	"""
+	Check the rules that are already decided for a partial sequence.
+
+	Only the newest base is checked, the rest of the prefix passed before.
+	"""
+	# no run of four weak (A/T) or four strong (G/C) bases
+	if len(seq) >= 4:
+		weak_count = sum(1 for base in seq[-4:] if base in 'AT')
+		if weak_count == 0 or weak_count == 4:
+			return False
+	remaining = seqlen - len(seq)
+	# A and T must both still fit in the remaining positions
+	if ('A' not in seq) + ('T' not in seq) > remaining:
+		return False
+	if primer_len > 0:
+		# the first primer_len bases need all four nucleotides
+		base_count = _primer_base_count(primer_len)
+		if len(seq) <= primer_len:
+			if base_count - len(set(seq)) > primer_len - len(seq):
+				return False
+		# so does the last window, once it starts
+		window_start = seqlen - primer_len
+		if len(seq) > window_start:
+			if base_count - len(set(seq[window_start:])) > remaining:
+				return False
+	return True
+
+#=========================
+def _build_sequence(seqlen: int, primer_len: int, max_steps: int) -> str:
+	"""
+	Build a sequence base by base, backing up only on a dead end.
+
+	Returns:
+		str: a sequence that passes is_good_sequence(), or None if the step
+			budget ran out.
+	"""
+	seq = ''
+	choices_stack = [random.sample('ACGT', 4)]
+	for _ in range(max_steps):
+		if len(choices_stack) == 0:
+			return None
+		choices = choices_stack[-1]
+		if len(choices) == 0:
+			# dead end, back up one base
+			choices_stack.pop()
+			seq = seq[:-1]
+			continue
+		candidate = seq + choices.pop()
+		if not _prefix_can_finish(candidate, seqlen, primer_len):
+			continue
+		if len(candidate) < seqlen:
+			seq = candidate
+			choices_stack.append(random.sample('ACGT', 4))
+			continue
+		# last letter must not match the first, as in _makeSequence()
+		if candidate[-1] in (candidate[0], complement(candidate[0])):
+			continue
+		if is_good_sequence(candidate):
+			return candidate
+	return None
+
+#=========================
+def _makeSequenceRejection(seqlen: int, primer_len: int, max_tries: int = 100000) -> str:
+	base_count = _primer_base_count(primer_len)
+	for _ in range(max_tries):
+		seq = _makeSequence(seqlen)
+		if not is_good_sequence(seq):
+			continue
+		if primer_len > 0 and (len(set(seq[:primer_len])) < base_count
+				or len(set(seq[-primer_len:])) < base_count):
+			continue
+		return seq
+	# a few very short lengths cannot meet the rules at all, e.g. 4 bases
+	# with a 4 base primer at each end
+	raise ValueError(f'no sequence of length {seqlen} meets the rules with primer_len {primer_len}')
+
+#=========================
+def makeSequence(seqlen=10, primer_len=0):
+	"""
+	Make a random DNA sequence that passes is_good_sequence().
+
+	The sequence is built base by base with the rules checked as each base
+	is added, so the time does not grow with the rejection rate. Rejection
+	sampling is only the fallback if every restart runs out of steps.
+
+	Args:
+		seqlen (int): sequence length.
+		primer_len (int): if set, the first and last primer_len bases each
+			contain all four nucleotides, as PCR primer questions need.
+			Primers shorter than four bases need distinct bases instead.
+
+	Returns:
+		str: the sequence.
+
+	Raises:
+		ValueError: if primer_len is negative or longer than seqlen, or no
+			sequence of this length can meet the rules.
+	"""
+	if primer_len < 0 or primer_len > seqlen:
+		raise ValueError(f'primer_len {primer_len} must be between 0 and seqlen {seqlen}')
 	if seqlen <= 3:
 		## too many checks
 		seq = _makeSequence(seqlen)
 		return seq
-	endloop = False
-	half = int(seqlen//2)
-	while not endloop:
-		endloop = True
-		seq = _makeSequence(seqlen)
-		compl = complement(seq)
-
-		# several criteria for bad sequences
-		if seq == flip(seq):
-			endloop = False
-		elif seq == compl:
-			endloop = False
-		elif seq == flip(compl):
-			endloop = False
-
-		elif seq[:half] == seq[-half:]:
-			endloop = False
-		elif compl[:half] == compl[-half:]:
-			endloop = False
-		elif seq[:half] == compl[-half:]:
-			endloop = False
-		elif compl[:half] == seq[-half:]:
-			endloop = False
-
-		elif not 'T' in seq:
-			endloop = False
-		elif not 'A' in seq:
-			endloop = False
-
-		elif seq[:half] == flip(seq[-half:]):
-			endloop = False
-		elif compl[:half] == flip(compl[-half:]):
-			endloop = False
-		elif seq[:half] == flip(compl[-half:]):
-			endloop = False
-		elif compl[:half] == flip(seq[-half:]):
-			endloop = False
-
-		elif seq[:half] == flip(seq[:half]):
-			endloop = False
-		elif compl[:half] == flip(compl[:half]):
-			endloop = False
-		elif seq[:half] == flip(compl[:half]):
-			endloop = False
-		elif compl[:half] == flip(seq[:half]):
-			endloop = False
-
-		elif seq[-half:] == flip(seq[-half:]):
-			endloop = False
-		elif compl[-half:] == flip(compl[-half:]):
-			endloop = False
-		elif seq[-half:] == flip(compl[-half:]):
-			endloop = False
-		elif compl[-half:] == flip(seq[-half:]):
-			endloop = False
-
-		if endloop is True:
-			newseq = copy.copy(seq)
-			newseq = newseq.replace('T', 'A')
-			if 'AAAA' in newseq:
-				endloop = False
-			newseq = newseq.replace('C', 'G')
-			if 'GGGG' in newseq:
-				endloop = False
-
+	# a short budget plus restarts beats deep backtracking out of a bad start
+	for _ in range(64):
+		seq = _build_sequence(seqlen, primer_len, max_steps=8 * seqlen)
+		if seq is not None:
+			return seq
+	seq = _makeSequenceRejection(seqlen, primer_len)
 	return seq
 
+#=========================
+def makeSequenceBatch(seqlen: int, count: int, primer_len: int = 0) -> list:
+	"""
+	Make many distinct sequences at once with makeSequence().
+
+	Args:
+		seqlen (int): sequence length.
+		count (int): number of sequences wanted.
+		primer_len (int): see makeSequence().
+
+	Returns:
+		list: up to count distinct sequences, fewer only when short lengths
+			do not have that many.
+	"""
+	sequences = []
+	seen = set()
+	# short lengths can run out of distinct sequences
+	for _ in range(count * 8):
+		if len(sequences) == count:
+			break
+		seq = makeSequence(seqlen, primer_len)
+		if seq in seen:
+			continue
+		seen.add(seq)
+		sequences.append(seq)
+	return sequences
+
 #========================================
 def sequenceSimilarityScore(seq1, seq2):
 	min_length = min(len(seq1), len(seq2))
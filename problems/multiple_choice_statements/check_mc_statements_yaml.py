@@ -8,6 +8,10 @@ import sys
 # PIP3 modules
 import yaml
 
+# local repo modules
+import yaml_cache_lib
+import html_validator_lib
+
 
 @dataclass(frozen=True)
 class YamlIssue:
@@ -22,32 +26,6 @@ class YamlIssue:
 		return f"{self.severity}: {self.yaml_path}:{self.line}: {self.message}"
 
 
-class UniqueKeyLoader(yaml.SafeLoader):
-	pass
-
-
-def _construct_mapping_no_duplicates(loader, node, deep=False):
-	mapping = {}
-	for key_node, value_node in node.value:
-		key = loader.construct_object(key_node, deep=deep)
-		if key in mapping:
-			raise yaml.constructor.ConstructorError(
-				"while constructing a mapping",
-				node.start_mark,
-				f"found duplicate key: {key!r}",
-				key_node.start_mark,
-			)
-		value = loader.construct_object(value_node, deep=deep)
-		mapping[key] = value
-	return mapping
-
-
-UniqueKeyLoader.add_constructor(
-	yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-	_construct_mapping_no_duplicates,
-)
-
-
 ALLOWED_KEYS = {
 	"conflict_rules",
 	"connection_words",
@@ -126,7 +104,7 @@ def _check_for_leading_tabs(yaml_path, raw_text):
 
 def _parse_yaml_all_docs(yaml_path, raw_text):
 	try:
-		return list(yaml.load_all(raw_text, Loader=UniqueKeyLoader))
+		return yaml_cache_lib.load_yaml_documents(raw_text)
 	except yaml.YAMLError as exc:
 		raise ValueError(f"YAML parse error: {exc}") from exc
 
@@ -236,6 +214,33 @@ def _validate_multiple_choice_statements_yaml(yaml_path, doc):
 	return issues
 
 
+def _check_statement_html(yaml_path, doc):
+	# every statement of the bank is parsed together in one batch
+	statement_refs = []
+	statement_texts = []
+	for field in ("true_statements", "false_statements"):
+		val = doc.get(field, None)
+		if not isinstance(val, dict):
+			continue
+		for stmt_key, stmt_text in val.items():
+			if isinstance(stmt_text, str):
+				statement_refs.append(f"{field}.{stmt_key}")
+				statement_texts.append(stmt_text)
+	issues = []
+	errors = html_validator_lib.validate_html_batch(statement_texts)
+	for stmt_ref, error_text in zip(statement_refs, errors):
+		if error_text is None:
+			continue
+		issues.append(
+			YamlIssue(
+				yaml_path=yaml_path,
+				severity="ERROR",
+				message=f"`{stmt_ref}` is not well-formed HTML: {error_text}",
+			)
+		)
+	return issues
+
+
 def _quality_check_docs(yaml_path, docs, raw_text):
 	issues = []
 	issues.extend(_check_for_leading_tabs(yaml_path, raw_text))
@@ -259,6 +264,7 @@ def _quality_check_docs(yaml_path, docs, raw_text):
 		)
 		return issues
 	issues.extend(_validate_multiple_choice_statements_yaml(yaml_path, doc))
+	issues.extend(_check_statement_html(yaml_path, doc))
 	return issues
 
 
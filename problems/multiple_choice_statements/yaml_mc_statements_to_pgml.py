@@ -5,15 +5,15 @@ Generate a PGML multiple-choice statements problem from YAML.
 """
 
 # Standard Library
-import argparse
-import pathlib
 import re
-
-# PIP3 modules
-import yaml
+import time
+import pathlib
+import argparse
+import functools
 
 # local repo modules
 import webwork_lib
+import yaml_cache_lib
 
 _DEFAULT_COLOR_MODE = object()
 
@@ -61,12 +61,20 @@ def parse_args():
 		description="Generate a PGML MC statements problem from YAML."
 	)
 	parser.add_argument(
-		'-y', '--yaml', dest='input_yaml_file', required=True,
-		help='YAML input file to process'
+		'-y', '--yaml', dest='input_yaml_files', required=True, nargs='+',
+		help='YAML input files, directories, or glob patterns to process'
 	)
 	parser.add_argument(
 		'-o', '--output', dest='output_pg_file',
-		help='Output PG file path'
+		help='Output PG file path (single YAML input only)'
+	)
+	parser.add_argument(
+		'-d', '--output-dir', dest='output_dir',
+		help='Directory for output PGML files, defaults to next to each YAML file'
+	)
+	parser.add_argument(
+		'-j', '--jobs', dest='jobs', type=int, default=None,
+		help='Worker processes for several YAML inputs, defaults to the CPU count'
 	)
 	color_group = parser.add_mutually_exclusive_group()
 	color_group.add_argument(
@@ -461,16 +469,10 @@ def build_pgml_text(yaml_data, color_mode=_DEFAULT_COLOR_MODE):
 	return pgml_text
 
 #============================================
-def main():
+def print_yaml_summary(yaml_data, yml_path):
 	"""
-	Script entrypoint.
+	Echo the topic, folder, and statement counts of a loaded YAML file.
 	"""
-	args = parse_args()
-	yml_path = pathlib.Path(args.input_yaml_file)
-	if not yml_path.exists():
-		raise FileNotFoundError(f"File not found: {yml_path}")
-	yaml_data = yaml.safe_load(yml_path.read_text())
-	validate_yaml_data(yaml_data, yml_path)
 	# echo topic so the user can double-check which topic drove generation
 	print(f"Topic: {yaml_data['topic']}")
 	# echo folder + dbsubject so folder/category mismatches are visible
@@ -493,17 +495,73 @@ def main():
 	override_false = yaml_data.get("override_question_false")
 	if isinstance(override_false, str) and override_false.strip():
 		print(f"Override (FALSE stem): {override_false}")
-	color_mode = "none" if args.no_color else "inline"
+
+#============================================
+def convert_yaml_file(yaml_path, color_mode="inline", output_pg_file=None,
+	output_dir=None, verbose=False):
+	"""
+	Convert one MC statements YAML file and write the PGML file.
+
+	Returns:
+		tuple: (output_pg_file, warnings)
+	"""
+	yml_path = pathlib.Path(yaml_path)
+	if not yml_path.exists():
+		raise FileNotFoundError(f"File not found: {yml_path}")
+	yaml_data = yaml_cache_lib.read_yaml_file(str(yml_path))
+	validate_yaml_data(yaml_data, yml_path)
+	if verbose:
+		print_yaml_summary(yaml_data, yml_path)
 	pgml_text, warnings = build_pgml_text(yaml_data, color_mode)
 
-	output_path = args.output_pg_file
-	if output_path is None:
-		output_path = str(yml_path.with_suffix(".pgml"))
-	with open(output_path, 'w') as handle:
+	if output_pg_file is None:
+		if output_dir is None:
+			output_pg_file = str(yml_path.with_suffix(".pgml"))
+		else:
+			output_pg_file = str(pathlib.Path(output_dir) / (yml_path.stem + ".pgml"))
+	with open(output_pg_file, 'w') as handle:
 		handle.write(pgml_text)
-	print(f"Generated: {output_path}")
-	for warning in warnings:
-		print(f"WARNING: {warning}")
+	return output_pg_file, warnings
+
+#============================================
+def main():
+	"""
+	Script entrypoint.
+	"""
+	args = parse_args()
+	yaml_paths = webwork_lib.expand_yaml_paths(args.input_yaml_files)
+	if len(yaml_paths) == 0:
+		raise FileNotFoundError(f"no YAML files found for: {args.input_yaml_files}")
+	if args.output_pg_file is not None and len(yaml_paths) > 1:
+		raise ValueError("-o/--output takes a single YAML input, use -d/--output-dir")
+	if args.output_dir is not None:
+		pathlib.Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+	color_mode = "none" if args.no_color else "inline"
+
+	if len(yaml_paths) == 1:
+		output_path, warnings = convert_yaml_file(
+			yaml_paths[0],
+			color_mode,
+			output_pg_file=args.output_pg_file,
+			output_dir=args.output_dir,
+			verbose=True,
+		)
+		print(f"Generated: {output_path}")
+		for warning in warnings:
+			print(f"WARNING: {warning}")
+		return
+
+	# bulk mode: one process, modules imported once, banks spread over workers
+	t0 = time.perf_counter()
+	convert_file = functools.partial(
+		convert_yaml_file,
+		color_mode=color_mode,
+		output_dir=args.output_dir,
+	)
+	results = webwork_lib.convert_yaml_files(yaml_paths, convert_file, args.jobs)
+	failures = webwork_lib.print_conversion_report(results, time.perf_counter() - t0)
+	if failures > 0:
+		raise RuntimeError(f"{failures} of {len(results)} YAML files failed to convert")
 
 #============================================
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+"""
+Write generated questions as QTI packages or HTML pages without BBQ text.
+
+bptools hands over an ItemBank of accepted item objects when a generator
+runs with --output-format. QTI 1.2 packages are streamed: each item is
+rendered and written into the zip as soon as it is ready, and images are
+copied into the zip one by one from their source files, so neither the
+whole assessment document nor a staging folder is ever built. The other
+formats are written by their qti_package_maker engines.
+"""
+
+# Standard Library
+import zipfile
+
+# PIP3 modules
+import lxml.etree
+from qti_package_maker.common import media_assets
+from qti_package_maker.common import qti_manifest
+from qti_package_maker.engines.canvas_qti_v1_2 import write_item as qti12_write_item
+from qti_package_maker.engines.html_selftest import engine_class as html_selftest_engine
+from qti_package_maker.engines.human_readable import engine_class as human_readable_engine
+from qti_package_maker.engines.canvas_qti_v1_2 import item_xml_helpers as qti12_xml_helpers
+from qti_package_maker.engines.canvas_qti_v1_2 import engine_class as canvas_qti_v1_2_engine
+from qti_package_maker.engines.canvas_qti_v1_2 import assessment_meta as qti12_assessment_meta
+from qti_package_maker.engines.blackboard_qti_v2_1 import engine_class as blackboard_qti_v2_1_engine
+
+# formats written by a qti_package_maker engine's save_package()
+ENGINE_FORMATS = {
+	'qti21': blackboard_qti_v2_1_engine.EngineClass,
+	'html': html_selftest_engine.EngineClass,
+	'human': human_readable_engine.EngineClass,
+}
+OUTPUT_FORMATS = ('qti12',) + tuple(sorted(ENGINE_FORMATS))
+
+# same package layout as the canvas_qti_v1_2 engine
+QTI12_ENGINE_NAME = 'canvas_qti_v1_2'
+QTI12_ITEMS_DIR = 'canvas_qti12_questions'
+QTI12_ITEMS_PATH = f'{QTI12_ITEMS_DIR}/{QTI12_ITEMS_DIR}.xml'
+QTI12_META_PATH = f'{QTI12_ITEMS_DIR}/assessment_meta.xml'
+
+#============================================
+def _tree_to_bytes(etree) -> bytes:
+	return lxml.etree.tostring(etree, pretty_print=True, xml_declaration=True, encoding='UTF-8')
+
+#============================================
+def _resolve_qti12_item_media(item_cls, collected):
+	"""
+	Point an item's local images at the package media/ folder.
+
+	Returns:
+		item to render, a rewritten copy when it uses local images.
+	"""
+	item_assets = collected.item_dependencies.get(item_cls.item_crc16, [])
+	if len(item_assets) == 0:
+		return item_cls
+	media_assets.raise_on_data_uri_assets(item_assets, QTI12_ENGINE_NAME, item_cls.item_crc16)
+	decision = media_assets.apply_media_policy(
+		media_assets.POLICY_PACKAGE, item_assets, QTI12_ENGINE_NAME, item_cls.item_crc16)
+	for warning in decision.warnings:
+		print(warning)
+	local_assets = [asset for asset in item_assets if asset.kind == media_assets.KIND_LOCAL]
+	if len(local_assets) == 0:
+		return item_cls
+	# items sit one folder below the package root
+	src_map = {asset.src: f'../{asset.output_name}' for asset in local_assets}
+	render_item_cls = media_assets.rewrite_item_media(item_cls, media_assets.make_src_map_fn(src_map))
+	return render_item_cls
+
+#============================================
+def write_qti12_package(package_item_bank, package_name: str, outfile: str) -> int:
+	"""
+	Stream items into a QTI 1.2 zip, one item and one image at a time.
+
+	The package matches the canvas_qti_v1_2 engine: one assessment file,
+	its metadata, images under media/ and an imsmanifest.xml.
+
+	Args:
+		package_item_bank (ItemBank): items to write, in order.
+		package_name (str): assessment title.
+		outfile (str): zip path.
+
+	Returns:
+		int: number of items written.
+	"""
+	collected = package_item_bank.collect_assets()
+	local_assets = [asset for asset in collected.assets if asset.kind == media_assets.KIND_LOCAL]
+	for asset in local_assets:
+		asset.output_name = f'{canvas_qti_v1_2_engine.CANVAS_MEDIA_SUBDIR}/{asset.output_name}'
+	root = qti12_xml_helpers.create_assessment_items_file_xml_header()
+	item_count = 0
+	with zipfile.ZipFile(outfile, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+		with zip_file.open(QTI12_ITEMS_PATH, 'w') as items_file:
+			with lxml.etree.xmlfile(items_file, encoding='UTF-8') as xml_file:
+				xml_file.write_declaration()
+				with xml_file.element(root.tag, root.attrib, nsmap=root.nsmap):
+					xml_file.write('\n')
+					with xml_file.element('assessment', ident='root_assessment', title=package_name):
+						xml_file.write('\n')
+						with xml_file.element('section', ident='root_section'):
+							xml_file.write('\n')
+							for item_cls in package_item_bank:
+								write_item_function = getattr(qti12_write_item, item_cls.item_type, None)
+								if write_item_function is None:
+									print(f"Warning: No write function found for item type '{item_cls.item_type}'.")
+									continue
+								render_item_cls = _resolve_qti12_item_media(item_cls, collected)
+								item_etree = write_item_function(render_item_cls)
+								if item_etree is None:
+									continue
+								xml_file.write(item_etree, pretty_print=True)
+								item_count += 1
+		# a zip takes one open entry at a time, so images follow the items
+		for asset in local_assets:
+			zip_file.writestr(asset.output_name, asset.read_bytes())
+		meta_etree = qti12_assessment_meta.generate_assessment_meta(package_name)
+		zip_file.writestr(QTI12_META_PATH, _tree_to_bytes(meta_etree))
+		item_dependencies = None
+		if len(local_assets) > 0:
+			item_dependencies = {QTI12_ITEMS_PATH: local_assets}
+		manifest_etree = qti_manifest.generate_manifest(package_name, [QTI12_ITEMS_PATH],
+			version='1.2', assets=local_assets, item_dependencies=item_dependencies)
+		zip_file.writestr('imsmanifest.xml', _tree_to_bytes(manifest_etree))
+	return item_count
+
+#============================================
+def write_package(package_item_bank, package_name: str, output_format: str) -> str:
+	"""
+	Write an ItemBank in one of OUTPUT_FORMATS, named like the engines do.
+
+	Args:
+		package_item_bank (ItemBank): items to write.
+		package_name (str): package and title name, e.g. 'name-questions'.
+		output_format (str): 'qti12', 'qti21', 'html' or 'human'.
+
+	Returns:
+		str: path of the written package or page.
+	"""
+	if output_format == 'qti12':
+		outfile = f'qti12-{package_name}.zip'
+		write_qti12_package(package_item_bank, package_name, outfile)
+		return outfile
+	if output_format not in ENGINE_FORMATS:
+		raise ValueError(f'unknown output format: {output_format}')
+	engine = ENGINE_FORMATS[output_format](package_name)
+	outfile = engine.save_package(package_item_bank)
+	return outfile
@@ -6,7 +6,15 @@ Canvas, or JavaScript required).
 """
 
 # Standard Library
-import math
+import itertools
+
+# PIP3 modules
+import numpy
+
+# Antialiased coverage below this is dropped to keep the edges clean
+MIN_CURVE_ALPHA = 0.05
+# Marks grid cells already covered by a rowspan from an earlier row
+_COVERED = object()
 
 
 #===========================================================
@@ -17,6 +25,10 @@ class TableImageRaster:
 	Each cell is a fixed-size colored square. Three rendering layers
 	(guides, curves, dots) are composited with dot > curve > guide
 	priority. Axis labels and right-margin annotations are supported.
+
+	Layers are (rows, cols) NumPy arrays of palette indexes, -1 where a
+	layer is empty. The curve layer also keeps a coverage alpha that is
+	blended over the background when the chart is composited.
 	"""
 
 	#===========================================================
@@ -46,10 +58,13 @@ class TableImageRaster:
 		# Dash stride adapts to cell size for ~12px visual dashes
 		self._dash_stride = max(1, round(12.0 / cell_px))
 
-		# Cell layers: (row, col) -> color string
-		self._curve_cells = {}
-		self._guide_cells = {}
-		self._dot_cells = {}
+		# Cell layers: palette index per (row, col), -1 when empty
+		self._palette = []
+		self._palette_index = {}
+		self._curve_layer = numpy.full((rows, cols), -1, dtype=numpy.int16)
+		self._curve_alpha = numpy.zeros((rows, cols), dtype=numpy.float64)
+		self._guide_layer = numpy.full((rows, cols), -1, dtype=numpy.int16)
+		self._dot_layer = numpy.full((rows, cols), -1, dtype=numpy.int16)
 
 		# Axis configuration
 		self._y_tick_interval = None
@@ -91,25 +106,120 @@ class TableImageRaster:
 
 	#===========================================================
 	#===========================================================
-	@staticmethod
-	def _blend_hex(fg_hex: str, bg_hex: str, alpha: float) -> str:
-		"""Blend foreground over background at given alpha.
+	def _color_index(self, color: str) -> int:
+		"""Return the palette index of a color, adding it if new."""
+		index = self._palette_index.get(color)
+		if index is None:
+			index = len(self._palette)
+			self._palette.append(color)
+			self._palette_index[color] = index
+		return index
+
+	#===========================================================
+	#===========================================================
+	def _clip_segments(self, c0, r0, c1, r1) -> tuple:
+		"""Clip segments in cell coordinates to the grid (Liang-Barsky).
+
+		The clip box is two cells wider than the grid on every side, so a
+		cut end can only land on cells that are dropped anyway. Ends that
+		need no clipping are returned unchanged.
+
+		Args:
+			c0, r0, c1, r1: segment end coordinates, one array each.
+
+		Returns:
+			tuple: (c0, r0, c1, r1, inside), where inside marks segments
+				that touch the clip box.
+		"""
+		dc = c1 - c0
+		dr = r1 - r0
+		t_enter = numpy.zeros(c0.shape)
+		t_exit = numpy.ones(c0.shape)
+		inside = numpy.ones(c0.shape, dtype=bool)
+		edges = (
+			(-dc, c0 + 2), (dc, self.cols + 1 - c0),
+			(-dr, r0 + 2), (dr, self.rows + 1 - r0),
+		)
+		with numpy.errstate(divide='ignore', invalid='ignore'):
+			for p, q in edges:
+				# parallel to this edge and outside it
+				inside &= ~((p == 0) & (q < 0))
+				ratio = q / p
+				t_enter = numpy.where(p < 0, numpy.maximum(t_enter, ratio), t_enter)
+				t_exit = numpy.where(p > 0, numpy.minimum(t_exit, ratio), t_exit)
+		inside &= t_enter <= t_exit
+		clip_c0 = numpy.where(t_enter > 0, c0 + t_enter * dc, c0)
+		clip_r0 = numpy.where(t_enter > 0, r0 + t_enter * dr, r0)
+		clip_c1 = numpy.where(t_exit < 1, c0 + t_exit * dc, c1)
+		clip_r1 = numpy.where(t_exit < 1, r0 + t_exit * dr, r1)
+		return clip_c0, clip_r0, clip_c1, clip_r1, inside
+
+	#===========================================================
+	#===========================================================
+	def _rasterize_polyline(self, points: list, antialiased: bool) -> tuple:
+		"""Rasterize a polyline through data points onto grid cells.
+
+		Each segment is first clipped to the grid, then stepped one cell
+		at a time along its major axis, so consecutive points may be far
+		apart or far off the chart. With antialiasing the
+		minor-axis position is split over two cells by its fractional
+		part (Xiaolin Wu's line algorithm); without it the nearest cell
+		is used.
 
 		Args:
-			fg_hex: foreground color as '#rrggbb'.
-			bg_hex: background color as '#rrggbb'.
-			alpha: blend factor (0.0 = pure bg, 1.0 = pure fg).
+			points: iterable of (x, y) data points, at least one.
+			antialiased: split coverage between neighboring cells.
 
 		Returns:
-			str: blended color as '#rrggbb'.
+			tuple: (rows, cols, alphas) arrays for in-grid cells.
 		"""
-		fg_rgb = TableImageRaster._parse_hex(fg_hex)
-		bg_rgb = TableImageRaster._parse_hex(bg_hex)
-		blended = []
-		for fc, bc in zip(fg_rgb, bg_rgb):
-			blended.append(int(fc * alpha + bc * (1 - alpha)))
-		result = f"#{blended[0]:02x}{blended[1]:02x}{blended[2]:02x}"
-		return result
+		xy = numpy.asarray(list(points), dtype=numpy.float64).reshape(-1, 2)
+		col_f = (xy[:, 0] - self.x_min) / self.x_step
+		row_f = (xy[:, 1] - self.y_min) / self.y_step
+		if len(xy) == 1:
+			# a single point is a zero-length segment
+			col_f = numpy.repeat(col_f, 2)
+			row_f = numpy.repeat(row_f, 2)
+		c0, r0, c1, r1, inside = self._clip_segments(col_f[:-1], row_f[:-1], col_f[1:], row_f[1:])
+		c0, r0, c1, r1 = c0[inside], r0[inside], c1[inside], r1[inside]
+		x_major = numpy.abs(c1 - c0) >= numpy.abs(r1 - r0)
+		major0 = numpy.where(x_major, c0, r0)
+		major1 = numpy.where(x_major, c1, r1)
+		minor0 = numpy.where(x_major, r0, c0)
+		minor1 = numpy.where(x_major, r1, c1)
+
+		# integer steps along the major axis of each segment
+		lo = numpy.ceil(numpy.minimum(major0, major1))
+		hi = numpy.floor(numpy.maximum(major0, major1))
+		counts = (hi - lo + 1).astype(numpy.int64)
+		# segments shorter than one cell still mark their midpoint cell
+		short = counts < 1
+		lo[short] = numpy.round((major0[short] + major1[short]) / 2)
+		counts[short] = 1
+		segment = numpy.repeat(numpy.arange(len(counts)), counts)
+		starts = numpy.cumsum(counts) - counts
+		major = lo[segment] + numpy.arange(segment.size) - starts[segment]
+		span = (major1 - major0)[segment]
+		safe_span = numpy.where(span == 0, 1.0, span)
+		t = numpy.clip((major - major0[segment]) / safe_span, 0.0, 1.0)
+		t[span == 0] = 0.0
+		minor = minor0[segment] + t * (minor1 - minor0)[segment]
+		seg_x_major = x_major[segment]
+
+		if antialiased:
+			minor_lo = numpy.floor(minor)
+			frac = minor - minor_lo
+			major = numpy.concatenate([major, major])
+			minor = numpy.concatenate([minor_lo, minor_lo + 1])
+			alphas = numpy.concatenate([1 - frac, frac])
+			seg_x_major = numpy.concatenate([seg_x_major, seg_x_major])
+		else:
+			minor = numpy.round(minor)
+			alphas = numpy.ones(major.size)
+		cols = numpy.where(seg_x_major, major, minor).astype(numpy.int64)
+		rows = numpy.where(seg_x_major, minor, major).astype(numpy.int64)
+		keep = (alphas >= MIN_CURVE_ALPHA) & (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+		return rows[keep], cols[keep], alphas[keep]
 
 	#===========================================================
 	#===========================================================
@@ -117,57 +227,35 @@ class TableImageRaster:
 		self, points: list, color: str = None,
 		antialiased: bool = False
 	) -> None:
-		"""Plot a curve from a sequence of (x, y) data points.
+		"""Plot a curve as a polyline through (x, y) data points.
 
-		Each point is mapped to the nearest grid cell and colored.
-		Points outside the grid are silently clipped.
+		Consecutive points are joined by rasterized line segments, so a
+		handful of control points is enough for straight stretches and a
+		few dozen samples draw a smooth curve. Cells outside the grid are
+		silently clipped.
 
 		Args:
 			points: iterable of (x, y) tuples.
-			color: CSS color string (default: self.color_curve).
-			antialiased: if True, use bilinear sub-pixel blending
-				to smooth curve edges.
+			color: CSS color string (default: self.color_curve). Must be
+				'#rrggbb' when antialiased.
+			antialiased: if True, blend partial cell coverage over the
+				background to smooth curve edges.
 		"""
 		if color is None:
 			color = self.color_curve
-		if not antialiased:
-			# Simple nearest-cell rendering
-			for x, y in points:
-				col = self._x_to_col(x)
-				row = self._y_to_row(y)
-				if 0 <= col < self.cols and 0 <= row < self.rows:
-					self._curve_cells[(row, col)] = color
+		if antialiased:
+			# fail early, blending needs the RGB value
+			self._parse_hex(color)
+		points = list(points)
+		if len(points) == 0:
 			return
-		# Anti-aliased: bilinear sub-pixel blending across 4 neighbors
-		alpha_map = {}
-		for x, y in points:
-			col_f = (x - self.x_min) / self.x_step
-			row_f = (y - self.y_min) / self.y_step
-			col_lo = int(math.floor(col_f))
-			row_lo = int(math.floor(row_f))
-			col_frac = col_f - col_lo
-			row_frac = row_f - row_lo
-			# Bilinear weights for the four surrounding cells
-			weights = [
-				(row_lo, col_lo, (1 - row_frac) * (1 - col_frac)),
-				(row_lo, col_lo + 1, (1 - row_frac) * col_frac),
-				(row_lo + 1, col_lo, row_frac * (1 - col_frac)),
-				(row_lo + 1, col_lo + 1, row_frac * col_frac),
-			]
-			for row, col, alpha in weights:
-				# Skip near-zero contributions
-				if alpha < 0.05:
-					continue
-				if not (0 <= row < self.rows and 0 <= col < self.cols):
-					continue
-				key = (row, col)
-				# Keep the highest alpha per cell
-				if alpha > alpha_map.get(key, 0):
-					alpha_map[key] = alpha
-					blended = self._blend_hex(
-						color, self.color_bg, alpha
-					)
-					self._curve_cells[key] = blended
+		rows, cols, alphas = self._rasterize_polyline(points, antialiased)
+		# Keep the highest coverage per cell within this curve
+		coverage = numpy.zeros((self.rows, self.cols), dtype=numpy.float64)
+		numpy.maximum.at(coverage, (rows, cols), alphas)
+		painted = coverage > 0
+		self._curve_layer[painted] = self._color_index(color)
+		self._curve_alpha[painted] = coverage[painted]
 
 	#===========================================================
 	#===========================================================
@@ -190,11 +278,12 @@ class TableImageRaster:
 			end_col = self._x_to_col(x_max) + 1
 		else:
 			end_col = self.cols
-		stride2 = self._dash_stride * 2
-		for c in range(min(end_col, self.cols)):
-			if not dashed or (c % stride2 < self._dash_stride):
-				if 0 <= row < self.rows:
-					self._guide_cells[(row, c)] = color
+		if not 0 <= row < self.rows:
+			return
+		cols = numpy.arange(min(end_col, self.cols))
+		if dashed:
+			cols = cols[cols % (self._dash_stride * 2) < self._dash_stride]
+		self._guide_layer[row, cols] = self._color_index(color)
 
 	#===========================================================
 	#===========================================================
@@ -217,11 +306,12 @@ class TableImageRaster:
 			end_row = self._y_to_row(y_max) + 1
 		else:
 			end_row = self.rows
-		stride2 = self._dash_stride * 2
-		for r in range(min(end_row, self.rows)):
-			if not dashed or (r % stride2 < self._dash_stride):
-				if 0 <= col < self.cols:
-					self._guide_cells[(r, col)] = color
+		if not 0 <= col < self.cols:
+			return
+		rows = numpy.arange(min(end_row, self.rows))
+		if dashed:
+			rows = rows[rows % (self._dash_stride * 2) < self._dash_stride]
+		self._guide_layer[rows, col] = self._color_index(color)
 
 	#===========================================================
 	#===========================================================
@@ -250,7 +340,7 @@ class TableImageRaster:
 		col = self._x_to_col(x)
 		row = self._y_to_row(y)
 		if 0 <= col < self.cols and 0 <= row < self.rows:
-			self._dot_cells[(row, col)] = color
+			self._dot_layer[row, col] = self._color_index(color)
 
 	#===========================================================
 	#===========================================================
@@ -279,34 +369,139 @@ class TableImageRaster:
 
 	#===========================================================
 	#===========================================================
-	def to_html(self) -> str:
+	def _color_grid(self) -> list:
+		"""Composite the three layers into one color grid.
+
+		Returns:
+			list: one list per row, top (high y) row first, holding a
+				color string or None for empty cells.
+		"""
+		# Priority dot > curve > guide, later assignments win
+		index = self._guide_layer.copy()
+		alpha = numpy.where(index >= 0, 1.0, 0.0)
+		curve_mask = self._curve_layer >= 0
+		index[curve_mask] = self._curve_layer[curve_mask]
+		alpha[curve_mask] = self._curve_alpha[curve_mask]
+		dot_mask = self._dot_layer >= 0
+		index[dot_mask] = self._dot_layer[dot_mask]
+		alpha[dot_mask] = 1.0
+
+		grid = numpy.full((self.rows, self.cols), None, dtype=object)
+		painted = index >= 0
+		palette = numpy.array(self._palette + [None], dtype=object)
+		grid[painted] = palette[index[painted]]
+		partial = painted & (alpha < 1.0)
+		if partial.any():
+			# Blend partial coverage over the background as integer RGB
+			used = numpy.unique(index[partial])
+			palette_rgb = numpy.zeros((len(self._palette), 3), dtype=numpy.float64)
+			for color_index in used:
+				palette_rgb[color_index] = self._parse_hex(self._palette[color_index])
+			bg_rgb = numpy.array(self._parse_hex(self.color_bg), dtype=numpy.float64)
+			part_alpha = alpha[partial][:, None]
+			blended = (palette_rgb[index[partial]] * part_alpha + bg_rgb * (1 - part_alpha)).astype(numpy.int64)
+			codes = (blended[:, 0] << 16) | (blended[:, 1] << 8) | blended[:, 2]
+			unique_codes, inverse = numpy.unique(codes, return_inverse=True)
+			hex_colors = numpy.array([f"#{code:06x}" for code in unique_codes], dtype=object)
+			grid[partial] = hex_colors[inverse]
+		# Row 0 is y_min, the HTML table starts at the top
+		return grid[::-1].tolist()
+
+	#===========================================================
+	#===========================================================
+	@staticmethod
+	def _grid_td(bg: str, colspan: int = 1, rowspan: int = 1) -> str:
+		"""Build one data-cell td covering colspan x rowspan cells."""
+		attrs = ""
+		if colspan > 1:
+			attrs += f" colspan='{colspan}'"
+		if rowspan > 1:
+			attrs += f" rowspan='{rowspan}'"
+		if bg is not None:
+			attrs += f" style='background:{bg}'"
+		return f"<td{attrs}></td>"
+
+	#===========================================================
+	#===========================================================
+	def _encode_grid(self, grid: list, merge: str) -> list:
+		"""Encode the color grid rows below the width row as td strings.
+
+		'cells' writes one td per cell. 'runs' merges horizontal runs of
+		one color with colspan. 'blocks' also grows each run downward
+		with rowspan while the rows below repeat it.
+
+		Returns:
+			list: td string lists for grid rows 1 .. rows-1 (row 0, the
+				width row, is written by to_html).
+		"""
+		encoded_rows = [[] for _ in range(self.rows)]
+		# Working copy where cells owned by a rowspan from above are
+		# replaced by a marker that never equals a color
+		work = [list(row_colors) for row_colors in grid]
+		for r in range(1, self.rows):
+			row_tds = encoded_rows[r]
+			c = 0
+			for bg, run in itertools.groupby(work[r]):
+				width = sum(1 for _ in run)
+				if bg is _COVERED:
+					c += width
+					continue
+				if merge == 'cells':
+					row_tds.extend([self._grid_td(bg)] * width)
+					c += width
+					continue
+				height = 1
+				if merge == 'blocks':
+					run_colors = [bg] * width
+					covered_run = [_COVERED] * width
+					while r + height < self.rows and work[r + height][c:c + width] == run_colors:
+						work[r + height][c:c + width] = covered_run
+						height += 1
+				row_tds.append(self._grid_td(bg, width, height))
+				c += width
+		return encoded_rows[1:]
+
+	#===========================================================
+	#===========================================================
+	def to_html(self, merge: str = 'blocks') -> str:
 		"""Render the chart as an HTML table string.
 
 		Cells are composited with priority: dot > curve > guide > empty.
 		Uses table-layout:fixed so column widths are set once in the
-		first row, keeping subsequent rows compact.
+		first row, keeping subsequent rows compact. The first row is
+		always written cell by cell; later rows are run-length encoded.
+
+		Args:
+			merge: 'blocks' (default) merges same-color rectangles with
+				colspan and rowspan, 'runs' merges horizontal runs with
+				colspan only, 'cells' writes one td per grid cell.
 
 		Returns:
 			str: self-contained HTML table fragment.
 		"""
+		if merge not in ('cells', 'runs', 'blocks'):
+			raise ValueError(f"merge must be 'cells', 'runs' or 'blocks', got {merge!r}")
 		px = self.cell_px
 		has_right = bool(self._right_labels)
 		# Width style only needed on first-row data cells
 		w_sty = f"width:{px}px"
+		grid = self._color_grid()
+		encoded_rows = self._encode_grid(grid, merge)
 
 		# Open table with fixed layout for compact cell rendering
-		html = ""
-		html += "<table style='table-layout:fixed;"
-		html += "border-collapse:collapse;margin:8px auto;"
-		html += f"background:{self.color_bg};"
-		html += f"border:1px solid {self.color_border};'>"
+		parts = []
+		parts.append("<table style='table-layout:fixed;")
+		parts.append("border-collapse:collapse;margin:8px auto;")
+		parts.append(f"background:{self.color_bg};")
+		parts.append(f"border:1px solid {self.color_border};'>")
 
 		# Data rows from top (high y) to bottom (low y)
-		is_first_row = True
-		for row_idx in range(self.rows - 1, -1, -1):
+		for r in range(self.rows):
+			row_idx = self.rows - 1 - r
+			is_first_row = (r == 0)
 			y_val = self.y_min + row_idx * self.y_step
 			# Row height set here instead of per-cell
-			html += f"<tr style='height:{px}px'>"
+			parts.append(f"<tr style='height:{px}px'>")
 
 			# Left column: y-axis tick label
 			label = ""
@@ -315,47 +510,33 @@ class TableImageRaster:
 				if abs(quotient - round(quotient)) < 0.01:
 					label = f"{y_val:g}"
 			if is_first_row:
-				html += "<td style='width:20px;font-size:10px;"
+				parts.append("<td style='width:20px;font-size:10px;")
 			else:
-				html += "<td style='font-size:10px;"
-			html += f"text-align:right;padding-right:2px;'>{label}</td>"
+				parts.append("<td style='font-size:10px;")
+			parts.append(f"text-align:right;padding-right:2px;'>{label}</td>")
 
 			# Data cells for the grid
-			for col_idx in range(self.cols):
-				key = (row_idx, col_idx)
-				# Priority: dot > curve > guide > empty
-				if key in self._dot_cells:
-					bg = self._dot_cells[key]
-				elif key in self._curve_cells:
-					bg = self._curve_cells[key]
-				elif key in self._guide_cells:
-					bg = self._guide_cells[key]
-				else:
-					bg = None
-				if is_first_row:
-					# First row sets column widths for table-layout:fixed
-					if bg is not None:
-						html += f"<td style='{w_sty};background:{bg}'></td>"
-					else:
-						html += f"<td style='{w_sty}'></td>"
-				else:
-					# Subsequent rows inherit widths, only need bg
+			if is_first_row:
+				# First row sets column widths for table-layout:fixed
+				for bg in grid[0]:
 					if bg is not None:
-						html += f"<td style='background:{bg}'></td>"
+						parts.append(f"<td style='{w_sty};background:{bg}'></td>")
 					else:
-						html += "<td></td>"
+						parts.append(f"<td style='{w_sty}'></td>")
+			else:
+				# Subsequent rows inherit widths, only need bg
+				parts.extend(encoded_rows[r - 1])
 
 			# Right column: annotation label
 			if has_right:
 				right_text = self._right_labels.get(row_idx, "")
 				if is_first_row:
-					html += "<td style='width:50px;font-size:9px;"
+					parts.append("<td style='width:50px;font-size:9px;")
 				else:
-					html += "<td style='font-size:9px;"
-				html += f"padding-left:3px;'>{right_text}</td>"
+					parts.append("<td style='font-size:9px;")
+				parts.append(f"padding-left:3px;'>{right_text}</td>")
 
-			html += "</tr>"
-			is_first_row = False
+			parts.append("</tr>")
 
 		# X-axis tick labels
 		if self._x_tick_values:
@@ -364,27 +545,36 @@ class TableImageRaster:
 				col = self._x_to_col(x_val)
 				if 0 <= col < self.cols:
 					tick_map[col] = f"{x_val:g}"
-			html += "<tr><td></td>"
+			parts.append("<tr><td></td>")
+			empty_run = 0
 			for col_idx in range(self.cols):
 				if col_idx in tick_map:
-					html += "<td style='font-size:10px;"
-					html += "text-align:center;'>"
-					html += f"{tick_map[col_idx]}</td>"
+					if empty_run > 0:
+						parts.append(self._grid_td(None, empty_run))
+						empty_run = 0
+					parts.append("<td style='font-size:10px;")
+					parts.append("text-align:center;'>")
+					parts.append(f"{tick_map[col_idx]}</td>")
+				elif merge == 'cells':
+					parts.append("<td></td>")
 				else:
-					html += "<td></td>"
+					empty_run += 1
+			if empty_run > 0:
+				parts.append(self._grid_td(None, empty_run))
 			if has_right:
-				html += "<td></td>"
-			html += "</tr>"
+				parts.append("<td></td>")
+			parts.append("</tr>")
 
 		# X-axis title
 		if self._x_axis_title is not None:
-			html += "<tr><td></td>"
-			html += f"<td colspan='{self.cols}' style='font-size:10px;"
-			html += "text-align:center;padding-top:2px;'>"
-			html += f"{self._x_axis_title}</td>"
+			parts.append("<tr><td></td>")
+			parts.append(f"<td colspan='{self.cols}' style='font-size:10px;")
+			parts.append("text-align:center;padding-top:2px;'>")
+			parts.append(f"{self._x_axis_title}</td>")
 			if has_right:
-				html += "<td></td>"
-			html += "</tr>"
+				parts.append("<td></td>")
+			parts.append("</tr>")
 
-		html += "</table>"
+		parts.append("</table>")
+		html = "".join(parts)
 		return html
@@ -6,3 +6,17 @@ def test_pubchem_aminoacidlib_formula_parsing():
 	pubchem_aminoacidlib = import_from_repo_path("problems/biochemistry-problems/PUBCHEM/aminoacidlib.py")
 	assert pubchem_aminoacidlib.parse_formula("C6H12O6") == {"C": 6, "H": 12, "O": 6}
 	assert pubchem_aminoacidlib.formula_disimilarity("C6H12O6", "C6H12O6") == 0
+
+
+def test_pubchem_aminoacidlib_similarity_rows_sort_by_score():
+	pubchem_aminoacidlib = import_from_repo_path("problems/biochemistry-problems/PUBCHEM/aminoacidlib.py")
+	molecule_data_list = [
+		{"Molecular formula": "C3H7NO2", "Molecular weight": 89.09},
+		{"Molecular formula": "C2H5NO2", "Molecular weight": 75.07},
+		{"Molecular formula": "C3H7NO3", "Molecular weight": 105.09},
+	]
+	matrix = pubchem_aminoacidlib.build_dissimilarity_matrix(molecule_data_list)
+	rows = pubchem_aminoacidlib.build_similarity_rows(["ala", "gly", "ser"], matrix)
+	assert matrix[0][0] == 0.0
+	# serine only adds one oxygen to the alanine side chain
+	assert rows["ala"] == ["ser", "gly"]
@@ -1,3 +1,5 @@
+import json
+import multiprocessing
 
 from lib_test_utils import import_from_repo_path
 
@@ -11,3 +13,135 @@ def test_pubchemlib_format_and_ratio_helpers_without_network():
 
 	assert abs(pcl.calculate_c_to_on_ratio("C6H12O6") - 1.0) < 1e-9
 	assert abs(pcl.calculate_c_to_on_ratio("C10H16N5O13P3") - (10.0 / 9.0)) < 1e-9
+
+
+# canned PubChem PUG REST answers for a stubbed session.get()
+STUB_NAME_TO_CID = {"glucose": 5793, "adenine": 190}
+STUB_PROPERTIES = {
+	5793: {"CID": 5793, "SMILES": "C(C1C(C(C(C(O1)O)O)O)O)O", "MolecularWeight": "180.16",
+		"MolecularFormula": "C6H12O6", "XLogP": -2.6},
+	190: {"CID": 190, "SMILES": "C1=NC2=NC=NC(=C2N1)N", "MolecularWeight": "135.13",
+		"MolecularFormula": "C5H5N5"},
+}
+STUB_SYNONYMS = {5793: "D-GLUCOSE", 190: "adenine"}
+
+
+class _StubResponse:
+	def __init__(self, body):
+		self.body = body
+
+	def json(self):
+		return self.body
+
+
+def _stub_pubchem_body(url):
+	# .../rest/pug/compound/<name|cid>/<key>/<operation>/JSON
+	parts = url.split("/rest/pug/")[1].split("/")
+	if parts[1] == "name":
+		cid_number = STUB_NAME_TO_CID.get(parts[2])
+		if cid_number is None:
+			return {"Fault": {"Code": "PUGREST.NotFound"}}
+		return {"IdentifierList": {"CID": [cid_number]}}
+	cid_list = [int(cid) for cid in parts[2].split(",")]
+	if parts[3] == "synonyms":
+		info_list = [{"CID": cid, "Synonym": [STUB_SYNONYMS[cid]]} for cid in cid_list]
+		return {"InformationList": {"Information": info_list}}
+	return {"PropertyTable": {"Properties": [STUB_PROPERTIES[cid] for cid in cid_list]}}
+
+
+def test_pubchemlib_batches_property_requests(monkeypatch, tmp_path):
+	pubchemlib = import_from_repo_path("problems/biochemistry-problems/PUBCHEM/pubchemlib.py")
+	pcl = pubchemlib.PubChemLib("https://pubchem.invalid/rest/pug", str(tmp_path / "cache.yml"),
+		requests_per_second=1000)
+	request_urls = []
+
+	def fake_get(url, timeout=None):
+		request_urls.append(url)
+		return _StubResponse(_stub_pubchem_body(url))
+
+	monkeypatch.setattr(pcl.session, "get", fake_get)
+	data_list = pcl.get_molecule_data_dicts(["glucose", "#comment", "adenine", "unobtainium"])
+	# two name lookups plus one miss, then one property and one synonym batch
+	assert len(request_urls) == 5
+	assert [data and data["Full name"] for data in data_list] == ["D-Glucose", None, "adenine", None]
+
+
+def test_pubchemlib_token_bucket_spaces_requests(monkeypatch):
+	pubchemlib = import_from_repo_path("problems/biochemistry-problems/PUBCHEM/pubchemlib.py")
+	clock = [100.0]
+	sleeps = []
+
+	def fake_sleep(seconds):
+		sleeps.append(round(seconds, 6))
+		clock[0] += seconds
+
+	monkeypatch.setattr(pubchemlib.time, "monotonic", lambda: clock[0])
+	monkeypatch.setattr(pubchemlib.time, "sleep", fake_sleep)
+	bucket = pubchemlib.TokenBucket(rate=5, capacity=2)
+	for _ in range(4):
+		bucket.acquire()
+	# two burst tokens, then one wait of 1/5 s per request
+	assert sleeps == [0.2, 0.2]
+
+
+def test_pubchemlib_snapshot_follows_yaml_changes(tmp_path):
+	pubchemlib = import_from_repo_path("problems/biochemistry-problems/PUBCHEM/pubchemlib.py")
+	cache_file = tmp_path / "cache.yml"
+	cache_file.write_text("cid_to_data: {}\nname_to_cid: {water: 962}\ntime_stamp: 1\n")
+	pubchemlib.PubChemLib(cache_file=str(cache_file))
+	cache_file.write_text("cid_to_data: {}\nname_to_cid: {ice: 962}\ntime_stamp: 2\n")
+	pcl = pubchemlib.PubChemLib(cache_file=str(cache_file))
+	assert pcl.molecular_data_cache["name_to_cid"] == {"ice": 962}
+	assert (tmp_path / "cache.snapshot.json").is_file()
+
+
+def test_pubchemlib_journal_is_replayed_and_merged(tmp_path):
+	pubchemlib = import_from_repo_path("problems/biochemistry-problems/PUBCHEM/pubchemlib.py")
+	cache_file = tmp_path / "cache.yml"
+	cache_file.write_text("cid_to_data: {}\nname_to_cid: {}\ntime_stamp: 1\n")
+	# first run journals an entry and exits without close()
+	pubchemlib.PubChemLib(cache_file=str(cache_file)).append_journal("name_to_cid", "water", 962)
+	pcl = pubchemlib.PubChemLib(cache_file=str(cache_file))
+	pcl.close()
+	assert "water: 962" in cache_file.read_text()
+	assert not (tmp_path / "cache.journal.jsonl").exists()
+
+
+def test_pubchemlib_derived_table_is_kept_until_cache_changes(tmp_path):
+	pubchemlib = import_from_repo_path("problems/biochemistry-problems/PUBCHEM/pubchemlib.py")
+	cache_file = tmp_path / "cache.yml"
+	cache_file.write_text("cid_to_data: {}\nname_to_cid: {}\ntime_stamp: 1\n")
+	pubchemlib.PubChemLib(cache_file=str(cache_file)).set_derived_table("rows", {"a": ["b"]})
+	pcl = pubchemlib.PubChemLib(cache_file=str(cache_file))
+	assert pcl.get_derived_table("rows") == {"a": ["b"]}
+	pcl.append_journal("name_to_cid", "water", 962)
+	assert pcl.get_derived_table("rows") is None
+
+
+def test_pubchemlib_corrupt_snapshot_is_rebuilt(tmp_path):
+	pubchemlib = import_from_repo_path("problems/biochemistry-problems/PUBCHEM/pubchemlib.py")
+	cache_file = tmp_path / "cache.yml"
+	cache_file.write_text("cid_to_data: {}\nname_to_cid: {water: 962}\ntime_stamp: 1\n")
+	(tmp_path / "cache.snapshot.json").write_text('{"version": 1, "cache": {')
+	pcl = pubchemlib.PubChemLib(cache_file=str(cache_file))
+	assert pcl.molecular_data_cache["name_to_cid"] == {"water": 962}
+	assert json.loads((tmp_path / "cache.snapshot.json").read_text())["yaml_sha256"] == pcl.yaml_hash
+
+
+def _store_derived_table(cache_path, table_name):
+	pubchemlib = import_from_repo_path("problems/biochemistry-problems/PUBCHEM/pubchemlib.py")
+	for _ in range(3):
+		pubchemlib.PubChemLib(cache_file=cache_path).set_derived_table(table_name, list(range(5000)))
+
+
+def test_pubchemlib_parallel_derived_table_writers(tmp_path):
+	cache_file = tmp_path / "cache.yml"
+	cache_file.write_text("cid_to_data: {}\nname_to_cid: {}\ntime_stamp: 1\n")
+	context = multiprocessing.get_context("fork")
+	workers = [context.Process(target=_store_derived_table, args=(str(cache_file), f"t{i}")) for i in range(4)]
+	for worker in workers:
+		worker.start()
+	for worker in workers:
+		worker.join()
+	assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+	assert json.loads((tmp_path / "cache.snapshot.json").read_text())["version"] == 1
@@ -1,6 +1,8 @@
 
 import random
 
+import pytest
+
 from lib_test_utils import import_from_repo_path
 
 
@@ -19,3 +21,19 @@ def test_chisquarelib_create_observed_progeny_is_deterministic_with_seed():
 	assert isinstance(counts, list)
 	assert len(counts) == 4
 	assert sum(counts) == 20
+
+
+def test_chisquarelib_tables_match_scipy():
+	chisquarelib = import_from_repo_path("problems/inheritance-problems/chi_square/chisquarelib.py")
+	from scipy.stats.distributions import chi2
+	for alpha, row in chisquarelib.CRITICAL_VALUE_TABLE.items():
+		expected = [float(chi2.ppf(1.0 - alpha, df)) for df in range(1, 11)]
+		assert list(row) == pytest.approx(expected, rel=1e-12)
+	for df in range(1, 11):
+		assert abs(chisquarelib.get_p_value(2.5 * df, df) - chi2.sf(2.5 * df, df)) < 1e-12
+
+
+def test_chisquarelib_chi_square_result():
+	chisquarelib = import_from_repo_path("problems/inheritance-problems/chi_square/chisquarelib.py")
+	assert chisquarelib.get_chi_square_result(10.0, 2, 0.05) == "reject_null"
+	assert chisquarelib.get_chi_square_result(3.0, 2, 0.05) == "accept_null"
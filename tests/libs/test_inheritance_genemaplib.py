@@ -19,3 +19,42 @@ def test_genemaplib_small_pure_helpers():
 	assert genemaplib.flip_gene_by_letter("+b+d", "b", "abcd") == "+++d"
 	assert genemaplib.flip_gene_by_index("+b+d", 2, "abcd") == "+++d"
 	assert genemaplib.crossover_after_index("++++", 2, "adcb") == "+bc+"
+
+
+def test_genemaplib_triplet_table_matches_direct_scan():
+	genemaplib = import_from_repo_path("problems/inheritance-problems/gene_mapping/genemaplib.py")
+	expected = []
+	for fraction in ((1, 2), (1, 3), (1, 4), (2, 3), (3, 4)):
+		expected += genemaplib.distance_triplet_generator(fraction, 40)
+	assert genemaplib.get_all_distance_triplets(4, 40, msg=False) == expected
+
+
+def test_genemaplib_triplet_builder_matches_generator():
+	builder = import_from_repo_path(
+		"problems/inheritance-problems/gene_mapping/build_distance_triplet_table.py"
+	)
+	genemaplib = import_from_repo_path("problems/inheritance-problems/gene_mapping/genemaplib.py")
+	for fraction in ((9, 11), (3, 8), (7, 20)):
+		expected = genemaplib.distance_triplet_generator(fraction, 45)
+		assert builder.triplets_for_fraction(fraction[0], fraction[1], 45) == expected
+
+
+def test_genemaplib_select_diverse_indices_spreads_picks():
+	genemaplib = import_from_repo_path("problems/inheritance-problems/gene_mapping/genemaplib.py")
+	values = [0.0, 0.1, 0.12, 0.5, 0.9, 1.0]
+	# extremes first, then the value nearest the middle of the widest gap
+	assert genemaplib.select_diverse_indices(values, 3) == [0, 5, 3]
+	assert genemaplib.select_diverse_indices([0.3], 4) == [0]
+
+
+def test_genemaplib_three_point_scenarios_are_valid():
+	genemaplib = import_from_repo_path("problems/inheritance-problems/gene_mapping/genemaplib.py")
+	scenarios = genemaplib.get_three_point_scenarios(True, 40)
+	assert len(set(scenarios)) == len(scenarios)
+	assert all(genemaplib.is_valid_three_point_scenario(*scenario) for scenario in scenarios)
+
+
+def test_genemaplib_three_point_scenario_rejects_fractional_counts():
+	genemaplib = import_from_repo_path("problems/inheritance-problems/gene_mapping/genemaplib.py")
+	assert genemaplib.is_valid_three_point_scenario(10, 6, 15, 1000) is True
+	assert genemaplib.is_valid_three_point_scenario(10, 6, 15, 1010) is False
@@ -18,3 +18,15 @@ def test_tetradlib_all_ditypes_small():
 	tetradlib.debug = False
 	all_ditypes = tetradlib.get_all_ditype_tetrads("ab")
 	assert len(all_ditypes) == 2
+
+
+def test_tetradlib_count_arrays_match_scalar_counts():
+	tetradlib = import_from_repo_path("problems/inheritance-problems/gene_mapping/tetradlib.py")
+	tetradlib.debug = False
+	count_arrays = tetradlib.get_progeny_count_arrays([(6, 10, 15), (6, 10, 15)], [3000, 600])
+	progeny_dict = tetradlib.generate_progeny_counts("++c", "abc", (6, 10, 15), 3000, "abc")
+	count_keys = ("parentcount", "firstcount", "dcount1", "secondcount", "dcount2", "dcount3")
+	row_counts = [count_arrays[key][0] for key in count_keys]
+	assert row_counts == list(progeny_dict.values())
+	# 600 progeny gives too few double crossovers
+	assert count_arrays["valid"].tolist() == [True, False]
@@ -1,6 +1,8 @@
 
 import datetime
 
+import requests
+
 from lib_test_utils import import_from_repo_path
 
 
@@ -53,3 +55,46 @@ def test_restrictlib_uses_fresh_cached_web_data(monkeypatch, tmp_path):
 	monkeypatch.setattr(restrictlib, "fetch_web_data", fail_fetch)
 	data = restrictlib.get_web_data(enzyme_class)
 	assert data["Organism"] == "Escherichia coli RY13"
+
+
+def test_restrictlib_catalog_record_matches_enzyme_class():
+	restrictlib = import_from_repo_path(
+		"problems/molecular_biology-problems/restriction_enzymes/restrictlib.py"
+	)
+	record = restrictlib.enzyme_name_to_class("EcoRI")
+	assert restrictlib.format_enzyme(record) == "5'-G|AATTC-3'"
+	assert "EcoRI" in restrictlib.get_enzyme_names_by_overhang(record.overhang())
+
+
+def _rebase_stub_response(url):
+	# canned REBASE page; names starting with Missing answer 404
+	enzyme_name = url.rsplit("/", 1)[1]
+	response = requests.Response()
+	response.url = url
+	response.status_code = 404 if enzyme_name.startswith("Missing") else 200
+	response._content = f"<font><b>Organism: </b>{enzyme_name} cells<br/></font>".encode("ascii")
+	return response
+
+
+def test_restrictlib_refresh_fetches_stale_entries_and_skips_failures(monkeypatch, tmp_path):
+	restrictlib = import_from_repo_path(
+		"problems/molecular_biology-problems/restriction_enzymes/restrictlib.py"
+	)
+	row = restrictlib.enzyme_class_to_row(restrictlib.enzyme_name_to_class("EcoRI"))
+	enzyme_classes = [restrictlib.EnzymeRecord(dict(row, name=name, uri=f"https://rebase.invalid/{name}"))
+		for name in ("EcoRI", "MissingI", "HindIII")]
+	restrictlib.WEB_DATA_CACHE_PATH = str(tmp_path / "restriction_cache.yml")
+	restrictlib.WEB_DATA_CACHE = restrictlib._new_web_data_cache()
+	restrictlib._store_web_data(restrictlib.WEB_DATA_CACHE, "EcoRI", {"Organism": "cached"})
+	request_urls = []
+
+	def fake_get(url, timeout=None):
+		request_urls.append(url)
+		return _rebase_stub_response(url)
+
+	session = restrictlib.make_web_data_session(2)
+	monkeypatch.setattr(session, "get", fake_get)
+	monkeypatch.setattr(restrictlib, "make_web_data_session", lambda max_workers: session)
+	fetch_count = restrictlib.refresh_web_data(enzyme_classes, max_workers=2, request_delay=0)
+	assert sorted(request_urls) == ["https://rebase.invalid/HindIII", "https://rebase.invalid/MissingI"]
+	assert fetch_count == 1 and "HindIII cells" in (tmp_path / "restriction_cache.yml").read_text()
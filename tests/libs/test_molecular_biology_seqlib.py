@@ -1,4 +1,6 @@
 
+import pytest
+
 from lib_test_utils import import_from_repo_path
 
 
@@ -10,3 +12,38 @@ def test_seqlib_core_functions():
 	assert seqlib.insertCommas("ATGC", separate=2) == "AT,GC"
 	assert seqlib.transcribe("ATGC") == "AUGC"
 	assert seqlib.translate("AUGGCU") == "MA"
+
+
+def test_seqlib_make_sequence_passes_rules_with_primer_ends():
+	seqlib = import_from_repo_path("problems/molecular_biology-problems/seqlib.py")
+	seqlib.random.seed(36)
+	sequences = [seqlib.makeSequence(seqlen, primer_len=6) for seqlen in (12, 15, 36, 80)]
+	assert all(seqlib.is_good_sequence(seq) for seq in sequences)
+	assert all(len(set(seq[:6])) == 4 and len(set(seq[-6:])) == 4 for seq in sequences)
+
+
+def test_seqlib_make_sequence_batch_is_distinct():
+	seqlib = import_from_repo_path("problems/molecular_biology-problems/seqlib.py")
+	seqlib.random.seed(10)
+	sequences = seqlib.makeSequenceBatch(10, 50)
+	assert len(set(sequences)) == 50
+
+
+def test_seqlib_make_sequence_short_primer_ends():
+	seqlib = import_from_repo_path("problems/molecular_biology-problems/seqlib.py")
+	seqlib.random.seed(3)
+	sequences = seqlib.makeSequenceBatch(12, 3, primer_len=3)
+	assert all(len(set(seq[:3])) == 3 and len(set(seq[-3:])) == 3 for seq in sequences)
+
+
+def test_seqlib_make_sequence_rejects_primer_longer_than_sequence():
+	seqlib = import_from_repo_path("problems/molecular_biology-problems/seqlib.py")
+	with pytest.raises(ValueError):
+		seqlib.makeSequence(5, primer_len=6)
+
+
+def test_seqlib_rejection_fallback_gives_up_on_impossible_rules():
+	seqlib = import_from_repo_path("problems/molecular_biology-problems/seqlib.py")
+	# four bases cannot hold a four-base primer window at each end
+	with pytest.raises(ValueError):
+		seqlib._makeSequenceRejection(4, 4, max_tries=50)
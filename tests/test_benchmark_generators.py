@@ -0,0 +1,15 @@
+from lib_test_utils import import_from_repo_path
+
+
+def test_benchmark_generators_compare_flags_only_real_slowdowns():
+	bench = import_from_repo_path("tools/benchmark_generators.py")
+	base = {"commit": "a", "results": {
+		"x.py": {"import_seconds": 1.0, "seconds_per_question": 0.0001, "peak_rss_mb": 100.0},
+		"y.py": {"error": "exit 2"},
+	}}
+	new = {"commit": "b", "results": {
+		"x.py": {"import_seconds": 1.5, "seconds_per_question": 0.0003, "peak_rss_mb": 101.0},
+		"y.py": {"import_seconds": 9.0},
+	}}
+	# the per-question change is 3x but under the noise floor
+	assert bench.compare_results(base, new, 0.2) == [("x.py", "import_seconds", 1.0, 1.5)]
@@ -1,5 +1,6 @@
 
 import argparse
+import json
 import os
 import sys
 import tempfile
@@ -268,3 +269,46 @@ def test_applyReplacementRulesToList_replaces_and_validates():
 	except TypeError:
 		return
 	assert False, "expected TypeError for non-string list element"
+
+
+def test_collect_and_write_questions_profile_report(tmp_path):
+	args = argparse.Namespace(duplicates=6, max_questions=None, profile=True, cprofile=False)
+
+	calls = []
+
+	def write_question(N, args):
+		# three distinct questions, each returned twice
+		calls.append(N)
+		return f"FIB\tQuestion {len(calls) % 3}?\tanswer\n"
+
+	outfile = str(tmp_path / "bbq-profiled-questions.txt")
+	bptools.collect_and_write_questions(write_question, args, outfile)
+	with open(str(tmp_path / "bbq-profiled-questions.profile.json")) as f:
+		report = json.load(f)
+	assert report["counts"] == {"attempts": 6, "accepted": 3, "duplicates": 3}
+	assert report["duplicate_rate"] == 0.5
+
+
+def test_collect_questions_adaptive_stops_when_saturated():
+	args = argparse.Namespace(duplicates=1000, max_questions=None, adaptive=True, adaptive_threshold=0.02)
+	calls = []
+
+	def write_question(N, args):
+		# only five distinct questions exist
+		calls.append(N)
+		return f"FIB\tQuestion {len(calls) % 5}?\tanswer\n"
+
+	questions = bptools._collect_questions(write_question, args, print_histogram_flag=False)
+	assert len(questions) == 5
+	assert len(calls) < 100
+
+
+def test_collect_and_write_questions_output_format_qti12(tmp_path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	args = argparse.Namespace(duplicates=2, max_questions=None, output_format="qti12")
+
+	def write_question(N, args):
+		return f"FIB\tQuestion {N}?\tanswer\n"
+
+	bptools.collect_and_write_questions(write_question, args, "bbq-packaged-questions.txt")
+	assert sorted(os.listdir(tmp_path)) == ["qti12-packaged-questions.zip"]
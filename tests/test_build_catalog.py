@@ -0,0 +1,36 @@
+import os
+
+from lib_test_utils import import_from_repo_path
+
+
+def test_build_catalog_plans_only_changed_tasks():
+	builder = import_from_repo_path("tools/build_catalog.py")
+	task = builder.make_task("YMCS", "", "{bp_mcs}/biochemistry/enzyme_inhibitors.yml", "biochemistry/enzymes")
+	seed = builder.get_task_seed(task, 0)
+	manifest = {"version": builder.MANIFEST_VERSION, "entries": {
+		task["key"]: {"sha256": "old", "seed": seed, "returncode": 0},
+	}}
+	unchanged = builder.plan_tasks([task], {task["key"]: "old"}, manifest, 0)
+	changed = builder.plan_tasks([task], {task["key"]: "new"}, manifest, 0)
+	assert unchanged == []
+	assert changed[0]["script_rel_path"] == "problems/multiple_choice_statements/yaml_mc_statements_to_bbq.py"
+
+
+def test_build_catalog_data_hash_skips_generated_caches(monkeypatch, tmp_path):
+	builder = import_from_repo_path("tools/build_catalog.py")
+	(tmp_path / "data").mkdir()
+	(tmp_path / "data" / "molecules.yml").write_text("1: water\n")
+	monkeypatch.setattr(builder, "REPO_ROOT", str(tmp_path))
+	builder.get_data_hash.cache_clear()
+	before = builder.get_data_hash()
+	(tmp_path / "data" / "molecules.snapshot.json").write_text("{}\n")
+	(tmp_path / "data" / "molecules.journal.jsonl").write_text("{}\n")
+	builder.get_data_hash.cache_clear()
+	assert builder.get_data_hash() == before
+	builder.get_data_hash.cache_clear()
+
+
+def test_build_catalog_hashes_every_root_module():
+	builder = import_from_repo_path("tools/build_catalog.py")
+	root_names = [os.path.basename(path) for path in builder.get_root_modules()]
+	assert "table_curve_lib.py" in root_names and "webwork_lib.py" in root_names
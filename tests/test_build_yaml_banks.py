@@ -0,0 +1,44 @@
+from lib_test_utils import import_from_repo_path
+
+
+def test_build_yaml_banks_plans_only_changed_pairs():
+	builder = import_from_repo_path("tools/build_yaml_banks.py")
+	banks = [("problems/matching_sets", "problems/matching_sets/x/a.yml")]
+	converters = builder.BANK_ROOTS["problems/matching_sets"]
+	converter_versions = {f"problems/matching_sets/{name}": "v1" for name in converters}
+	manifest = {"version": builder.MANIFEST_VERSION, "entries": {}}
+	for name in converters:
+		manifest["entries"][f"problems/matching_sets/x/a.yml::{name}"] = {
+			"input_sha256": "old", "converter_sha256": "v1", "returncode": 0,
+		}
+	unchanged = builder.plan_jobs(banks, {"problems/matching_sets/x/a.yml": "old"}, converter_versions, manifest)
+	changed = builder.plan_jobs(banks, {"problems/matching_sets/x/a.yml": "new"}, converter_versions, manifest)
+	assert unchanged == []
+	assert len(changed) == len(converters)
+
+
+def test_build_yaml_banks_discovers_topic_banks_only():
+	builder = import_from_repo_path("tools/build_yaml_banks.py")
+	banks = builder.discover_banks(builder.REPO_ROOT)
+	yaml_paths = [yaml_rel_path for _, yaml_rel_path in banks]
+	assert "problems/matching_sets/TEMPLATE.yml" not in yaml_paths
+	assert "problems/matching_sets/biochemistry/catalytic_strategies.yml" in yaml_paths
+
+
+def test_build_yaml_banks_passes_output_dir_to_pgml_converter(monkeypatch, tmp_path):
+	builder = import_from_repo_path("tools/build_yaml_banks.py")
+	commands = []
+
+	def fake_run(command, **kwargs):
+		commands.append(command)
+		return builder.subprocess.CompletedProcess(command, 0, "", "")
+
+	monkeypatch.setattr(builder.subprocess, "run", fake_run)
+	job = {
+		"yaml_rel_path": "problems/multiple_choice_statements/cell_biology/fluid_mosaic_model.yml",
+		"converter_rel_path": "problems/multiple_choice_statements/yaml_mc_statements_to_pgml.py",
+		"input_sha256": "x", "converter_sha256": "y",
+	}
+	builder.run_job(job, builder.REPO_ROOT, str(tmp_path))
+	bank_output_dir = tmp_path / "problems/multiple_choice_statements/cell_biology/fluid_mosaic_model"
+	assert commands[0][-2:] == ["-d", str(bank_output_dir)]
@@ -0,0 +1,38 @@
+import bptools
+
+from lib_test_utils import import_from_repo_path
+
+
+def test_generator_daemon_seeded_requests_repeat():
+	daemon = import_from_repo_path("tools/generator_daemon.py")
+	request = {"script": "problems/biochemistry-problems/carbs/classify_Fischer.py", "count": 3, "seed": 11}
+	first = daemon.run_generator_request(request)
+	second = daemon.run_generator_request(request)
+	assert first["ok"] is True and len(first["files"]) == 1
+	assert first["files"] == second["files"]
+
+
+def test_generator_daemon_rejects_scripts_outside_repo():
+	daemon = import_from_repo_path("tools/generator_daemon.py")
+	reply = daemon.run_generator_request({"script": "../outside.py"})
+	assert reply["ok"] is False and "not a generator script" in reply["error"]
+
+
+def test_generator_daemon_returns_packages_and_resets_format():
+	daemon = import_from_repo_path("tools/generator_daemon.py")
+	script = "problems/biochemistry-problems/carbs/classify_Fischer.py"
+	package_reply = daemon.run_generator_request(
+		{"script": script, "args": ["--output-format", "qti12"], "count": 2, "seed": 5})
+	bbq_reply = daemon.run_generator_request({"script": script, "count": 2, "seed": 5})
+	package_names = list(package_reply["binary_files"])
+	assert len(package_names) == 1 and package_names[0].startswith("qti12-") and package_reply["files"] == {}
+	assert all(name.startswith("bbq-") for name in bbq_reply["files"]) and bbq_reply["binary_files"] == {}
+
+
+def test_generator_daemon_resets_profile_and_format():
+	daemon = import_from_repo_path("tools/generator_daemon.py")
+	# left over by a run that stopped between argument parsing and writing
+	bptools._active_profile = object()
+	bptools._output_format = "qti12"
+	daemon._reset_bptools_state()
+	assert bptools._active_profile is None and bptools._output_format == "bbq"
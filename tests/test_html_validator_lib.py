@@ -0,0 +1,27 @@
+import lxml.etree
+import pytest
+
+import html_validator_lib
+
+
+def test_html_validator_lib_batch_locates_bad_fragment():
+	fragments = [
+		"<p>This is&nbsp;a<br/>paragraph.</p>",
+		"<td colspan=2>x</td>",
+		"<p>This is a paragraph.</html>",
+		"<p>This is&nbsp;a<br/>paragraph.</p>",
+	]
+	errors = html_validator_lib.validate_html_batch(fragments)
+	assert errors[0] is None and errors[1] is None and errors[3] is None
+	assert errors[2].startswith("line 1, column 31: Opening and ending tag mismatch")
+
+
+def test_html_validator_lib_caches_only_valid_fragments(monkeypatch):
+	html_validator_lib.clear_cache()
+	assert html_validator_lib.validate_html("<b>cached</b>") is True
+	# a cache hit must not need the parser at all
+	monkeypatch.setattr(html_validator_lib.lxml.etree, "fromstring", None)
+	assert html_validator_lib.validate_html("<b>cached</b>") is True
+	monkeypatch.undo()
+	with pytest.raises(lxml.etree.XMLSyntaxError):
+		html_validator_lib.validate_html("<span style='no closing quote>text</span>")
@@ -0,0 +1,20 @@
+import zipfile
+
+import lxml.etree
+from qti_package_maker.assessment_items import item_bank
+from qti_package_maker.assessment_items import item_types
+
+import question_package_lib
+
+
+def test_write_qti12_package_streams_items(tmp_path):
+	package_item_bank = item_bank.ItemBank(allow_mixed=True)
+	package_item_bank.add_item_cls(item_types.MC("<p>Which is a base?</p>", ["adenine", "ribose"], "adenine"))
+	package_item_bank.add_item_cls(item_types.FIB("<p>DNA has a double ____.</p>", ["helix"]))
+	outfile = str(tmp_path / "qti12-test.zip")
+	item_count = question_package_lib.write_qti12_package(package_item_bank, "test", outfile)
+	with zipfile.ZipFile(outfile) as zip_file:
+		root = lxml.etree.fromstring(zip_file.read(question_package_lib.QTI12_ITEMS_PATH))
+		names = set(zip_file.namelist())
+	assert item_count == 2 and len(root.findall(".//{*}item")) == 2
+	assert names == {question_package_lib.QTI12_ITEMS_PATH, question_package_lib.QTI12_META_PATH, "imsmanifest.xml"}
@@ -0,0 +1,87 @@
+import html.parser
+
+import table_image_raster_lib
+
+
+class _GridDecoder(html.parser.HTMLParser):
+	"""Expand colspan/rowspan back into one background per table slot."""
+
+	def __init__(self):
+		super().__init__()
+		self.rows = []
+		self.pending = {}
+
+	def handle_starttag(self, tag, attrs):
+		if tag == "tr":
+			self.rows.append([])
+			return
+		if tag != "td":
+			return
+		row = self.rows[-1]
+		row_idx = len(self.rows) - 1
+		# skip slots owned by a rowspan from an earlier row
+		while (row_idx, len(row)) in self.pending:
+			row.append(self.pending.pop((row_idx, len(row))))
+		attr_map = dict(attrs)
+		style = attr_map.get("style") or ""
+		bg = style.split("background:")[1] if "background:" in style else None
+		colspan = int(attr_map.get("colspan", 1))
+		rowspan = int(attr_map.get("rowspan", 1))
+		for col_idx in range(len(row), len(row) + colspan):
+			for below in range(1, rowspan):
+				self.pending[(row_idx + below, col_idx)] = bg
+			row.append(bg)
+
+	def handle_endtag(self, tag):
+		if tag == "tr":
+			row = self.rows[-1]
+			row_idx = len(self.rows) - 1
+			while (row_idx, len(row)) in self.pending:
+				row.append(self.pending.pop((row_idx, len(row))))
+
+
+def _decode(html_text):
+	decoder = _GridDecoder()
+	decoder.feed(html_text)
+	return decoder.rows
+
+
+def _make_chart():
+	chart = table_image_raster_lib.TableImageRaster((0, 10), (0, 10), 41, 31, cell_px=4)
+	points = [(x / 20, (x / 20) ** 2 / 10) for x in range(201)]
+	chart.plot_curve(points, antialiased=True)
+	chart.add_crosshair(5, 2.5)
+	chart.add_dot(5, 2.5)
+	chart.add_right_label(2.5, "K<sub>m</sub>")
+	chart.set_y_tick_interval(2)
+	chart.set_x_tick_values([0, 5, 10])
+	chart.set_x_axis_title("[S]")
+	return chart
+
+
+def test_to_html_merged_output_matches_cell_grid():
+	chart = _make_chart()
+	cells_html = chart.to_html(merge="cells")
+	for merge in ("runs", "blocks"):
+		merged_html = chart.to_html(merge=merge)
+		assert _decode(merged_html) == _decode(cells_html)
+		assert len(merged_html) < len(cells_html)
+
+
+def test_plot_curve_joins_control_points():
+	chart = table_image_raster_lib.TableImageRaster((0, 10), (0, 10), 11, 11, cell_px=4)
+	chart.plot_curve([(0, 0), (10, 5)])
+	grid = chart._color_grid()
+	# a two-point line still marks exactly one cell in every column
+	column_counts = [sum(row[col] is not None for row in grid) for col in range(11)]
+	assert column_counts == [1] * 11
+	assert grid[-1][0] == chart.color_curve and grid[5][10] == chart.color_curve
+
+
+def test_plot_curve_clips_far_points_to_grid():
+	chart = table_image_raster_lib.TableImageRaster((0, 100), (0, 100), 100, 100, cell_px=4)
+	# an asymptote-style spike used to step all 5e7 cells of the segment
+	chart.plot_curve([(1, 1), (2, 5e7), (3, 2)])
+	grid = chart._color_grid()
+	painted = [(row, col) for row in range(100) for col in range(100) if grid[row][col] is not None]
+	assert chart.color_curve in grid[0] and len(painted) < 300
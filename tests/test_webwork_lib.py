@@ -144,6 +144,21 @@ def test_extract_strict_color_spans_preserves_entities():
 	assert segments[0] == (True, "H<sub>0</sub>", "#e65400", False)
 
 
+def test_extract_strict_color_spans_strong_and_nesting():
+	# outer strong wrappers mark the span bold and keep inner spacing
+	segments = webwork_lib.extract_strict_color_spans(
+		"a <strong> <span style=\"color: red;\">b</span> </strong>c"
+	)
+	assert segments == [(False, "a  ", None, False), (True, "b", "red", True), (False, "c", None, False)]
+	# a half-open strong wrapper or a nested span is not strict
+	assert webwork_lib.extract_strict_color_spans(
+		"<strong><span style=\"color: red;\">b</span>"
+	) is None
+	assert webwork_lib.extract_strict_color_spans(
+		"<span style=\"color: red;\"><span>b</span>"
+	) is None
+
+
 def test_escape_html_preserving_entities():
 	# preserves named HTML entities
 	assert webwork_lib.escape_html_preserving_entities("&Delta;G") == "&Delta;G"
@@ -0,0 +1,27 @@
+import pytest
+import yaml
+
+import yaml_cache_lib
+
+
+def test_yaml_cache_lib_rejects_duplicate_keys():
+	raw_text = "matching pairs:\n  a: 1\n  a: 2\n"
+	with pytest.raises(yaml.constructor.ConstructorError, match="duplicate key"):
+		yaml_cache_lib.load_yaml_text(raw_text, use_cache=False)
+
+
+def test_yaml_cache_lib_serves_repeat_parses_from_cache(monkeypatch, tmp_path):
+	monkeypatch.setattr(yaml_cache_lib, "YAML_CACHE_DIR", str(tmp_path))
+	raw_text = "topic: enzymes\nstatements:\n  - one\n  - two\n"
+	first = yaml_cache_lib.load_yaml_documents(raw_text)
+	# a cache hit must not need the parser at all
+	monkeypatch.setattr(yaml_cache_lib.yaml, "load_all", None)
+	assert yaml_cache_lib.load_yaml_documents(raw_text) == first
+	assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_yaml_cache_lib_string_keys_rejects_int_keys():
+	raw_text = "1: alpha\n2: beta\n"
+	assert yaml_cache_lib.load_yaml_text(raw_text, use_cache=False) == {1: "alpha", 2: "beta"}
+	with pytest.raises(TypeError, match="must be a string"):
+		yaml_cache_lib.load_yaml_text(raw_text, use_cache=False, string_keys=True)
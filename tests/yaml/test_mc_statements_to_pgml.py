@@ -26,3 +26,38 @@ def test_yaml_mc_statements_to_pgml_header():
 	assert "## DBsubject(" in pgml_text
 	assert "DOCUMENT();" in pgml_text
 	assert "PGcourse.pl" in pgml_text
+
+
+#============================================
+def test_yaml_mc_statements_to_pgml_bulk_conversion(tmp_path, monkeypatch):
+	"""
+	Convert a directory of banks in one call and record failing banks.
+	"""
+	module = lib_test_utils.import_from_repo_path(
+		"problems/multiple_choice_statements/yaml_mc_statements_to_pgml.py"
+	)
+	monkeypatch.setattr(module.yaml_cache_lib, "YAML_CACHE_DIR", str(tmp_path / "cache"))
+	bank_dir = tmp_path / "banks"
+	bank_dir.mkdir()
+	(bank_dir / "good.yml").write_text(
+		"topic: cell division\n"
+		"true_statements:\n  truth1a: Mitosis makes two cells.\n"
+		"false_statements:\n  false1a: Mitosis makes four cells.\n"
+	)
+	(bank_dir / "no_topic.yml").write_text(
+		"topic:\ntrue_statements:\n  truth1a: Mitosis makes two cells.\n"
+	)
+	# a duplicate key and a syntax error are YAML errors, not content errors
+	(bank_dir / "duplicate_key.yml").write_text(
+		"topic: cell division\ntopic: mitosis\n"
+	)
+	(bank_dir / "broken_syntax.yml").write_text(
+		"topic: [cell division\n"
+	)
+	output_dir = tmp_path / "out"
+	output_dir.mkdir()
+	yaml_paths = module.webwork_lib.expand_yaml_paths([str(bank_dir)])
+	convert_file = lambda path: module.convert_yaml_file(path, output_dir=str(output_dir))
+	results = module.webwork_lib.convert_yaml_files(yaml_paths, convert_file, jobs=1)
+	assert [result["error"] is None for result in results] == [False, False, True, False]
+	assert (output_dir / "good.pgml").read_text().startswith("## TITLE(")
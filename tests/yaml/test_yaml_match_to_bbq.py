@@ -1,5 +1,7 @@
 import random
 
+from qti_package_maker.assessment_items import item_types
+
 from lib_test_utils import import_from_repo_path
 
 
@@ -26,3 +28,13 @@ def test_yaml_match_to_bbq_builds_questions():
 	assert len(questions) > 0
 	assert questions[0].startswith("MAT\t")
 	assert "Match each of the following" in questions[0]
+
+
+def test_get_content_key_ignores_pair_order():
+	mod = import_from_repo_path("problems/matching_sets/yaml_match_to_bbq.py")
+	question = "<p>Match each letter with its name.</p>"
+	item_a = item_types.MATCH(question, ["A", "B"], ["alpha", "beta"])
+	item_b = item_types.MATCH(question, ["B", "A"], ["beta", "alpha"])
+	item_c = item_types.MATCH(question, ["A", "B"], ["beta", "alpha"])
+	assert mod.get_content_key(item_a) == mod.get_content_key(item_b)
+	assert mod.get_content_key(item_a) != mod.get_content_key(item_c)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark webwork_lib strict color span extraction on the matching-set banks.
+
+Every string in every matching-set YAML bank is run through the replacement
+rules the PGML converter applies, then parsed by the current
+extract_strict_color_span(s) and by the earlier regex-per-step versions kept
+below as a reference. Results must be identical; timings are the best of
+several passes.
+"""
+
+# Standard Library
+import os
+import re
+import sys
+import time
+import argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# local repo modules
+import webwork_lib
+import yaml_cache_lib
+
+def legacy_extract_strict_color_span(text_string):
+	"""
+	Pre-tokenizer extract_strict_color_span(), kept as the reference.
+
+	Returns (prefix, inner_text, suffix, color_value, is_bold) or None.
+	"""
+	if text_string is None:
+		return None
+	if not isinstance(text_string, str):
+		raise TypeError(f"value is not string: {text_string}")
+	span_match = re.search(r'<span\b[^>]*>.*?</span>', text_string,
+		flags=re.IGNORECASE | re.DOTALL)
+	if span_match is None:
+		return None
+	if re.search(r'<span\b[^>]*>.*?</span>.*<span\b', text_string,
+		flags=re.IGNORECASE | re.DOTALL):
+		return None
+	prefix = text_string[:span_match.start()]
+	suffix = text_string[span_match.end():]
+	span_block = span_match.group(0)
+
+	is_bold = False
+	# capture whitespace between <strong> and <span> to preserve spacing
+	strong_prefix = re.search(r'<strong>(\s*)$', prefix, flags=re.IGNORECASE)
+	strong_suffix = re.search(r'^\s*</strong>', suffix, flags=re.IGNORECASE)
+	if strong_prefix and strong_suffix:
+		is_bold = True
+		prefix = prefix[:strong_prefix.start()] + strong_prefix.group(1)
+		suffix = suffix[strong_suffix.end():]
+
+	attr_match = re.search(r'<span\b([^>]*)>', span_block, flags=re.IGNORECASE)
+	if attr_match is None:
+		return None
+	attrs = attr_match.group(1)
+	style_match = re.search(
+		r'style\s*=\s*(?P<quote>[\"\'])(?P<style>.*?)(?P=quote)',
+		attrs,
+		flags=re.IGNORECASE | re.DOTALL,
+	)
+	if style_match is None:
+		style_match = re.search(
+			r'style\s*=\s*([^>]+)$',
+			attrs,
+			flags=re.IGNORECASE | re.DOTALL,
+		)
+	if style_match is None:
+		return None
+	style_text = style_match.groupdict().get("style") or style_match.group(1)
+	style_text = style_text.strip()
+	style_text = style_text.rstrip(";")
+	if not style_text:
+		return None
+	parts = [part.strip() for part in style_text.split(";") if part.strip()]
+	if len(parts) != 1:
+		return None
+	if ":" not in parts[0]:
+		return None
+	prop, value = parts[0].split(":", 1)
+	if prop.strip().lower() != "color":
+		return None
+	color_value = value.strip()
+	if not color_value:
+		return None
+
+	inner = re.sub(r'^<span\b[^>]*>', '', span_block, flags=re.IGNORECASE)
+	inner = re.sub(r'</span>\s*$', '', inner, flags=re.IGNORECASE)
+
+	inner_strong = re.fullmatch(
+		r'\s*<strong>(.*?)</strong>\s*',
+		inner,
+		flags=re.IGNORECASE | re.DOTALL,
+	)
+	if inner_strong is not None:
+		is_bold = True
+		inner = inner_strong.group(1)
+
+	inner = webwork_lib.normalize_nbsp(inner)
+	# reject inner text with HTML tags other than sub/sup
+	cleaned = re.sub(r'</?(?:su[bp])>', '', inner)
+	if re.search(r'<[^>]+>', cleaned):
+		return None
+
+	return prefix, inner, suffix, color_value, is_bold
+
+#============================================
+def legacy_extract_strict_color_spans(text_string):
+	"""
+	Pre-tokenizer extract_strict_color_spans(), kept as the reference.
+
+	Returns a list of segments [(is_span, text, color_value, is_bold), ...],
+	an empty list when no spans exist, or None if a span is not strict.
+	"""
+	if text_string is None:
+		return []
+	if not isinstance(text_string, str):
+		raise TypeError(f"value is not string: {text_string}")
+	span_matches = list(re.finditer(
+		r'<span\b[^>]*>.*?</span>',
+		text_string,
+		flags=re.IGNORECASE | re.DOTALL
+	))
+	if len(span_matches) == 0:
+		return []
+	segments = []
+	pos = 0
+	for span_match in span_matches:
+		prefix = text_string[pos:span_match.start()]
+		suffix = text_string[span_match.end():]
+
+		is_bold = False
+		# capture whitespace between <strong> and <span> to preserve spacing
+		strong_prefix = re.search(r'<strong>(\s*)$', prefix, flags=re.IGNORECASE)
+		strong_suffix = re.search(r'^\s*</strong>', suffix, flags=re.IGNORECASE)
+		if strong_prefix and strong_suffix:
+			is_bold = True
+			prefix = prefix[:strong_prefix.start()] + strong_prefix.group(1)
+			pos = span_match.end() + strong_suffix.end()
+		elif strong_prefix or strong_suffix:
+			return None
+		else:
+			pos = span_match.end()
+
+		if prefix:
+			segments.append((False, prefix, None, False))
+
+		span_block = span_match.group(0)
+		if re.search(r'<span\b', span_block[len('<span'):], flags=re.IGNORECASE):
+			return None
+
+		attr_match = re.search(r'<span\b([^>]*)>', span_block, flags=re.IGNORECASE)
+		if attr_match is None:
+			return None
+		attrs = attr_match.group(1)
+		style_match = re.search(
+			r'style\s*=\s*(?P<quote>[\"\'])(?P<style>.*?)(?P=quote)',
+			attrs,
+			flags=re.IGNORECASE | re.DOTALL,
+		)
+		if style_match is None:
+			style_match = re.search(
+				r'style\s*=\s*([^>]+)$',
+				attrs,
+				flags=re.IGNORECASE | re.DOTALL,
+			)
+		if style_match is None:
+			return None
+		style_text = style_match.groupdict().get("style") or style_match.group(1)
+		style_text = style_text.strip()
+		style_text = style_text.rstrip(";")
+		if not style_text:
+			return None
+		parts = [part.strip() for part in style_text.split(";") if part.strip()]
+		if len(parts) != 1:
+			return None
+		if ":" not in parts[0]:
+			return None
+		prop, value = parts[0].split(":", 1)
+		if prop.strip().lower() != "color":
+			return None
+		color_value = value.strip()
+		if not color_value:
+			return None
+
+		inner = re.sub(r'^<span\b[^>]*>', '', span_block, flags=re.IGNORECASE)
+		inner = re.sub(r'</span>\s*$', '', inner, flags=re.IGNORECASE)
+		inner_strong = re.fullmatch(
+			r'\s*<strong>(.*?)</strong>\s*',
+			inner,
+			flags=re.IGNORECASE | re.DOTALL,
+		)
+		if inner_strong is not None:
+			is_bold = True
+			inner = inner_strong.group(1)
+
+		inner = webwork_lib.normalize_nbsp(inner)
+		# reject inner text with HTML tags other than sub/sup
+		cleaned = re.sub(r'</?(?:su[bp])>', '', inner)
+		if re.search(r'<[^>]+>', cleaned):
+			return None
+
+		segments.append((True, inner, color_value, is_bold))
+
+	if pos < len(text_string):
+		segments.append((False, text_string[pos:], None, False))
+
+	return segments
+
+#============================================
+def collect_strings(value) -> list:
+	"""
+	Collect every string key and value in a parsed YAML document.
+	"""
+	if isinstance(value, str):
+		return [value]
+	strings = []
+	if isinstance(value, dict):
+		for key, item in value.items():
+			strings.extend(collect_strings(key))
+			strings.extend(collect_strings(item))
+	elif isinstance(value, list):
+		for item in value:
+			strings.extend(collect_strings(item))
+	return strings
+
+#============================================
+def load_bank_texts(bank_dir: str) -> list:
+	"""
+	Load the replaced label texts the PGML converter would parse.
+	"""
+	texts = []
+	for dir_path, dir_names, file_names in os.walk(bank_dir):
+		dir_names.sort()
+		for file_name in sorted(file_names):
+			if not file_name.endswith('.yml'):
+				continue
+			yaml_data = yaml_cache_lib.read_yaml_file(os.path.join(dir_path, file_name))
+			if not isinstance(yaml_data, dict):
+				continue
+			replacement_rules = webwork_lib.normalize_replacement_rules(yaml_data.get('replacement_rules'))
+			replacement_pairs = webwork_lib.build_replacement_pairs(replacement_rules)
+			for text in collect_strings(yaml_data):
+				texts.append(text)
+				texts.append(webwork_lib.apply_replacement_pairs_to_text(text, replacement_pairs))
+	return texts
+
+#============================================
+def time_function(function, texts: list, passes: int) -> float:
+	"""
+	Return the best wall time in seconds of running function over texts.
+	"""
+	best = None
+	for _ in range(passes):
+		t0 = time.perf_counter()
+		for text in texts:
+			function(text)
+		elapsed = time.perf_counter() - t0
+		if best is None or elapsed < best:
+			best = elapsed
+	return best
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(description="Benchmark strict color span extraction.")
+	parser.add_argument(
+		'-d', '--bank-dir', dest='bank_dir',
+		default=os.path.join(REPO_ROOT, 'problems', 'matching_sets'),
+		help='Directory searched for matching-set YAML banks.',
+	)
+	parser.add_argument(
+		'-p', '--passes', dest='passes', type=int, default=5,
+		help='Timed passes per function, the best one is reported.',
+	)
+	args = parser.parse_args()
+	return args
+
+#============================================
+def main():
+	args = parse_args()
+	texts = load_bank_texts(args.bank_dir)
+	print(f'{len(texts)} label texts')
+	function_pairs = (
+		('extract_strict_color_span', legacy_extract_strict_color_span,
+			webwork_lib.extract_strict_color_span),
+		('extract_strict_color_spans', legacy_extract_strict_color_spans,
+			webwork_lib.extract_strict_color_spans),
+	)
+	mismatch_count = 0
+	for name, legacy_function, current_function in function_pairs:
+		mismatches = [text for text in texts if legacy_function(text) != current_function(text)]
+		mismatch_count += len(mismatches)
+		legacy_seconds = time_function(legacy_function, texts, args.passes)
+		current_seconds = time_function(current_function, texts, args.passes)
+		speedup = legacy_seconds / current_seconds
+		print(f'{name}: legacy {legacy_seconds * 1000:.1f} ms, current {current_seconds * 1000:.1f} ms, '
+			f'{speedup:.1f}x faster, {len(mismatches)} mismatches')
+		for text in mismatches[:5]:
+			print(f'  MISMATCH: {text!r}')
+	if mismatch_count > 0:
+		sys.exit(1)
+
+#============================================
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark question generators and compare results between commits.
+
+Each generator runs in a fresh interpreter with a fixed seed. The script
+module is imported once and timed, then run as __main__ with --profile so
+bptools reports the first write_question() call, the later calls and the
+peak resident memory. Results are stored as JSON named after the git
+commit, and --compare flags metrics that got worse beyond a threshold.
+"""
+
+# Standard Library
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+import tempfile
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+	sys.path.insert(0, REPO_ROOT)
+
+# local repo modules
+import topic_classifier.script_runner_lib as script_runner
+
+# bump when result keys change
+RESULTS_VERSION = 1
+
+# first line of the benchmark child output that carries the import time
+IMPORT_MARKER = 'BENCHMARK_IMPORT_SECONDS'
+
+# seeds, imports the script module, then runs it like `python script.py`
+BENCHMARK_CODE = (
+	'import os, sys, time, random, runpy; '
+	'seed = int(sys.argv[1]); '
+	'sys.argv = sys.argv[2:]; '
+	'sys.path.insert(0, os.path.dirname(sys.argv[0])); '
+	'random.seed(seed); '
+	't0 = time.perf_counter(); '
+	'runpy.run_path(sys.argv[0], run_name="generator_benchmark"); '
+	f'print("{IMPORT_MARKER}", time.perf_counter() - t0, flush=True); '
+	'random.seed(seed); '
+	'runpy.run_path(sys.argv[0], run_name="__main__")'
+)
+
+# metrics compared by --compare, all lower is better
+COMPARED_METRICS = ('import_seconds', 'first_question_seconds', 'seconds_per_question', 'peak_rss_mb')
+# ignore changes smaller than this, timer noise on fast generators
+MIN_ABSOLUTE_CHANGE = {
+	'import_seconds': 0.05,
+	'first_question_seconds': 0.01,
+	'seconds_per_question': 0.001,
+	'peak_rss_mb': 5.0,
+}
+
+#============================================
+def get_git_commit() -> str:
+	"""
+	Short commit id of HEAD, with '-dirty' when tracked files changed.
+	"""
+	commit = subprocess.run(['git', 'rev-parse', '--short=12', 'HEAD'], cwd=REPO_ROOT,
+		capture_output=True, text=True, check=True).stdout.strip()
+	status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+		capture_output=True, text=True, check=True).stdout.strip()
+	if status:
+		commit += '-dirty'
+	return commit
+
+#============================================
+def summarize_profile(report: dict, import_seconds: float) -> dict:
+	"""
+	Turn a bptools --profile report into benchmark metrics.
+
+	Args:
+		report (dict): parsed bbq-*.profile.json.
+		import_seconds (float): time to import the script module.
+
+	Returns:
+		dict: import, first-question and per-question times, rate and memory.
+	"""
+	phase = 'write_question' if 'write_question' in report['phase_seconds'] else 'write_question_batch'
+	total_seconds = report['phase_seconds'].get(phase, 0.0)
+	first_seconds = report['first_call_seconds'].get(phase, 0.0)
+	attempts = report['counts'].get('attempts', 0)
+	# steady state leaves out the first call and its lazy loading
+	steady_seconds = total_seconds - first_seconds
+	seconds_per_question = None
+	questions_per_second = None
+	if attempts > 1 and steady_seconds > 0:
+		seconds_per_question = steady_seconds / (attempts - 1)
+		questions_per_second = (attempts - 1) / steady_seconds
+	result = {
+		'import_seconds': round(import_seconds, 4),
+		'first_question_seconds': round(first_seconds, 6),
+		'seconds_per_question': None if seconds_per_question is None else round(seconds_per_question, 6),
+		'questions_per_second': None if questions_per_second is None else round(questions_per_second, 1),
+		'attempts': attempts,
+		'accepted': report['counts'].get('accepted', 0),
+		'peak_rss_mb': report['peak_rss_mb'],
+	}
+	return result
+
+#============================================
+def benchmark_script(script_rel_path: str, questions: int, seed: int, timeout: float) -> dict:
+	"""
+	Run one generator for a number of attempts and collect its metrics.
+
+	Returns:
+		dict: metrics from summarize_profile(), or an 'error' entry.
+	"""
+	env = dict(os.environ)
+	env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, env.get('PYTHONPATH')]))
+	command = [
+		sys.executable, '-c', BENCHMARK_CODE, str(seed),
+		os.path.join(REPO_ROOT, script_rel_path),
+		'-d', str(questions), '-x', str(questions), '--profile',
+	]
+	with tempfile.TemporaryDirectory() as work_dir:
+		try:
+			result = subprocess.run(command, cwd=work_dir, env=env, capture_output=True,
+				text=True, timeout=timeout)
+		except subprocess.TimeoutExpired:
+			return {'error': f'timed out after {timeout} seconds'}
+		if result.returncode != 0:
+			last_line = (result.stderr.strip().splitlines() or ['no output'])[-1]
+			return {'error': f'exit {result.returncode}: {last_line}'}
+		import_seconds = None
+		for line in result.stdout.splitlines():
+			if line.startswith(IMPORT_MARKER):
+				import_seconds = float(line.split()[1])
+				break
+		report_paths = glob.glob(os.path.join(work_dir, 'bbq-*.profile.json'))
+		if import_seconds is None or len(report_paths) == 0:
+			return {'error': 'no --profile report, generator does not use bptools collection'}
+		with open(report_paths[0], 'r', encoding='ascii') as f:
+			report = json.load(f)
+	return summarize_profile(report, import_seconds)
+
+#============================================
+def run_benchmarks(scripts: list, questions: int, seed: int, timeout: float) -> dict:
+	"""
+	Benchmark scripts one after another, so runs do not compete for CPU.
+	"""
+	results = {}
+	for index, script_rel_path in enumerate(scripts, start=1):
+		t0 = time.time()
+		results[script_rel_path] = benchmark_script(script_rel_path, questions, seed, timeout)
+		status = results[script_rel_path].get('error', 'ok')
+		print(f'[{index}/{len(scripts)}] {script_rel_path}: {status} ({time.time() - t0:.1f} s)')
+	return results
+
+#============================================
+def compare_results(base: dict, new: dict, threshold: float) -> list:
+	"""
+	List metrics that got worse by more than threshold, as a fraction.
+
+	Changes below MIN_ABSOLUTE_CHANGE are ignored as noise.
+
+	Returns:
+		list: (script, metric, base_value, new_value) tuples.
+	"""
+	regressions = []
+	for script_rel_path, new_metrics in sorted(new['results'].items()):
+		base_metrics = base['results'].get(script_rel_path)
+		if base_metrics is None or 'error' in base_metrics or 'error' in new_metrics:
+			continue
+		for metric in COMPARED_METRICS:
+			base_value = base_metrics.get(metric)
+			new_value = new_metrics.get(metric)
+			if base_value is None or new_value is None:
+				continue
+			if new_value - base_value < MIN_ABSOLUTE_CHANGE[metric]:
+				continue
+			if new_value > base_value * (1 + threshold):
+				regressions.append((script_rel_path, metric, base_value, new_value))
+	return regressions
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(description="Benchmark generators and compare commits.")
+	parser.add_argument(
+		'-s', '--scripts', dest='scripts', nargs='+', default=None,
+		help='Generator paths relative to the repo root; defaults to every discovered generator.',
+	)
+	parser.add_argument(
+		'-n', '--questions', dest='questions', type=int, default=20,
+		help='write_question() attempts per generator.',
+	)
+	parser.add_argument(
+		'-r', '--seed', dest='seed', type=int, default=0,
+		help='Random seed given to every generator.',
+	)
+	parser.add_argument(
+		'-T', '--timeout', dest='timeout', type=float, default=300,
+		help='Seconds before a single generator run is stopped.',
+	)
+	parser.add_argument(
+		'-o', '--output-dir', dest='output_dir', default='benchmark_results',
+		help='Directory for the <commit>.json result files.',
+	)
+	parser.add_argument(
+		'-c', '--compare', dest='compare_files', nargs=2, default=None,
+		metavar=('BASE_JSON', 'NEW_JSON'),
+		help='Compare two result files instead of running benchmarks.',
+	)
+	parser.add_argument(
+		'-t', '--threshold', dest='threshold', type=float, default=0.2,
+		help='Fractional slowdown reported as a regression by --compare.',
+	)
+	args = parser.parse_args()
+	return args
+
+#============================================
+def main():
+	args = parse_args()
+	if args.compare_files is not None:
+		with open(args.compare_files[0], 'r', encoding='ascii') as f:
+			base = json.load(f)
+		with open(args.compare_files[1], 'r', encoding='ascii') as f:
+			new = json.load(f)
+		regressions = compare_results(base, new, args.threshold)
+		for script_rel_path, metric, base_value, new_value in regressions:
+			print(f'REGRESSION: {script_rel_path} {metric} {base_value} -> {new_value}')
+		print(f"{len(regressions)} regressions between {base['commit']} and {new['commit']}")
+		if len(regressions) > 0:
+			sys.exit(1)
+		return
+
+	scripts = args.scripts
+	if scripts is None:
+		scripts = script_runner.discover_generator_scripts(REPO_ROOT)
+	commit = get_git_commit()
+	results = run_benchmarks(scripts, args.questions, args.seed, args.timeout)
+	output = {
+		'version': RESULTS_VERSION,
+		'commit': commit,
+		'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+		'python': sys.version.split()[0],
+		'questions': args.questions,
+		'seed': args.seed,
+		'results': results,
+	}
+	os.makedirs(args.output_dir, exist_ok=True)
+	output_path = os.path.join(args.output_dir, f'{commit}.json')
+	with open(output_path, 'w', encoding='ascii') as f:
+		json.dump(output, f, indent=1, sort_keys=True)
+		f.write('\n')
+	print(f'wrote {output_path}')
+
+#============================================
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+# measured in a fresh interpreter so earlier imports do not hide the cost
+TIMING_CODE = """
+import sys
+import time
+sys.path.insert(0, {repo_root!r})
+sys.path.insert(0, {module_dir!r})
+start = time.perf_counter()
+import {module_name}
+elapsed = time.perf_counter() - start
+print(elapsed, 'scipy' in sys.modules)
+"""
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(
+		description="Measure cold import time of repository library modules."
+	)
+	parser.add_argument(
+		'-i', '--input', dest='input_files', nargs='+', required=True,
+		help="Library .py files to import."
+	)
+	parser.add_argument(
+		'-r', '--repeats', dest='repeats', type=int, default=5,
+		help="Fresh interpreter runs per module."
+	)
+	args = parser.parse_args()
+	return args
+
+#============================================
+def time_module_import(module_path: str, repo_root: str) -> tuple:
+	"""
+	Import one module in a fresh interpreter and time it.
+
+	Args:
+		module_path (str): path to the module .py file.
+		repo_root (str): repository root added to sys.path for bptools.
+
+	Returns:
+		tuple: (seconds, scipy_loaded) for the single run.
+	"""
+	module_dir = os.path.dirname(os.path.abspath(module_path))
+	module_name = os.path.splitext(os.path.basename(module_path))[0]
+	code = TIMING_CODE.format(
+		repo_root=repo_root,
+		module_dir=module_dir,
+		module_name=module_name,
+	)
+	result = subprocess.run(
+		[sys.executable, '-c', code],
+		capture_output=True, text=True, check=True,
+	)
+	# the module may print on import, the timing is the last line
+	seconds_text, scipy_text = result.stdout.strip().splitlines()[-1].split()
+	return float(seconds_text), scipy_text == 'True'
+
+#============================================
+def main():
+	args = parse_args()
+	repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+	for module_path in args.input_files:
+		timings = []
+		scipy_loaded = False
+		for _ in range(args.repeats):
+			seconds, scipy_loaded = time_module_import(module_path, repo_root)
+			timings.append(seconds)
+		median_ms = statistics.median(timings) * 1000
+		print(f"{module_path}: median {median_ms:.1f} ms over {args.repeats} runs, scipy loaded: {scipy_loaded}")
+
+#============================================
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""
+Measure TableImageRaster.to_html() size and time for each merge mode.
+
+Builds a few representative charts (the high-resolution titration curve
+titration_pI.py used to draw, its original low-resolution version, and a
+Michaelis-Menten curve) and reports HTML bytes and encode time for the
+'cells', 'runs' and 'blocks' encodings.
+"""
+
+# Standard Library
+import os
+import sys
+import time
+import argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# local repo modules
+import table_image_raster_lib
+
+MERGE_MODES = ('cells', 'runs', 'blocks')
+
+#============================================
+def titration_points(pka_values: list, point_count: int) -> list:
+	"""
+	Return (equivalents, pH) points for a three-pKa titration curve.
+	"""
+	points = []
+	for i in range(point_count):
+		ph = 12.5 * i / (point_count - 1)
+		equivalents = sum(1 / (1 + 10 ** (pka - ph)) for pka in pka_values)
+		points.append((equivalents, ph))
+	return points
+
+#============================================
+def make_titration_chart(cols: int, rows: int, cell_px: int, point_count: int,
+		antialiased: bool) -> table_image_raster_lib.TableImageRaster:
+	"""
+	Build a titration chart like the one titration_pI.py rendered.
+	"""
+	pka_values = (2.3, 6.0, 9.7)
+	chart = table_image_raster_lib.TableImageRaster((0.0, 3.0), (0.0, 12.5), cols, rows, cell_px=cell_px)
+	chart.plot_curve(titration_points(pka_values, point_count), antialiased=antialiased)
+	for index, pka in enumerate(pka_values):
+		chart.add_crosshair(index + 0.5, pka)
+		chart.add_dot(index + 0.5, pka)
+		chart.add_right_label(pka, f"pK<sub>a{index + 1}</sub>")
+	chart.set_y_tick_interval(2)
+	chart.set_x_tick_values([0, 1, 2, 3])
+	chart.set_x_axis_title("OH<sup>&minus;</sup> (equivalents)")
+	return chart
+
+#============================================
+def make_michaelis_menten_chart() -> table_image_raster_lib.TableImageRaster:
+	"""
+	Build a Michaelis-Menten velocity curve with a Km crosshair.
+	"""
+	vmax = 10.0
+	km = 2.0
+	chart = table_image_raster_lib.TableImageRaster((0.0, 20.0), (0.0, 10.0), 61, 41, cell_px=6)
+	points = [(s / 50, vmax * (s / 50) / (km + s / 50)) for s in range(1001)]
+	chart.plot_curve(points, antialiased=True)
+	chart.add_hline(vmax, dashed=True)
+	chart.add_crosshair(km, vmax / 2)
+	chart.add_dot(km, vmax / 2)
+	chart.set_y_tick_interval(2)
+	chart.set_x_tick_values([0, 5, 10, 15, 20])
+	chart.set_x_axis_title("[S] (mM)")
+	return chart
+
+#============================================
+def get_charts() -> list:
+	"""
+	Return (name, chart) pairs for the benchmark.
+	"""
+	charts = [
+		('titration 121x101 @3px, antialiased', make_titration_chart(121, 101, 3, 2400, True)),
+		('titration 121x101 @3px', make_titration_chart(121, 101, 3, 2400, False)),
+		('titration 31x26 @12px', make_titration_chart(31, 26, 12, 600, False)),
+		('michaelis-menten 61x41 @6px', make_michaelis_menten_chart()),
+	]
+	return charts
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(description="Benchmark TableImageRaster HTML encodings.")
+	parser.add_argument(
+		'-r', '--repeats', dest='repeats', type=int, default=20,
+		help='Encodes per chart and mode, the best time is reported.',
+	)
+	args = parser.parse_args()
+	return args
+
+#============================================
+def main():
+	args = parse_args()
+	for name, chart in get_charts():
+		print(name)
+		cells_bytes = None
+		for merge in MERGE_MODES:
+			best = None
+			for _ in range(args.repeats):
+				t0 = time.perf_counter()
+				html_text = chart.to_html(merge=merge)
+				elapsed = time.perf_counter() - t0
+				if best is None or elapsed < best:
+					best = elapsed
+			html_bytes = len(html_text.encode('utf-8'))
+			if cells_bytes is None:
+				cells_bytes = html_bytes
+			ratio = cells_bytes / html_bytes
+			print(f"  {merge:7s} {html_bytes / 1024:8.1f} KB  {ratio:4.1f}x smaller  {best * 1000:6.2f} ms")
+
+#============================================
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+
+"""
+Run every question generator, or every row of bbq task CSVs, in parallel.
+
+Each task is one generator with one set of flags. Tasks run in a worker
+pool with a per-script timeout, each in its own scratch directory with a
+fixed random seed, and the bbq files, QTI packages or HTML pages they write
+are moved into an output tree. A JSON manifest records the script and dependency hash, arguments,
+seed, question count and wall time of each task, so a rerun skips tasks
+whose inputs have not changed.
+"""
+
+# Standard Library
+import os
+import sys
+import csv
+import json
+import time
+import zlib
+import shlex
+import shutil
+import fnmatch
+import hashlib
+import argparse
+import tempfile
+import functools
+import subprocess
+import concurrent.futures
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+	sys.path.insert(0, REPO_ROOT)
+
+# local repo modules
+import topic_classifier.script_runner_lib as script_runner
+
+# bump when the manifest layout changes so old manifests force a rebuild
+MANIFEST_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+# files under data/ that generators rebuild at run time, as in .gitignore
+GENERATED_DATA_PATTERNS = ('*.snapshot.json', '*.snapshot.json.*.tmp', '*.journal.jsonl')
+
+# task CSV markers for YAML banks and the converter that builds each
+YAML_CONVERTERS = {
+	'YMCS': 'problems/multiple_choice_statements/yaml_mc_statements_to_bbq.py',
+	'YMATCH': 'problems/matching_sets/yaml_match_to_bbq.py',
+}
+
+# runs a generator as `python script.py` would, after seeding random
+SEEDED_RUN_CODE = (
+	'import os, sys, random, runpy; '
+	'random.seed(int(sys.argv[1])); '
+	'sys.argv = sys.argv[2:]; '
+	'sys.path.insert(0, os.path.dirname(sys.argv[0])); '
+	'runpy.run_path(sys.argv[0], run_name="__main__")'
+)
+
+#============================================
+def hash_files(file_paths: list) -> str:
+	"""
+	Return one sha256 hex digest over the bytes of several files.
+	"""
+	digest = hashlib.sha256()
+	for file_path in file_paths:
+		with open(file_path, 'rb') as f:
+			digest.update(f.read())
+	return digest.hexdigest()
+
+#============================================
+def normalize_repo_path(path_text: str) -> str:
+	"""
+	Expand the {bp_root}, {bp_mcs} and {bp_match} prefixes used in task CSVs.
+	"""
+	prefixes = {
+		'{bp_root}/': 'problems/',
+		'{bp_mcs}/': 'problems/multiple_choice_statements/',
+		'{bp_match}/': 'problems/matching_sets/',
+	}
+	for prefix, replacement in prefixes.items():
+		if path_text.startswith(prefix):
+			return replacement + path_text[len(prefix):]
+	return path_text
+
+#============================================
+def make_task(script: str, flags: str = '', input_file: str = '', output_subdir: str = None) -> dict:
+	"""
+	Build one task from a generator path, its flags and an optional input.
+
+	YMCS and YMATCH markers become the matching YAML-to-BBQ converter, and
+	an input file is passed with -y.
+
+	Returns:
+		dict: task with its manifest key, script path, argument list and output subdir.
+	"""
+	script_rel_path = YAML_CONVERTERS.get(script, normalize_repo_path(script))
+	args = shlex.split(flags)
+	input_rel_path = normalize_repo_path(input_file) if input_file else ''
+	if input_rel_path:
+		args += ['-y', os.path.join(REPO_ROOT, input_rel_path)]
+	if output_subdir is None:
+		output_subdir = os.path.relpath(os.path.dirname(script_rel_path), 'problems')
+	task = {
+		'key': f'{output_subdir}::{script_rel_path}::{flags}::{input_rel_path}',
+		'script_rel_path': script_rel_path,
+		'input_rel_path': input_rel_path,
+		'args': args,
+		'output_subdir': output_subdir,
+	}
+	return task
+
+#============================================
+def load_task_csvs(csv_paths: list) -> list:
+	"""
+	Read tasks from bbq task CSVs with subject, topic, script, flags and input columns.
+
+	Output for each row goes under subject/topic in the output tree.
+	"""
+	tasks = {}
+	for csv_path in csv_paths:
+		with open(csv_path, 'r', newline='') as f:
+			for row in csv.DictReader(f):
+				subject = row.get('subject') or row.get('chapter')
+				output_subdir = os.path.join(subject, row['topic'])
+				task = make_task(row['script'], row.get('flags') or '', row.get('input') or '', output_subdir)
+				tasks[task['key']] = task
+	return list(tasks.values())
+
+#============================================
+@functools.lru_cache(maxsize=None)
+def get_library_files(folder_rel_path: str) -> tuple:
+	"""
+	List the library files a generator in this folder may import.
+
+	That is every non-generator .py file in the folder and its parents up to
+	problems/, including packages such as treelib/ one level down.
+	"""
+	generators = get_generator_set()
+	library_files = []
+	while folder_rel_path not in ('', 'problems', os.sep):
+		folder_path = os.path.join(REPO_ROOT, folder_rel_path)
+		for entry in sorted(os.listdir(folder_path)):
+			entry_path = os.path.join(folder_path, entry)
+			if os.path.isfile(os.path.join(entry_path, '__init__.py')):
+				for file_name in sorted(os.listdir(entry_path)):
+					if file_name.endswith('.py'):
+						library_files.append(os.path.join(entry_path, file_name))
+			elif entry.endswith('.py') and os.path.join(folder_rel_path, entry) not in generators:
+				library_files.append(entry_path)
+		folder_rel_path = os.path.dirname(folder_rel_path)
+	return tuple(library_files)
+
+#============================================
+@functools.lru_cache(maxsize=None)
+def get_generator_set() -> frozenset:
+	return frozenset(script_runner.discover_generator_scripts(REPO_ROOT))
+
+#============================================
+@functools.lru_cache(maxsize=None)
+def get_root_modules() -> tuple:
+	return tuple(script_runner.list_root_modules(REPO_ROOT))
+
+#============================================
+@functools.lru_cache(maxsize=None)
+def get_data_hash() -> str:
+	"""
+	Hash the source files under data/, which generators read through bptools.
+
+	Caches that generators write back, such as the PubChem snapshot and
+	journal, are skipped so a run does not change the hash of the next one.
+	"""
+	data_files = []
+	for dir_path, dir_names, file_names in os.walk(os.path.join(REPO_ROOT, 'data')):
+		dir_names.sort()
+		for name in sorted(file_names):
+			if any(fnmatch.fnmatch(name, pattern) for pattern in GENERATED_DATA_PATTERNS):
+				continue
+			data_files.append(os.path.join(dir_path, name))
+	return hash_files(data_files)
+
+#============================================
+def get_task_hash(task: dict) -> str:
+	"""
+	Hash a task's script with its libraries, the repo-root modules, data and input.
+	"""
+	script_rel_path = task['script_rel_path']
+	file_paths = [os.path.join(REPO_ROOT, script_rel_path)]
+	file_paths += get_library_files(os.path.dirname(script_rel_path))
+	file_paths += get_root_modules()
+	if task['input_rel_path']:
+		file_paths.append(os.path.join(REPO_ROOT, task['input_rel_path']))
+	return hashlib.sha256((hash_files(file_paths) + get_data_hash()).encode('ascii')).hexdigest()
+
+#============================================
+def get_task_seed(task: dict, base_seed: int) -> int:
+	# stable per task, so a rebuilt task writes the same questions
+	return zlib.crc32(f'{base_seed}:{task["key"]}'.encode('utf-8'))
+
+#============================================
+def load_manifest(manifest_path: str) -> dict:
+	"""
+	Load the manifest, or an empty one if it is missing or from an old layout.
+	"""
+	if not os.path.isfile(manifest_path):
+		return {'version': MANIFEST_VERSION, 'entries': {}}
+	with open(manifest_path, 'r', encoding='ascii') as f:
+		manifest = json.load(f)
+	if manifest.get('version') != MANIFEST_VERSION:
+		return {'version': MANIFEST_VERSION, 'entries': {}}
+	return manifest
+
+#============================================
+def plan_tasks(tasks: list, task_hashes: dict, manifest: dict, base_seed: int,
+		force: bool = False) -> list:
+	"""
+	Pick the tasks that need a run.
+
+	A task runs when it has no manifest entry, its hash or seed changed, or
+	its last run failed.
+
+	Returns:
+		list: tasks to run, each with its 'sha256' and 'seed' filled in.
+	"""
+	jobs = []
+	for task in tasks:
+		job = dict(task, sha256=task_hashes[task['key']], seed=get_task_seed(task, base_seed))
+		entry = manifest['entries'].get(job['key'])
+		if not force and entry is not None:
+			if (entry['sha256'] == job['sha256'] and entry['seed'] == job['seed']
+					and entry['returncode'] == 0):
+				continue
+		jobs.append(job)
+	return jobs
+
+#============================================
+def run_task(job: dict, output_dir: str, timeout: float) -> dict:
+	"""
+	Run one task in a scratch directory and move its output files into the output tree.
+
+	Output is bbq text, or the QTI package or HTML page a task run with
+	--output-format writes. Only bbq files are counted toward question_count.
+
+	Returns:
+		dict: manifest entry with hash, arguments, seed, outputs and timing.
+	"""
+	env = dict(os.environ)
+	env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, env.get('PYTHONPATH')]))
+	command = [
+		sys.executable, '-c', SEEDED_RUN_CODE, str(job['seed']),
+		os.path.join(REPO_ROOT, job['script_rel_path']),
+	] + job['args']
+	task_output_dir = os.path.join(output_dir, job['output_subdir'])
+	os.makedirs(task_output_dir, exist_ok=True)
+	outputs = []
+	question_count = 0
+	t0 = time.time()
+	with tempfile.TemporaryDirectory() as work_dir:
+		try:
+			result = subprocess.run(command, cwd=work_dir, env=env, capture_output=True,
+				text=True, timeout=timeout)
+			returncode = result.returncode
+			log_text = result.stdout + result.stderr
+		except subprocess.TimeoutExpired:
+			returncode = 'timeout'
+			log_text = f'timed out after {timeout} seconds\n'
+		for file_name in sorted(os.listdir(work_dir)):
+			if not script_runner.is_output_file(file_name):
+				continue
+			if file_name.startswith('bbq-'):
+				with open(os.path.join(work_dir, file_name), 'r', encoding='utf-8') as f:
+					question_count += sum(1 for line in f if line.strip())
+			shutil.move(os.path.join(work_dir, file_name), os.path.join(task_output_dir, file_name))
+			outputs.append(os.path.join(job['output_subdir'], file_name))
+	if returncode == 0 and len(outputs) == 0:
+		returncode = 'no output'
+	if returncode != 0:
+		log_name = os.path.basename(job['script_rel_path']) + '.log'
+		with open(os.path.join(task_output_dir, log_name), 'w') as f:
+			f.write(log_text)
+	entry = {
+		'script': job['script_rel_path'],
+		'args': job['args'],
+		'sha256': job['sha256'],
+		'seed': job['seed'],
+		'returncode': returncode,
+		'outputs': outputs,
+		'question_count': question_count,
+		'seconds': round(time.time() - t0, 3),
+	}
+	return entry
+
+#============================================
+def make_error_entry(job: dict, error_text: str) -> dict:
+	"""
+	Build the manifest entry for a task that raised instead of finishing.
+	"""
+	entry = {
+		'script': job['script_rel_path'],
+		'args': job['args'],
+		'sha256': job['sha256'],
+		'seed': job['seed'],
+		'returncode': error_text,
+		'outputs': [],
+		'question_count': 0,
+		'seconds': 0.0,
+	}
+	return entry
+
+#============================================
+def write_manifest(manifest: dict, manifest_path: str) -> None:
+	temp_path = manifest_path + '.tmp'
+	with open(temp_path, 'w', encoding='ascii') as f:
+		json.dump(manifest, f, indent=1, sort_keys=True)
+		f.write('\n')
+	os.replace(temp_path, manifest_path)
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(description="Build bbq output for the whole generator catalog.")
+	parser.add_argument(
+		'-t', '--task-csv', dest='task_csvs', nargs='+', default=None,
+		help='bbq task CSVs to run; defaults to every discovered generator with no flags.',
+	)
+	parser.add_argument(
+		'-o', '--output-dir', dest='output_dir', default='catalog_build',
+		help='Directory for the bbq output tree and the manifest.',
+	)
+	parser.add_argument(
+		'-j', '--jobs', dest='jobs', type=int, default=os.cpu_count(),
+		help='Parallel generator processes, defaults to the CPU count.',
+	)
+	parser.add_argument(
+		'-T', '--timeout', dest='timeout', type=float, default=300,
+		help='Seconds before a single generator run is stopped.',
+	)
+	parser.add_argument(
+		'-s', '--seed', dest='seed', type=int, default=0,
+		help='Base seed; each task seed is derived from it and the task key.',
+	)
+	parser.add_argument(
+		'-f', '--force', dest='force', action='store_true',
+		help='Run every task, ignoring the manifest.',
+	)
+	args = parser.parse_args()
+	return args
+
+#============================================
+def main():
+	args = parse_args()
+	t0 = time.time()
+	output_dir = os.path.abspath(args.output_dir)
+	os.makedirs(output_dir, exist_ok=True)
+	manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+
+	if args.task_csvs is None:
+		tasks = [make_task(script) for script in sorted(get_generator_set())]
+	else:
+		tasks = load_task_csvs(args.task_csvs)
+	task_hashes = {task['key']: get_task_hash(task) for task in tasks}
+	manifest = load_manifest(manifest_path)
+	jobs = plan_tasks(tasks, task_hashes, manifest, args.seed, args.force)
+	print(f'{len(tasks)} tasks, {len(jobs)} to run')
+
+	# drop entries for tasks that are no longer listed
+	current_keys = {task['key'] for task in tasks}
+	manifest['entries'] = {key: entry for key, entry in manifest['entries'].items() if key in current_keys}
+
+	failures = []
+	with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+		future_to_job = {pool.submit(run_task, job, output_dir, args.timeout): job for job in jobs}
+		for future in concurrent.futures.as_completed(future_to_job):
+			job = future_to_job[future]
+			try:
+				entry = future.result()
+			except (OSError, ValueError) as error:
+				# a task that cannot collect its output fails alone
+				entry = make_error_entry(job, f'{type(error).__name__}: {error}')
+			manifest['entries'][job['key']] = entry
+			if entry['returncode'] != 0:
+				failures.append(f"{job['key']} ({entry['returncode']})")
+			# record each finished task so an interrupted build keeps its progress
+			write_manifest(manifest, manifest_path)
+	write_manifest(manifest, manifest_path)
+
+	question_total = sum(entry['question_count'] for entry in manifest['entries'].values())
+	for failure in sorted(failures):
+		print(f'FAILED: {failure}')
+	print(f'ran {len(jobs) - len(failures)} of {len(jobs)} tasks in {time.time() - t0:.2f} seconds, '
+		f'{question_total} questions in the catalog')
+	if len(failures) > 0:
+		sys.exit(1)
+
+#============================================
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+
+"""
+Convert every matching-set and MC-statement YAML bank to BBQ and PGML.
+
+Banks are discovered under problems/matching_sets/ and
+problems/multiple_choice_statements/, each bank and converter pair runs in a
+worker pool, and a JSON manifest records the input and converter hashes so
+a rerun only rebuilds what changed.
+"""
+
+# Standard Library
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+import concurrent.futures
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+	sys.path.insert(0, REPO_ROOT)
+
+# local repo modules
+import topic_classifier.script_runner_lib as script_runner
+
+# bump when the manifest layout changes so old manifests force a rebuild
+MANIFEST_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+# converters run for each bank, relative to the bank root directory
+BANK_ROOTS = {
+	'problems/matching_sets': (
+		'yaml_match_to_bbq.py',
+		'yaml_which_one_mc_to_bbq.py',
+		'yaml_match_to_pgml.py',
+		'yaml_which_one_mc_to_pgml.py',
+	),
+	'problems/multiple_choice_statements': (
+		'yaml_mc_statements_to_bbq.py',
+		'yaml_mc_statements_to_pgml.py',
+	),
+}
+
+# converters that write next to the YAML file unless given an output directory
+OUTPUT_DIR_FLAGS = {
+	'yaml_mc_statements_to_pgml.py': '-d',
+}
+
+#============================================
+def hash_files(file_paths: list) -> str:
+	"""
+	Return one sha256 hex digest over the bytes of several files.
+	"""
+	digest = hashlib.sha256()
+	for file_path in file_paths:
+		with open(file_path, 'rb') as f:
+			digest.update(f.read())
+	return digest.hexdigest()
+
+#============================================
+def discover_banks(repo_root: str) -> list:
+	"""
+	Find the YAML banks in the topic subdirectories of each bank root.
+
+	Top-level files such as TEMPLATE.yml and sample.yml are not banks.
+
+	Returns:
+		list: sorted (bank_root, yaml_rel_path) tuples, paths relative to repo_root.
+	"""
+	banks = []
+	for bank_root in BANK_ROOTS:
+		root_dir = os.path.join(repo_root, bank_root)
+		for dir_path, dir_names, file_names in os.walk(root_dir):
+			dir_names.sort()
+			if dir_path == root_dir:
+				continue
+			for file_name in sorted(file_names):
+				if not file_name.endswith('.yml'):
+					continue
+				yaml_rel_path = os.path.relpath(os.path.join(dir_path, file_name), repo_root)
+				banks.append((bank_root, yaml_rel_path))
+	return banks
+
+#============================================
+def get_converter_versions(repo_root: str) -> dict:
+	"""
+	Hash each converter script together with the repo-root modules it may import.
+
+	Returns:
+		dict: converter path relative to repo_root -> sha256 hex digest.
+	"""
+	shared_paths = script_runner.list_root_modules(repo_root)
+	versions = {}
+	for bank_root, converters in BANK_ROOTS.items():
+		for converter in converters:
+			converter_rel_path = os.path.join(bank_root, converter)
+			versions[converter_rel_path] = hash_files([os.path.join(repo_root, converter_rel_path)] + shared_paths)
+	return versions
+
+#============================================
+def load_manifest(manifest_path: str) -> dict:
+	"""
+	Load the manifest, or an empty one if it is missing or from an old layout.
+	"""
+	if not os.path.isfile(manifest_path):
+		return {'version': MANIFEST_VERSION, 'entries': {}}
+	with open(manifest_path, 'r', encoding='ascii') as f:
+		manifest = json.load(f)
+	if manifest.get('version') != MANIFEST_VERSION:
+		return {'version': MANIFEST_VERSION, 'entries': {}}
+	return manifest
+
+#============================================
+def plan_jobs(banks: list, input_hashes: dict, converter_versions: dict,
+		manifest: dict, force: bool = False) -> list:
+	"""
+	Pick the bank and converter pairs that need a rebuild.
+
+	A pair is rebuilt when it has no manifest entry, its YAML or converter
+	hash changed, or its last run failed.
+
+	Args:
+		banks (list): (bank_root, yaml_rel_path) tuples from discover_banks().
+		input_hashes (dict): yaml_rel_path -> sha256 of the YAML bytes.
+		converter_versions (dict): from get_converter_versions().
+		manifest (dict): from load_manifest().
+		force (bool): rebuild every pair.
+
+	Returns:
+		list: job dicts with the manifest key, paths, and expected hashes.
+	"""
+	jobs = []
+	for bank_root, yaml_rel_path in banks:
+		for converter in BANK_ROOTS[bank_root]:
+			converter_rel_path = os.path.join(bank_root, converter)
+			key = f'{yaml_rel_path}::{converter}'
+			job = {
+				'key': key,
+				'yaml_rel_path': yaml_rel_path,
+				'converter_rel_path': converter_rel_path,
+				'input_sha256': input_hashes[yaml_rel_path],
+				'converter_sha256': converter_versions[converter_rel_path],
+			}
+			entry = manifest['entries'].get(key)
+			if not force and entry is not None:
+				if (entry['input_sha256'] == job['input_sha256']
+						and entry['converter_sha256'] == job['converter_sha256']
+						and entry['returncode'] == 0):
+					continue
+			jobs.append(job)
+	return jobs
+
+#============================================
+def run_job(job: dict, repo_root: str, output_dir: str) -> dict:
+	"""
+	Run one converter on one bank in the bank's own output directory.
+
+	Returns:
+		dict: manifest entry with hashes, return code, and seconds taken.
+	"""
+	bank_output_dir = os.path.join(output_dir, os.path.splitext(job['yaml_rel_path'])[0])
+	os.makedirs(bank_output_dir, exist_ok=True)
+	env = dict(os.environ)
+	env['PYTHONPATH'] = os.pathsep.join(filter(None, [repo_root, env.get('PYTHONPATH')]))
+	command = [
+		sys.executable,
+		os.path.join(repo_root, job['converter_rel_path']),
+		'-y', os.path.join(repo_root, job['yaml_rel_path']),
+	]
+	output_dir_flag = OUTPUT_DIR_FLAGS.get(os.path.basename(job['converter_rel_path']))
+	if output_dir_flag is not None:
+		command += [output_dir_flag, bank_output_dir]
+	t0 = time.time()
+	result = subprocess.run(command, cwd=bank_output_dir, env=env, capture_output=True, text=True)
+	if result.returncode != 0:
+		log_path = os.path.join(bank_output_dir, os.path.basename(job['converter_rel_path']) + '.log')
+		with open(log_path, 'w') as f:
+			f.write(result.stdout + result.stderr)
+	entry = {
+		'input_sha256': job['input_sha256'],
+		'converter_sha256': job['converter_sha256'],
+		'returncode': result.returncode,
+		'seconds': round(time.time() - t0, 3),
+	}
+	return entry
+
+#============================================
+def write_manifest(manifest: dict, manifest_path: str) -> None:
+	temp_path = manifest_path + '.tmp'
+	with open(temp_path, 'w', encoding='ascii') as f:
+		json.dump(manifest, f, indent=1, sort_keys=True)
+		f.write('\n')
+	os.replace(temp_path, manifest_path)
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(description="Build BBQ and PGML output for all YAML banks.")
+	parser.add_argument(
+		'-o', '--output-dir', dest='output_dir', default='yaml_bank_build',
+		help='Directory for converted output and the manifest.',
+	)
+	parser.add_argument(
+		'-j', '--jobs', dest='jobs', type=int, default=os.cpu_count(),
+		help='Parallel converter processes, defaults to the CPU count.',
+	)
+	parser.add_argument(
+		'-f', '--force', dest='force', action='store_true',
+		help='Rebuild every bank, ignoring the manifest.',
+	)
+	args = parser.parse_args()
+	return args
+
+#============================================
+def main():
+	args = parse_args()
+	t0 = time.time()
+	repo_root = REPO_ROOT
+	output_dir = os.path.abspath(args.output_dir)
+	os.makedirs(output_dir, exist_ok=True)
+	manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+
+	banks = discover_banks(repo_root)
+	input_hashes = {}
+	for _, yaml_rel_path in banks:
+		input_hashes[yaml_rel_path] = hash_files([os.path.join(repo_root, yaml_rel_path)])
+	converter_versions = get_converter_versions(repo_root)
+	manifest = load_manifest(manifest_path)
+	jobs = plan_jobs(banks, input_hashes, converter_versions, manifest, args.force)
+	print(f'{len(banks)} banks, {len(jobs)} conversions to run')
+
+	# drop entries for banks or converters that no longer exist
+	current_keys = {f'{yaml_rel_path}::{converter}'
+		for bank_root, yaml_rel_path in banks for converter in BANK_ROOTS[bank_root]}
+	manifest['entries'] = {key: entry for key, entry in manifest['entries'].items() if key in current_keys}
+
+	failures = []
+	with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+		future_to_job = {pool.submit(run_job, job, repo_root, output_dir): job for job in jobs}
+		for future in concurrent.futures.as_completed(future_to_job):
+			job = future_to_job[future]
+			entry = future.result()
+			manifest['entries'][job['key']] = entry
+			if entry['returncode'] != 0:
+				failures.append(job['key'])
+			# record each finished job so an interrupted build keeps its progress
+			write_manifest(manifest, manifest_path)
+	write_manifest(manifest, manifest_path)
+
+	print(f'built {len(jobs) - len(failures)} of {len(jobs)} conversions in {time.time() - t0:.2f} seconds')
+	if len(failures) > 0:
+		raise RuntimeError(f'{len(failures)} conversions failed, see the .log files: {", ".join(sorted(failures))}')
+
+#============================================
+if __name__ == '__main__':
+	main()
@@ -10,6 +10,9 @@ import pprint
 # PIP3 modules
 import yaml
 
+# local repo modules
+import yaml_cache_lib
+
 
 @dataclass(frozen=True)
 class YamlIssue:
@@ -24,32 +27,6 @@ class YamlIssue:
 		return f"{self.severity}: {self.yaml_path}:{self.line}: {self.message}"
 
 
-class UniqueKeyLoader(yaml.SafeLoader):
-	pass
-
-
-def _construct_mapping_no_duplicates(loader, node, deep=False):
-	mapping = {}
-	for key_node, value_node in node.value:
-		key = loader.construct_object(key_node, deep=deep)
-		if key in mapping:
-			raise yaml.constructor.ConstructorError(
-				"while constructing a mapping",
-				node.start_mark,
-				f"found duplicate key: {key!r}",
-				key_node.start_mark,
-			)
-		value = loader.construct_object(value_node, deep=deep)
-		mapping[key] = value
-	return mapping
-
-
-UniqueKeyLoader.add_constructor(
-	yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-	_construct_mapping_no_duplicates,
-)
-
-
 def parse_args():
 	"""
 	Parse command-line arguments.
@@ -133,7 +110,7 @@ def _check_for_leading_tabs(yaml_path, raw_text):
 
 def _parse_yaml_all_docs(yaml_path, raw_text):
 	try:
-		return list(yaml.load_all(raw_text, Loader=UniqueKeyLoader))
+		return yaml_cache_lib.load_yaml_documents(raw_text)
 	except yaml.YAMLError as exc:
 		raise ValueError(f"YAML parse error: {exc}") from exc
 
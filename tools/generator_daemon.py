@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+
+"""
+Serve question generators from one warm Python process over a Unix socket.
+
+The server imports a list of generator scripts once, which loads bptools,
+qti_package_maker and each script's libraries and data. Each request then
+runs a script exactly as `python script.py args` would, in a scratch
+directory, and replies with the BBQ lines, HTML pages or QTI packages it
+wrote. Generators need no
+changes: their main() still calls bptools.collect_and_write_questions().
+
+Protocol: one JSON object per line in each direction.
+	request: {"script": path, "args": [..], "count": N, "seed": S}
+	reply:   {"ok": true, "files": {outfile: [lines]},
+	          "binary_files": {outfile: base64}, "seconds": T, "log": text}
+	         {"ok": false, "error": text, "log": text}
+
+Requests are served one at a time, since a generator run changes the
+working directory, sys.argv and bptools globals.
+"""
+
+# Standard Library
+import io
+import os
+import sys
+import json
+import time
+import runpy
+import shlex
+import base64
+import random
+import socket
+import argparse
+import tempfile
+import traceback
+import contextlib
+import socketserver
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), 'biology-problems-generators.sock')
+
+# generators import bptools from the repo root, as with PYTHONPATH set
+if REPO_ROOT not in sys.path:
+	sys.path.insert(0, REPO_ROOT)
+
+# resolved paths of generators whose module body has already run
+_PRELOADED_SCRIPTS = set()
+
+#============================================
+def resolve_script_path(script: str) -> str:
+	"""
+	Resolve a generator path, relative to the repo root, inside the repo.
+
+	Raises:
+		ValueError: the path is not a .py file inside the repository.
+	"""
+	script_path = os.path.realpath(os.path.join(REPO_ROOT, script))
+	if not script_path.startswith(REPO_ROOT + os.sep) or not script_path.endswith('.py'):
+		raise ValueError(f'not a generator script in this repository: {script}')
+	if not os.path.isfile(script_path):
+		raise ValueError(f'generator script not found: {script}')
+	return script_path
+
+#============================================
+def _evict_shadowed_modules(script_dir: str) -> None:
+	"""
+	Drop cached sibling libraries that this script would import from its own folder.
+
+	Two problem folders can hold libraries with the same name, such as
+	aminoacidlib.py, and sys.modules only keeps whichever loaded first.
+	"""
+	for module_name, module in list(sys.modules.items()):
+		module_file = getattr(module, '__file__', None)
+		if module_file is None or '.' in module_name:
+			continue
+		if os.path.dirname(os.path.realpath(module_file)) == script_dir:
+			continue
+		if os.path.isfile(os.path.join(script_dir, module_name + '.py')):
+			del sys.modules[module_name]
+
+#============================================
+@contextlib.contextmanager
+def _script_context(script_path: str, work_dir: str):
+	"""
+	Match a command-line run: script folder first on sys.path, scratch cwd.
+	"""
+	script_dir = os.path.dirname(script_path)
+	old_cwd = os.getcwd()
+	_evict_shadowed_modules(script_dir)
+	sys.path.insert(0, script_dir)
+	os.chdir(work_dir)
+	try:
+		yield
+	finally:
+		os.chdir(old_cwd)
+		sys.path.remove(script_dir)
+
+#============================================
+def preload_generator(script: str) -> None:
+	"""
+	Run a generator's module body without main() to import its libraries.
+	"""
+	script_path = resolve_script_path(script)
+	with tempfile.TemporaryDirectory() as work_dir:
+		with _script_context(script_path, work_dir):
+			runpy.run_path(script_path, run_name='generator_preload')
+	_PRELOADED_SCRIPTS.add(script_path)
+
+#============================================
+def build_argv(script_path: str, args: list, count) -> list:
+	"""
+	Build sys.argv for a run; count sets attempts and the question cap.
+
+	The count flags come first so explicit -d or -x in args still win.
+	"""
+	argv = [script_path]
+	if count is not None:
+		argv += ['-d', str(count), '-x', str(count)]
+	argv += [str(arg) for arg in args]
+	return argv
+
+#============================================
+def _reset_bptools_state() -> None:
+	# per-run counters that a fresh interpreter would start empty,
+	# looked up lazily so the --query client never imports bptools
+	bptools = sys.modules.get('bptools')
+	if bptools is None:
+		return
+	bptools.answer_histogram.clear()
+	bptools.question_count = 0
+	bptools.crc16_dict.clear()
+	# --profile and --output-format from an earlier request must not carry over
+	bptools._active_profile = None
+	bptools._output_format = 'bbq'
+
+#============================================
+def _collect_output_files(work_dir: str) -> tuple:
+	"""
+	Read the output files a run wrote in its scratch directory.
+
+	Returns:
+		tuple: (files, binary_files); text files as lists of lines, and
+			zip packages as base64 text, both keyed by file name.
+	"""
+	# imported here, like bptools, so the --query client stays light
+	import topic_classifier.script_runner_lib as script_runner
+	files = {}
+	binary_files = {}
+	for file_name in sorted(os.listdir(work_dir)):
+		if not script_runner.is_output_file(file_name):
+			continue
+		file_path = os.path.join(work_dir, file_name)
+		if file_name.endswith('.zip'):
+			with open(file_path, 'rb') as f:
+				binary_files[file_name] = base64.b64encode(f.read()).decode('ascii')
+			continue
+		with open(file_path, 'r', encoding='utf-8') as f:
+			files[file_name] = f.read().splitlines()
+	return files, binary_files
+
+#============================================
+def run_generator_request(request: dict) -> dict:
+	"""
+	Run one generator request in this process and collect its output files.
+
+	Args:
+		request (dict): 'script' path, optional 'args' list, 'count' and 'seed'.
+
+	Returns:
+		dict: reply in the protocol described in the module docstring.
+	"""
+	log_stream = io.StringIO()
+	t0 = time.time()
+	try:
+		script_path = resolve_script_path(request['script'])
+		argv = build_argv(script_path, request.get('args', []), request.get('count'))
+		seed = request.get('seed')
+		# libraries may draw random numbers on import, keep that before seeding
+		if script_path not in _PRELOADED_SCRIPTS:
+			with contextlib.redirect_stdout(log_stream), contextlib.redirect_stderr(log_stream):
+				preload_generator(script_path)
+		_reset_bptools_state()
+		random.seed(seed)
+		if 'numpy' in sys.modules and seed is not None:
+			sys.modules['numpy'].random.seed(seed)
+		old_argv = sys.argv
+		with tempfile.TemporaryDirectory() as work_dir:
+			with _script_context(script_path, work_dir), \
+					contextlib.redirect_stdout(log_stream), contextlib.redirect_stderr(log_stream):
+				sys.argv = argv
+				try:
+					runpy.run_path(script_path, run_name='__main__')
+				except SystemExit as exit_error:
+					# argparse errors and scripts that call sys.exit()
+					if exit_error.code not in (None, 0):
+						raise
+				finally:
+					sys.argv = old_argv
+			files, binary_files = _collect_output_files(work_dir)
+	# a broken generator must not take the warm server down with it
+	except (Exception, SystemExit):
+		reply = {'ok': False, 'error': traceback.format_exc(), 'log': log_stream.getvalue()}
+		return reply
+	reply = {
+		'ok': True,
+		'files': files,
+		'binary_files': binary_files,
+		'seconds': round(time.time() - t0, 3),
+		'log': log_stream.getvalue(),
+	}
+	return reply
+
+#============================================
+class GeneratorRequestHandler(socketserver.StreamRequestHandler):
+	"""
+	Answer each JSON request line on a connection with one JSON reply line.
+	"""
+	def handle(self):
+		for request_line in self.rfile:
+			if len(request_line.strip()) == 0:
+				continue
+			try:
+				request = json.loads(request_line)
+			except json.JSONDecodeError as error:
+				reply = {'ok': False, 'error': f'bad request JSON: {error}', 'log': ''}
+			else:
+				reply = run_generator_request(request)
+			self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+			self.wfile.flush()
+
+#============================================
+def serve(socket_path: str, preload_scripts: list) -> None:
+	"""
+	Preload generators, then serve requests on a Unix socket until interrupted.
+	"""
+	for script in preload_scripts:
+		t0 = time.time()
+		preload_generator(script)
+		print(f'preloaded {script} in {time.time() - t0:.2f} seconds')
+	if os.path.exists(socket_path):
+		os.remove(socket_path)
+	with socketserver.UnixStreamServer(socket_path, GeneratorRequestHandler) as server:
+		print(f'serving generators on {socket_path}')
+		try:
+			server.serve_forever()
+		except KeyboardInterrupt:
+			pass
+	os.remove(socket_path)
+
+#============================================
+def request_questions(socket_path: str, script: str, args: list = None,
+		count: int = None, seed: int = None) -> dict:
+	"""
+	Send one request to a running server and wait for its reply.
+
+	Args:
+		socket_path (str): server socket path.
+		script (str): generator path, relative to the repo root.
+		args (list): extra command-line arguments for the generator.
+		count (int): questions wanted, or None for the generator defaults.
+		seed (int): random seed, or None for an unseeded run.
+
+	Returns:
+		dict: the server reply.
+	"""
+	request = {'script': script, 'args': args or [], 'count': count, 'seed': seed}
+	with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+		client.connect(socket_path)
+		client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+		with client.makefile('rb') as reply_file:
+			reply = json.loads(reply_file.readline())
+	return reply
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(description="Serve question generators from a warm process.")
+	parser.add_argument(
+		'-s', '--socket', dest='socket_path', default=DEFAULT_SOCKET,
+		help='Unix socket path for the server.',
+	)
+	parser.add_argument(
+		'-p', '--preload', dest='preload_scripts', nargs='+', default=[],
+		help='Generator scripts to import when the server starts.',
+	)
+	parser.add_argument(
+		'-q', '--query', dest='query_script', default=None,
+		help='Send one request for this generator to a running server instead.',
+	)
+	parser.add_argument(
+		'-a', '--args', dest='query_args', default='',
+		help='Generator arguments for --query, as one quoted string.',
+	)
+	parser.add_argument(
+		'-n', '--count', dest='count', type=int, default=None,
+		help='Questions wanted for --query.',
+	)
+	parser.add_argument(
+		'-r', '--seed', dest='seed', type=int, default=None,
+		help='Random seed for --query.',
+	)
+	args = parser.parse_args()
+	return args
+
+#============================================
+def main():
+	args = parse_args()
+	if args.query_script is None:
+		serve(args.socket_path, args.preload_scripts)
+		return
+	reply = request_questions(args.socket_path, args.query_script,
+		shlex.split(args.query_args), args.count, args.seed)
+	if not reply['ok']:
+		print(reply['log'] + reply['error'])
+		sys.exit(1)
+	for file_name, lines in reply['files'].items():
+		with open(file_name, 'w', encoding='utf-8') as f:
+			for line in lines:
+				f.write(line + '\n')
+		if file_name.startswith('bbq-'):
+			print(f'wrote {len(lines)} questions to {file_name} in {reply["seconds"]:.2f} seconds')
+		else:
+			print(f'wrote {file_name} in {reply["seconds"]:.2f} seconds')
+	for file_name, encoded in reply['binary_files'].items():
+		with open(file_name, 'wb') as f:
+			f.write(base64.b64decode(encoded))
+		print(f'wrote {file_name} in {reply["seconds"]:.2f} seconds')
+
+#============================================
+if __name__ == '__main__':
+	main()
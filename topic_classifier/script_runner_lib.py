@@ -5,11 +5,16 @@ import os
 import re
 import glob
 import shutil
+import fnmatch
 import subprocess
 
 # qti-package-maker modules (on PYTHONPATH via source_me.sh)
 import qti_package_maker.package_interface as package_interface
 
+# files a generator run writes: BBQ text, or with --output-format a QTI
+# package or HTML page
+OUTPUT_FILE_PATTERNS = ("bbq-*.txt", "qti12-*.zip", "qti21-*.zip", "*.html")
+
 #============================================
 def get_repo_root() -> str:
 	"""Get the repository root directory via git."""
@@ -74,6 +79,29 @@ def discover_generator_scripts(repo_root: str = None) -> list:
 
 	return generators
 
+#============================================
+def list_root_modules(repo_root: str = None) -> list:
+	"""List the repo-root .py modules that generators and converters import.
+
+	Build tools hash these as part of every script version, so a new
+	root module is picked up without editing a hand-kept list.
+
+	Args:
+		repo_root: repository root (default: from git)
+
+	Returns:
+		sorted list of absolute .py file paths
+	"""
+	if repo_root is None:
+		repo_root = get_repo_root()
+	module_paths = sorted(glob.glob(os.path.join(repo_root, "*.py")))
+	return module_paths
+
+#============================================
+def is_output_file(file_name: str) -> bool:
+	"""Check whether a file name matches one of OUTPUT_FILE_PATTERNS."""
+	return any(fnmatch.fnmatch(file_name, pattern) for pattern in OUTPUT_FILE_PATTERNS)
+
 #============================================
 def get_script_basename(script_path: str) -> str:
 	"""Extract the basename without extension from a script path.
@@ -2,9 +2,18 @@
 Shared helpers for generating WeBWorK PG/PGML files.
 """
 
+import concurrent.futures
 import datetime
+import functools
+import glob
 import html
+import multiprocessing
+import os
+import random
 import re
+import time
+
+import yaml
 
 # English connector words kept lowercase in title case, except when
 # they are the first word of the title. Used by smart_title_case.
@@ -18,6 +27,20 @@ _MINOR_TITLE_WORDS = frozenset({
 # so their internal characters keep their original case.
 _HTML_TOKEN_RE = re.compile(r"<[^>]*>|&[^;\s]+;")
 
+# Precompiled patterns for the strict color span parser. Group 1 of
+# _SPAN_BLOCK_RE is the attribute text and group 2 the span content.
+_SPAN_BLOCK_RE = re.compile(r"<span\b([^>]*)>(.*?)</span>", re.IGNORECASE | re.DOTALL)
+_SPAN_OPEN_RE = re.compile(r"<span\b", re.IGNORECASE)
+_COLOR_SPAN_HINT_RE = re.compile(r"<span[^>]*color", re.IGNORECASE)
+_STYLE_QUOTED_RE = re.compile(
+	r"style\s*=\s*(?P<quote>[\"\'])(?P<style>.*?)(?P=quote)", re.IGNORECASE | re.DOTALL)
+_STYLE_BARE_RE = re.compile(r"style\s*=\s*([^>]+)$", re.IGNORECASE | re.DOTALL)
+_STRONG_OPEN_RE = re.compile(r"<strong>", re.IGNORECASE)
+_STRONG_CLOSE_RE = re.compile(r"\s*</strong>", re.IGNORECASE)
+_INNER_STRONG_RE = re.compile(r"\s*<strong>(.*?)</strong>\s*", re.IGNORECASE | re.DOTALL)
+_SUB_SUP_TAG_RE = re.compile(r"</?(?:su[bp])>")
+_ANY_TAG_RE = re.compile(r"<[^>]+>")
+
 #============================================
 def _capitalize_first_alpha(word):
 	"""
@@ -531,7 +554,7 @@ def format_label_html(text_string, color_mode, color_classes, warnings, label_na
 
 	segments = extract_strict_color_spans(text_string)
 	if segments is None:
-		if re.search(r'<span[^>]*color', text_string, flags=re.IGNORECASE):
+		if _COLOR_SPAN_HINT_RE.search(text_string):
 			label_note = f": {label_name}" if label_name else ""
 			warnings.append(f"non-strict color span skipped for replacement{label_note}")
 		return sanitize_text_for_html(text_string), False
@@ -569,6 +592,7 @@ def format_label_html(text_string, color_mode, color_classes, warnings, label_na
 	return "".join(segments_html), any_bold
 
 #============================================
+@functools.lru_cache(maxsize=None)
 def normalize_color_value(color_value):
 	"""
 	Normalize a CSS color value and return (normalized_color, class_name).
@@ -613,56 +637,25 @@ def build_pgml_tag_wrapper(text_string, tag_name="span", class_name=None, style=
 	return f"[<{text_string}>]{{[\"{tag_name}\", {attr_blob}]}}{{[\"\",\"\"]}}"
 
 #============================================
-def extract_strict_color_span(text_string):
+def _parse_strict_span(span_match):
 	"""
-	Extract a strict color span with optional strong wrappers.
-
-	Returns (prefix, inner_text, suffix, color_value, is_bold) or None.
-	"""
-	if text_string is None:
-		return None
-	if not isinstance(text_string, str):
-		raise TypeError(f"value is not string: {text_string}")
-	span_match = re.search(r'<span\b[^>]*>.*?</span>', text_string,
-		flags=re.IGNORECASE | re.DOTALL)
-	if span_match is None:
-		return None
-	if re.search(r'<span\b[^>]*>.*?</span>.*<span\b', text_string,
-		flags=re.IGNORECASE | re.DOTALL):
-		return None
-	prefix = text_string[:span_match.start()]
-	suffix = text_string[span_match.end():]
-	span_block = span_match.group(0)
+	Check one span match from _SPAN_BLOCK_RE against the strict color rules.
 
-	is_bold = False
-	# capture whitespace between <strong> and <span> to preserve spacing
-	strong_prefix = re.search(r'<strong>(\s*)$', prefix, flags=re.IGNORECASE)
-	strong_suffix = re.search(r'^\s*</strong>', suffix, flags=re.IGNORECASE)
-	if strong_prefix and strong_suffix:
-		is_bold = True
-		prefix = prefix[:strong_prefix.start()] + strong_prefix.group(1)
-		suffix = suffix[strong_suffix.end():]
+	The span must carry a single color style declaration and its content may
+	hold only text, entities, sub/sup tags and one optional strong wrapper.
 
-	attr_match = re.search(r'<span\b([^>]*)>', span_block, flags=re.IGNORECASE)
-	if attr_match is None:
-		return None
-	attrs = attr_match.group(1)
-	style_match = re.search(
-		r'style\s*=\s*(?P<quote>[\"\'])(?P<style>.*?)(?P=quote)',
-		attrs,
-		flags=re.IGNORECASE | re.DOTALL,
-	)
-	if style_match is None:
-		style_match = re.search(
-			r'style\s*=\s*([^>]+)$',
-			attrs,
-			flags=re.IGNORECASE | re.DOTALL,
-		)
-	if style_match is None:
-		return None
-	style_text = style_match.groupdict().get("style") or style_match.group(1)
-	style_text = style_text.strip()
-	style_text = style_text.rstrip(";")
+	Returns (inner_text, color_value, inner_bold) or None.
+	"""
+	attrs = span_match.group(1)
+	style_match = _STYLE_QUOTED_RE.search(attrs)
+	if style_match is not None:
+		style_text = style_match.group("style")
+	else:
+		style_match = _STYLE_BARE_RE.search(attrs)
+		if style_match is None:
+			return None
+		style_text = style_match.group(1)
+	style_text = style_text.strip().rstrip(";")
 	if not style_text:
 		return None
 	parts = [part.strip() for part in style_text.split(";") if part.strip()]
@@ -677,25 +670,74 @@ def extract_strict_color_span(text_string):
 	if not color_value:
 		return None
 
-	inner = re.sub(r'^<span\b[^>]*>', '', span_block, flags=re.IGNORECASE)
-	inner = re.sub(r'</span>\s*$', '', inner, flags=re.IGNORECASE)
-
-	inner_strong = re.fullmatch(
-		r'\s*<strong>(.*?)</strong>\s*',
-		inner,
-		flags=re.IGNORECASE | re.DOTALL,
-	)
+	inner = span_match.group(2)
+	inner_bold = False
+	inner_strong = _INNER_STRONG_RE.fullmatch(inner)
 	if inner_strong is not None:
-		is_bold = True
+		inner_bold = True
 		inner = inner_strong.group(1)
 
 	inner = normalize_nbsp(inner)
 	# reject inner text with HTML tags other than sub/sup
-	cleaned = re.sub(r'</?(?:su[bp])>', '', inner)
-	if re.search(r'<[^>]+>', cleaned):
+	if "<" in inner:
+		cleaned = _SUB_SUP_TAG_RE.sub("", inner)
+		if _ANY_TAG_RE.search(cleaned):
+			return None
+	return inner, color_value, inner_bold
+
+#============================================
+def _strong_prefix_start(prefix):
+	"""
+	Find a <strong> that ends the prefix, allowing trailing whitespace.
+
+	Returns the index of the tag in prefix, or -1 when there is none.
+	"""
+	# anchored at the end of the prefix instead of scanning all of it
+	tag_end = len(prefix.rstrip())
+	tag_start = tag_end - len("<strong>")
+	if tag_start < 0:
+		return -1
+	if _STRONG_OPEN_RE.fullmatch(prefix, tag_start, tag_end) is None:
+		return -1
+	return tag_start
+
+#============================================
+def extract_strict_color_span(text_string):
+	"""
+	Extract a strict color span with optional strong wrappers.
+
+	Returns (prefix, inner_text, suffix, color_value, is_bold) or None.
+	"""
+	if text_string is None:
 		return None
+	if not isinstance(text_string, str):
+		raise TypeError(f"value is not string: {text_string}")
+	if "<" not in text_string:
+		return None
+	span_match = _SPAN_BLOCK_RE.search(text_string)
+	if span_match is None:
+		return None
+	# only one span is allowed
+	if _SPAN_OPEN_RE.search(text_string, span_match.end()):
+		return None
+	prefix = text_string[:span_match.start()]
+	suffix_start = span_match.end()
 
-	return prefix, inner, suffix, color_value, is_bold
+	is_bold = False
+	strong_start = _strong_prefix_start(prefix)
+	strong_suffix = _STRONG_CLOSE_RE.match(text_string, suffix_start)
+	if strong_start >= 0 and strong_suffix is not None:
+		is_bold = True
+		# keep whitespace between <strong> and <span> to preserve spacing
+		prefix = prefix[:strong_start] + prefix[strong_start + len("<strong>"):]
+		suffix_start = strong_suffix.end()
+
+	parsed = _parse_strict_span(span_match)
+	if parsed is None:
+		return None
+	inner, color_value, inner_bold = parsed
+	suffix = text_string[suffix_start:]
+	return prefix, inner, suffix, color_value, is_bold or inner_bold
 
 #============================================
 def extract_strict_color_spans(text_string):
@@ -709,28 +751,23 @@ def extract_strict_color_spans(text_string):
 		return []
 	if not isinstance(text_string, str):
 		raise TypeError(f"value is not string: {text_string}")
-	span_matches = list(re.finditer(
-		r'<span\b[^>]*>.*?</span>',
-		text_string,
-		flags=re.IGNORECASE | re.DOTALL
-	))
-	if len(span_matches) == 0:
+	if "<" not in text_string:
 		return []
 	segments = []
 	pos = 0
-	for span_match in span_matches:
+	# one left-to-right pass, each span is checked where it is found
+	for span_match in _SPAN_BLOCK_RE.finditer(text_string):
 		prefix = text_string[pos:span_match.start()]
-		suffix = text_string[span_match.end():]
 
 		is_bold = False
-		# capture whitespace between <strong> and <span> to preserve spacing
-		strong_prefix = re.search(r'<strong>(\s*)$', prefix, flags=re.IGNORECASE)
-		strong_suffix = re.search(r'^\s*</strong>', suffix, flags=re.IGNORECASE)
-		if strong_prefix and strong_suffix:
+		strong_start = _strong_prefix_start(prefix)
+		strong_suffix = _STRONG_CLOSE_RE.match(text_string, span_match.end())
+		if strong_start >= 0 and strong_suffix is not None:
 			is_bold = True
-			prefix = prefix[:strong_prefix.start()] + strong_prefix.group(1)
-			pos = span_match.end() + strong_suffix.end()
-		elif strong_prefix or strong_suffix:
+			# keep whitespace between <strong> and <span> to preserve spacing
+			prefix = prefix[:strong_start] + prefix[strong_start + len("<strong>"):]
+			pos = strong_suffix.end()
+		elif strong_start >= 0 or strong_suffix is not None:
 			return None
 		else:
 			pos = span_match.end()
@@ -738,63 +775,17 @@ def extract_strict_color_spans(text_string):
 		if prefix:
 			segments.append((False, prefix, None, False))
 
-		span_block = span_match.group(0)
-		if re.search(r'<span\b', span_block[len('<span'):], flags=re.IGNORECASE):
-			return None
-
-		attr_match = re.search(r'<span\b([^>]*)>', span_block, flags=re.IGNORECASE)
-		if attr_match is None:
-			return None
-		attrs = attr_match.group(1)
-		style_match = re.search(
-			r'style\s*=\s*(?P<quote>[\"\'])(?P<style>.*?)(?P=quote)',
-			attrs,
-			flags=re.IGNORECASE | re.DOTALL,
-		)
-		if style_match is None:
-			style_match = re.search(
-				r'style\s*=\s*([^>]+)$',
-				attrs,
-				flags=re.IGNORECASE | re.DOTALL,
-			)
-		if style_match is None:
-			return None
-		style_text = style_match.groupdict().get("style") or style_match.group(1)
-		style_text = style_text.strip()
-		style_text = style_text.rstrip(";")
-		if not style_text:
-			return None
-		parts = [part.strip() for part in style_text.split(";") if part.strip()]
-		if len(parts) != 1:
-			return None
-		if ":" not in parts[0]:
-			return None
-		prop, value = parts[0].split(":", 1)
-		if prop.strip().lower() != "color":
+		# a nested opening tag means the lazy match closed the wrong span
+		if _SPAN_OPEN_RE.search(text_string, span_match.start() + len("<span"), span_match.end()):
 			return None
-		color_value = value.strip()
-		if not color_value:
+		parsed = _parse_strict_span(span_match)
+		if parsed is None:
 			return None
+		inner, color_value, inner_bold = parsed
+		segments.append((True, inner, color_value, is_bold or inner_bold))
 
-		inner = re.sub(r'^<span\b[^>]*>', '', span_block, flags=re.IGNORECASE)
-		inner = re.sub(r'</span>\s*$', '', inner, flags=re.IGNORECASE)
-		inner_strong = re.fullmatch(
-			r'\s*<strong>(.*?)</strong>\s*',
-			inner,
-			flags=re.IGNORECASE | re.DOTALL,
-		)
-		if inner_strong is not None:
-			is_bold = True
-			inner = inner_strong.group(1)
-
-		inner = normalize_nbsp(inner)
-		# reject inner text with HTML tags other than sub/sup
-		cleaned = re.sub(r'</?(?:su[bp])>', '', inner)
-		if re.search(r'<[^>]+>', cleaned):
-			return None
-
-		segments.append((True, inner, color_value, is_bold))
-
+	if len(segments) == 0:
+		return []
 	if pos < len(text_string):
 		segments.append((False, text_string[pos:], None, False))
 
@@ -923,3 +914,106 @@ def build_opl_header(yaml_data, default_description=None, fallback_keywords=None
 		fallback_keywords=fallback_keywords,
 	)
 	return "\n".join(lines) + "\n"
+
+#============================================
+def expand_yaml_paths(path_args):
+	"""
+	Expand YAML files, directories, and glob patterns into a file list.
+
+	Directories are searched recursively for .yml files, skipping the
+	authoring TEMPLATE.yml. Quoted glob patterns are expanded here so they
+	work without shell globbing.
+
+	Returns:
+		list: YAML file paths in argument order, without duplicates.
+	"""
+	yaml_paths = []
+	for path_arg in path_args:
+		if os.path.isdir(path_arg):
+			found = glob.glob(os.path.join(path_arg, '**', '*.yml'), recursive=True)
+			found = [path for path in found if os.path.basename(path) != 'TEMPLATE.yml']
+		elif any(char in path_arg for char in '*?['):
+			found = glob.glob(path_arg, recursive=True)
+		else:
+			found = [path_arg]
+		for yaml_path in sorted(found):
+			if yaml_path not in yaml_paths:
+				yaml_paths.append(yaml_path)
+	return yaml_paths
+
+#============================================
+def _timed_conversion(convert_file, yaml_path):
+	"""
+	Run convert_file on one YAML path and record the time and outcome.
+
+	Bank content, YAML syntax and file errors are recorded so one bad bank
+	does not stop a bulk run.
+	"""
+	t0 = time.perf_counter()
+	result = {
+		'yaml_path': yaml_path,
+		'output_path': None,
+		'warnings': [],
+		'error': None,
+	}
+	try:
+		result['output_path'], result['warnings'] = convert_file(yaml_path)
+	except (KeyError, TypeError, ValueError, yaml.YAMLError, OSError) as error:
+		result['error'] = f"{type(error).__name__}: {error}"
+	result['seconds'] = time.perf_counter() - t0
+	return result
+
+#============================================
+def convert_yaml_files(yaml_paths, convert_file, jobs=None):
+	"""
+	Convert many YAML banks in one process or across a worker pool.
+
+	Workers are forked from the parent, also on macOS where spawn is the
+	default, so bptools, webwork_lib and the converter are imported once
+	instead of once per bank. Each worker reseeds random, so banks do not
+	share the parent's random stream. Fork is not available on Windows.
+
+	Args:
+		yaml_paths (list): YAML file paths from expand_yaml_paths().
+		convert_file: module-level callable taking a YAML path and
+			returning (output_path, warnings).
+		jobs (int): worker processes, defaults to the CPU count. With one
+			job or one file the conversion runs in this process.
+
+	Returns:
+		list: one result dict per YAML path, in input order.
+	"""
+	if jobs is None:
+		jobs = os.cpu_count() or 1
+	# build_replacement_pairs() imports bptools lazily, warm it up before
+	# forking so each worker does not pay for that import again
+	build_replacement_pairs(None)
+	if jobs <= 1 or len(yaml_paths) <= 1:
+		return [_timed_conversion(convert_file, yaml_path) for yaml_path in yaml_paths]
+	fork_context = multiprocessing.get_context('fork')
+	with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=fork_context,
+			initializer=random.seed) as pool:
+		futures = [pool.submit(_timed_conversion, convert_file, yaml_path) for yaml_path in yaml_paths]
+		results = [future.result() for future in futures]
+	return results
+
+#============================================
+def print_conversion_report(results, total_seconds):
+	"""
+	Print a per-file timing report for convert_yaml_files() results.
+
+	Returns:
+		int: number of banks that failed to convert.
+	"""
+	failures = 0
+	for result in results:
+		if result['error'] is not None:
+			failures += 1
+			print(f"FAILED {result['seconds']:7.3f} s  {result['yaml_path']}: {result['error']}")
+			continue
+		print(f"{result['seconds']:7.3f} s  {result['yaml_path']} -> {result['output_path']}")
+		for warning in result['warnings']:
+			print(f"  WARNING: {warning}")
+	converted = len(results) - failures
+	print(f"converted {converted} of {len(results)} YAML files in {total_seconds:.2f} seconds")
+	return failures
@@ -0,0 +1,166 @@
+"""
+Shared YAML loading for question banks and validators.
+
+Parsing uses libyaml's CSafeLoader when PyYAML was built with it, and
+rejects duplicate mapping keys. bptools.readYamlFile() also requires
+string keys, as the qti_package_maker reader it replaced did. Parsed
+documents are cached as JSON files keyed by the sha256 of the YAML text,
+so unchanged banks skip parsing on the next run.
+"""
+
+# Standard Library
+import os
+import json
+import hashlib
+
+# PIP3 modules
+import yaml
+
+# bump when the loader changes what a document parses to
+YAML_CACHE_VERSION = 1
+YAML_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.yaml_cache')
+
+# libyaml is optional, PyYAML falls back to the pure-Python SafeLoader
+_BASE_SAFE_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+#============================================
+class UniqueKeyLoader(_BASE_SAFE_LOADER):
+	"""
+	Safe loader that raises a ConstructorError on duplicate mapping keys.
+	"""
+	pass
+
+#============================================
+def _construct_mapping_no_duplicates(loader, node, deep=False):
+	mapping = {}
+	for key_node, value_node in node.value:
+		key = loader.construct_object(key_node, deep=deep)
+		if key in mapping:
+			raise yaml.constructor.ConstructorError(
+				"while constructing a mapping",
+				node.start_mark,
+				f"found duplicate key: {key!r}",
+				key_node.start_mark,
+			)
+		value = loader.construct_object(value_node, deep=deep)
+		mapping[key] = value
+	return mapping
+
+UniqueKeyLoader.add_constructor(
+	yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+	_construct_mapping_no_duplicates,
+)
+
+#============================================
+class StringKeyLoader(UniqueKeyLoader):
+	"""
+	UniqueKeyLoader that also raises a TypeError on non-string mapping keys.
+	"""
+	pass
+
+#============================================
+def _construct_mapping_string_keys(loader, node, deep=False):
+	mapping = _construct_mapping_no_duplicates(loader, node, deep=deep)
+	for key in mapping:
+		if not isinstance(key, str):
+			raise TypeError(f"YAML key must be a string, got {type(key)}")
+	return mapping
+
+StringKeyLoader.add_constructor(
+	yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+	_construct_mapping_string_keys,
+)
+
+#============================================
+def _is_json_safe(value) -> bool:
+	"""
+	Check that a parsed document survives a JSON round trip unchanged.
+
+	Dates, binary values and non-string keys are left uncached.
+	"""
+	if value is None or isinstance(value, (str, bool, int, float)):
+		return True
+	if isinstance(value, list):
+		return all(_is_json_safe(item) for item in value)
+	if isinstance(value, dict):
+		for key, item in value.items():
+			if not isinstance(key, str) or not _is_json_safe(item):
+				return False
+		return True
+	return False
+
+#============================================
+def _load_cached(raw_text: str, all_documents: bool, use_cache: bool, string_keys: bool):
+	mode = 'all' if all_documents else 'single'
+	key_text = f'{YAML_CACHE_VERSION}:{mode}:{raw_text}'
+	text_hash = hashlib.sha256(key_text.encode('utf-8')).hexdigest()
+	cache_path = os.path.join(YAML_CACHE_DIR, text_hash + '.json')
+	if use_cache and os.path.isfile(cache_path):
+		with open(cache_path, 'r', encoding='utf-8') as cache_file:
+			return json.load(cache_file)
+
+	# cached documents passed _is_json_safe(), so their keys are all strings
+	loader_class = StringKeyLoader if string_keys else UniqueKeyLoader
+	if all_documents:
+		data = list(yaml.load_all(raw_text, Loader=loader_class))
+	else:
+		# same steps as yaml.load(), spelled out so the loader class stays explicit
+		loader = loader_class(raw_text)
+		data = loader.get_single_data()
+		loader.dispose()
+
+	if use_cache and _is_json_safe(data):
+		os.makedirs(YAML_CACHE_DIR, exist_ok=True)
+		# per-process temp name, parallel builds may parse the same bank
+		temp_path = f'{cache_path}.{os.getpid()}.tmp'
+		with open(temp_path, 'w', encoding='utf-8') as cache_file:
+			json.dump(data, cache_file)
+		os.replace(temp_path, cache_path)
+	return data
+
+#============================================
+def load_yaml_text(raw_text: str, use_cache: bool = True, string_keys: bool = False):
+	"""
+	Parse a single-document YAML string.
+
+	Args:
+		raw_text (str): YAML text.
+		use_cache (bool): read and write the content-hash cache.
+		string_keys (bool): raise TypeError on non-string mapping keys.
+
+	Returns:
+		Parsed document.
+	"""
+	return _load_cached(raw_text, False, use_cache, string_keys)
+
+#============================================
+def load_yaml_documents(raw_text: str, use_cache: bool = True, string_keys: bool = False) -> list:
+	"""
+	Parse every document in a YAML string.
+
+	Args:
+		raw_text (str): YAML text, possibly with several '---' documents.
+		use_cache (bool): read and write the content-hash cache.
+		string_keys (bool): raise TypeError on non-string mapping keys.
+
+	Returns:
+		list: parsed documents.
+	"""
+	return _load_cached(raw_text, True, use_cache, string_keys)
+
+#============================================
+def read_yaml_file(yaml_path: str, use_cache: bool = True, string_keys: bool = False):
+	"""
+	Read and parse a single-document YAML file.
+
+	Args:
+		yaml_path (str): path to the YAML file.
+		use_cache (bool): read and write the content-hash cache.
+		string_keys (bool): raise TypeError on non-string mapping keys.
+
+	Returns:
+		Parsed document.
+	"""
+	with open(yaml_path, 'r', encoding='utf-8') as yaml_file:
+		raw_text = yaml_file.read()
+	return load_yaml_text(raw_text, use_cache, string_keys)